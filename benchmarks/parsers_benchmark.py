@@ -0,0 +1,53 @@
+from typing import Dict
+
+from benchmarks.timing import benchmark
+from spark_mec_bp.nist.fetchers import AtomicLinesData, AtomicLevelsData, IonizationEnergyData
+from spark_mec_bp.nist.parsers import AtomicLinesParser, AtomicLevelsParser, IonizationEnergyParser
+
+TEST_DATA_DIRECTORY = "spark_mec_bp/nist/parsers/test_data"
+REPEATS = 5
+NUMBER = 200
+
+
+def read_test_data(name: str) -> str:
+    with open(f"{TEST_DATA_DIRECTORY}/{name}/input_data.txt") as file:
+        return file.read()
+
+
+def run() -> Dict[str, float]:
+    atomic_lines_data = AtomicLinesData(data=read_test_data("atomic_lines"))
+    atomic_levels_data = AtomicLevelsData(data=read_test_data("atomic_levels"))
+    ionization_energy_data = IonizationEnergyData(data=read_test_data("ionization_energy"))
+    atomic_lines_parser = AtomicLinesParser()
+    atomic_levels_parser = AtomicLevelsParser()
+    ionization_energy_parser = IonizationEnergyParser()
+    atomic_lines_columns = ["obs_wl_air(nm)", "Aki(s^-1)", "g_k", "Ek(cm-1)"]
+    atomic_levels_columns = ["g", "Level (cm-1)"]
+
+    statements = {
+        "parsers/atomic lines, pandas": lambda: atomic_lines_parser.parse_atomic_lines(atomic_lines_data)[
+            atomic_lines_columns
+        ],
+        "parsers/atomic lines, numpy": lambda: atomic_lines_parser.parse_atomic_lines_to_numpy(
+            atomic_lines_data, atomic_lines_columns
+        ),
+        "parsers/atomic levels, pandas": lambda: atomic_levels_parser.parse_atomic_levels(atomic_levels_data)[
+            atomic_levels_columns
+        ],
+        "parsers/atomic levels, numpy": lambda: atomic_levels_parser.parse_atomic_levels_to_numpy(
+            atomic_levels_data, atomic_levels_columns
+        ),
+        "parsers/partition function": lambda: atomic_levels_parser.parse_partition_function(atomic_levels_data),
+        "parsers/ionization energy, pandas": lambda: ionization_energy_parser.parse_ionization_energy(
+            ionization_energy_data
+        ),
+        "parsers/ionization energy, numpy": lambda: ionization_energy_parser.parse_ionization_energy_to_numpy(
+            ionization_energy_data
+        ),
+    }
+
+    return {name: benchmark(name, statement, REPEATS, NUMBER) for name, statement in statements.items()}
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,120 @@
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.timing import benchmark
+from spark_mec_bp import application
+from spark_mec_bp.calculators import VoigtIntegralCalculator, VoigtIntegralCalculatorConfig
+from spark_mec_bp.lib import PeakFinder, PeakFinderConfig, SpectrumCorrector, SpectrumCorrectorConfig
+from spark_mec_bp.readers import ASCIISpectrumReader
+from tests.shared_data import create_fixture_bundle
+
+SPECTRUM_FILE_PATH = "spark_mec_bp/application/test_data/input_data.asc"
+SCALES = [1, 2, 4]
+REPEATS = 3
+WAVELENGTH_COLUMN_INDEX = 0
+INTENSITY_COLUMN_INDEX = 10
+TARGET_PEAKS = np.array([312.278, 406.507, 479.26, 338.29, 520.9078, 546.54])
+
+
+def scale_spectrum(spectrum: np.ndarray, scale: int) -> np.ndarray:
+    """Resamples every column of the spectrum onto a scale times denser wavelength grid."""
+    if scale == 1:
+        return spectrum
+
+    wavelengths = spectrum[:, WAVELENGTH_COLUMN_INDEX]
+    scaled_wavelengths = np.linspace(wavelengths[0], wavelengths[-1], len(wavelengths) * scale)
+
+    return np.stack([np.interp(scaled_wavelengths, wavelengths, column) for column in spectrum.T], axis=-1)
+
+
+def create_config(spectrum_file_path: str, bundle_file_path: str) -> application.AppConfig:
+    return application.AppConfig(
+        spectrum=application.SpectrumConfig(
+            file_path=spectrum_file_path,
+            wavelength_column_index=WAVELENGTH_COLUMN_INDEX,
+            intensity_column_index=INTENSITY_COLUMN_INDEX,
+        ),
+        first_species=application.SpeciesConfig(
+            atom_name="Au I", ion_name="Au II", target_peaks=[312.278, 406.507, 479.26]
+        ),
+        second_species=application.SpeciesConfig(
+            atom_name="Ag I", ion_name="Ag II", target_peaks=[338.29, 520.9078, 546.54]
+        ),
+        carrier_gas=application.CarrierGasConfig(atom_name="Ar I", ion_name="Ar II"),
+        spectrum_correction=application.SpectrumCorrectionConfig(iteration_limit=50, ratio=0.00001, lam=1000000),
+        peak_finding=application.PeakFindingConfig(minimum_requred_height=100),
+        voigt_integration=application.VoigtIntegrationConfig(prominence_window_length=40),
+        nist=application.NISTConfig(offline=True, bundle_file_path=bundle_file_path),
+    )
+
+
+def run(
+    scales: List[int] = SCALES, repeats: int = REPEATS, bundle_file_path: Optional[str] = None
+) -> Dict[str, float]:
+    logging.disable(logging.INFO)
+    spectrum = ASCIISpectrumReader().read_spectrum_to_numpy(SPECTRUM_FILE_PATH)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if bundle_file_path is None:
+            bundle_file_path = os.path.join(directory, "nist_bundle.json")
+            create_fixture_bundle().save(bundle_file_path)
+
+        for scale in scales:
+            scaled_spectrum = scale_spectrum(spectrum, scale)
+            spectrum_file_path = SPECTRUM_FILE_PATH
+            if scale != 1:
+                spectrum_file_path = os.path.join(directory, f"input_data_x{scale}.asc")
+                np.savetxt(spectrum_file_path, scaled_spectrum, fmt="%.6g", delimiter="\t")
+            results.update(
+                run_scale(
+                    f"{len(scaled_spectrum)}x{scaled_spectrum.shape[1]}",
+                    scaled_spectrum,
+                    create_config(spectrum_file_path, bundle_file_path),
+                    repeats,
+                )
+            )
+
+    return results
+
+
+def run_scale(size: str, spectrum: np.ndarray, config: application.AppConfig, repeats: int) -> Dict[str, float]:
+    reader = ASCIISpectrumReader()
+    spectrum_corrector = SpectrumCorrector(SpectrumCorrectorConfig(**vars(config.spectrum_correction)))
+    spectrum_correction_data = spectrum_corrector.correct_spectrum(
+        spectrum, WAVELENGTH_COLUMN_INDEX, INTENSITY_COLUMN_INDEX
+    )
+    corrected_intensities = spectrum_correction_data.corrected_spectrum[:, 1]
+    peak_finder = PeakFinder(PeakFinderConfig(config.peak_finding.minimum_requred_height))
+    peak_indices = peak_finder.find_peak_indices(corrected_intensities)
+    integral_calculator = VoigtIntegralCalculator(
+        VoigtIntegralCalculatorConfig(config.voigt_integration.prominence_window_length)
+    )
+    app = application.App(config)
+    app.run()
+    prepared_app = app.prepare(len(spectrum))
+
+    statements = {
+        "reader": lambda: reader.read_spectrum_to_numpy(config.spectrum.file_path),
+        "spectrum corrector": lambda: spectrum_corrector.correct_spectrum(
+            spectrum, WAVELENGTH_COLUMN_INDEX, INTENSITY_COLUMN_INDEX
+        ),
+        "peak finder": lambda: peak_finder.find_peak_indices(corrected_intensities),
+        "voigt integrals": lambda: integral_calculator.calculate(
+            spectrum_correction_data.corrected_spectrum, peak_indices, TARGET_PEAKS
+        ),
+        "App.run, warm NIST caches": app.run,
+        "PreparedApp.run": lambda: prepared_app.run(spectrum),
+    }
+
+    return {
+        f"pipeline/{name} [{size}]": benchmark(f"pipeline/{name} [{size}]", statement, repeats)
+        for name, statement in statements.items()
+    }
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict
+
+import numpy as np
+
+from benchmarks import parsers_benchmark, pipeline_benchmark
+
+RESULTS_DIRECTORY = "benchmarks/results"
+REGRESSION_THRESHOLD = 1.2
+
+
+def get_commit() -> str:
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE, universal_newlines=True, check=True
+    ).stdout.strip()
+    is_dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode != 0
+
+    return f"{commit}-dirty" if is_dirty else commit
+
+
+def save_results(results: Dict[str, float], results_directory: str) -> str:
+    os.makedirs(results_directory, exist_ok=True)
+    commit = get_commit()
+    file_path = os.path.join(results_directory, f"{commit}.json")
+    with open(file_path, "w") as file:
+        json.dump(
+            {
+                "commit": commit,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+    return file_path
+
+
+def load_results(results_directory: str, commit: str) -> Dict[str, float]:
+    with open(os.path.join(results_directory, f"{commit}.json")) as file:
+        return json.load(file)["results"]
+
+
+def compare(baseline: Dict[str, float], results: Dict[str, float], threshold: float) -> bool:
+    """Prints the change of every benchmark against the baseline, returns whether any of them regressed."""
+    has_regression = False
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result / baseline[name]
+        is_regression = ratio > threshold
+        has_regression = has_regression or is_regression
+        print(f"{name:<60} {ratio:8.2f}x{'  REGRESSION' if is_regression else ''}")
+
+    return has_regression
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=pipeline_benchmark.SCALES)
+    parser.add_argument("--repeats", type=int, default=pipeline_benchmark.REPEATS)
+    parser.add_argument("--bundle-file-path", help="recorded NIST bundle to use instead of the bundled fixtures")
+    parser.add_argument("--results-directory", default=RESULTS_DIRECTORY)
+    parser.add_argument("--compare", help="commit whose stored results are the baseline, e.g. the merge base")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = create_parser().parse_args()
+    baseline = load_results(arguments.results_directory, arguments.compare) if arguments.compare else None
+    results = {
+        **parsers_benchmark.run(),
+        **pipeline_benchmark.run(arguments.scales, arguments.repeats, arguments.bundle_file_path),
+    }
+    print(f"results saved to {save_results(results, arguments.results_directory)}")
+
+    if baseline is not None and compare(baseline, results, arguments.threshold):
+        sys.exit(1)
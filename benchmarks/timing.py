@@ -0,0 +1,12 @@
+import timeit
+from typing import Callable
+
+REPEATS = 5
+NUMBER = 1
+
+
+def benchmark(name: str, statement: Callable[[], object], repeats: int = REPEATS, number: int = NUMBER) -> float:
+    best_time = min(timeit.repeat(statement, repeat=repeats, number=number)) / number
+    print(f"{name:<60} {best_time * 1e3:12.3f} ms")
+
+    return best_time
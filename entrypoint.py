@@ -27,6 +27,14 @@ def log_results(line_pair_checker: LinePairChecker, result: application.Result):
         f"{config.second_species.atom_name} linepair deviations: {AgI_linepair_check}"
     )
 
+    pruning_data = line_pair_checker.prune_lines(
+        [result.first_species_atomic_lines, result.second_species_atomic_lines],
+        [result.first_species_integrals_data.integrals, result.second_species_integrals_data.integrals],
+        threshold=0.5,
+    )
+    print(f"Lines to prune (species, line): {pruning_data.pruned_lines}")
+    print(f"The temperature without the pruned lines is: {pruning_data.temperature:6.3f} K")
+
 
 def plot_figures(plotter: Plotter, result: application.Result):
     plotter.plot_original_spectrum(
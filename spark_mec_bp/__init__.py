@@ -6,6 +6,12 @@ from .application.models import (
     VoigtIntegrationConfig,
     SpectrumCorrectionConfig,
     PeakFindingConfig,
+    NISTConfig,
+    InstrumentationConfig,
+    ProfilingConfig,
+    PrometheusConfig,
+    UncertaintyConfig,
+    PlasmaCompositionConfig,
     AppConfig,
     Result
 )
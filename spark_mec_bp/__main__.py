@@ -0,0 +1,114 @@
+import argparse
+import sys
+
+from spark_mec_bp.data_preparation.cache_warmer import BundleWarmer, load_manifest
+from spark_mec_bp.nist.fetchers import (
+    AtomicLinesFetcher,
+    AtomicLevelsFetcher,
+    IonizationEnergyFetcher,
+)
+from spark_mec_bp.nist.offline import NISTBundleBuilder
+from spark_mec_bp.synthetic import SyntheticSpectrumConfig, SyntheticSpectrumGenerator, write_spectrum
+
+
+def snapshot(arguments: argparse.Namespace) -> None:
+    bundle = NISTBundleBuilder(
+        atomic_lines_fetcher=AtomicLinesFetcher(),
+        atomic_levels_fetcher=AtomicLevelsFetcher(),
+        ionization_energy_fetcher=IonizationEnergyFetcher(),
+    ).build(
+        species_names=arguments.species,
+        lower_wavelength=arguments.lower_wavelength,
+        upper_wavelength=arguments.upper_wavelength,
+    )
+    bundle.save(arguments.output)
+    print(f"NIST data of {', '.join(arguments.species)} saved to {arguments.output}")
+
+
+def warmup(arguments: argparse.Namespace) -> None:
+    bundle, report = BundleWarmer(
+        bundle_builder=NISTBundleBuilder(
+            atomic_lines_fetcher=AtomicLinesFetcher(),
+            atomic_levels_fetcher=AtomicLevelsFetcher(),
+            ionization_energy_fetcher=IonizationEnergyFetcher(),
+        ),
+        max_workers=arguments.max_workers,
+    ).build(load_manifest(arguments.manifest))
+
+    for warmed in report.warmed:
+        print(f"warmed {warmed}")
+    for failure in report.failures:
+        print(f"FAILED {failure.data_name} of {failure.species_name}: {failure.error}")
+    if report.failures:
+        sys.exit(1)
+
+    bundle.save(arguments.output)
+    print(f"NIST data of the manifest saved to {arguments.output}")
+
+
+def generate(arguments: argparse.Namespace) -> None:
+    config = SyntheticSpectrumConfig(
+        temperature=arguments.temperature,
+        population_ratios={"Au I": arguments.population_ratio, "Ag I": 1.0},
+        lower_wavelength=arguments.lower_wavelength,
+        upper_wavelength=arguments.upper_wavelength,
+        points=arguments.points,
+        shots=arguments.shots,
+        noise=arguments.noise,
+        seed=arguments.seed,
+    )
+    write_spectrum(arguments.output, SyntheticSpectrumGenerator(config).generate())
+    print(f"Synthetic spectrum of {config.shots} shots at {config.temperature} K saved to {arguments.output}")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m spark_mec_bp")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="snapshot NIST data of the given species into a local bundle file"
+    )
+    snapshot_parser.add_argument(
+        "--species", nargs="+", required=True, help='species conforming NIST conventions, e.g. "Au I" "Au II"'
+    )
+    snapshot_parser.add_argument("--lower-wavelength", type=int, default=200)
+    snapshot_parser.add_argument("--upper-wavelength", type=int, default=900)
+    snapshot_parser.add_argument(
+        "--output", required=True, help="bundle file path, gzip compressed if it ends with .gz"
+    )
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    warmup_parser = subparsers.add_parser(
+        "warmup", help="fetch NIST data of a species manifest in parallel into a local bundle file"
+    )
+    warmup_parser.add_argument(
+        "--manifest", required=True, help="JSON file with a species list of atom_name, ion_name and target_peaks"
+    )
+    warmup_parser.add_argument(
+        "--output", required=True, help="bundle file path, gzip compressed if it ends with .gz"
+    )
+    warmup_parser.add_argument("--max-workers", type=int, default=8)
+    warmup_parser.set_defaults(handler=warmup)
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="generate a synthetic Au-Ag spark spectrum of a known temperature"
+    )
+    generate_parser.add_argument("--temperature", type=float, default=12000.0, help="ground truth temperature in K")
+    generate_parser.add_argument(
+        "--population-ratio", type=float, default=1.0, help="Au I to Ag I ratio of population over partition function"
+    )
+    generate_parser.add_argument("--lower-wavelength", type=float, default=300.0)
+    generate_parser.add_argument("--upper-wavelength", type=float, default=560.0)
+    generate_parser.add_argument("--points", type=int, default=21178, help="points per spectrum")
+    generate_parser.add_argument("--shots", type=int, default=10, help="intensity columns per file")
+    generate_parser.add_argument("--noise", type=float, default=20.0, help="standard deviation of the noise")
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--output", required=True, help="ascii spectrum file path")
+    generate_parser.set_defaults(handler=generate)
+
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = create_parser().parse_args()
+    arguments.handler(arguments)
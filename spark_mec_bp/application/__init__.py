@@ -1,4 +1,7 @@
-from .app import App
+from .app import App, PreparedApp
+from .pipeline import Pipeline, Stage, SerialScheduler, ConcurrentScheduler
+from .stage_memo import StageMemo, StageMemoStats
+from .sweep import ParameterSweep
 from .models import (
     CarrierGasConfig,
     SpeciesConfig,
@@ -6,6 +9,12 @@ from .models import (
     VoigtIntegrationConfig,
     SpectrumCorrectionConfig,
     PeakFindingConfig,
+    NISTConfig,
+    InstrumentationConfig,
+    ProfilingConfig,
+    PrometheusConfig,
+    UncertaintyConfig,
+    PlasmaCompositionConfig,
     AppConfig,
     Result
 )
\ No newline at end of file
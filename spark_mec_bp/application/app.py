@@ -1,4 +1,22 @@
+import hashlib
+from dataclasses import astuple
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from spark_mec_bp.application import models
+from spark_mec_bp.application.pipeline import Pipeline, SerialScheduler, Stage
+from spark_mec_bp.application.stage_memo import StageMemo
+from spark_mec_bp.instrumentation import (
+    RUN_TARGET,
+    MetricsRecorder,
+    RunMetrics,
+    StageProfiler,
+    get_stage_group,
+    recording,
+    shared_prometheus_exporter,
+)
 from spark_mec_bp.readers import ASCIISpectrumReader
 from spark_mec_bp.lib import (
     PeakFinder,
@@ -17,7 +35,12 @@ from spark_mec_bp.calculators import (
     ElectronConcentrationCalculator,
     IntensityRatiosCalculator,
     TemperatureCalculator,
+    MonteCarloUncertaintyCalculator,
+    PlasmaCompositionCalculator,
+    UncertaintyData,
+    UncertaintySpeciesData,
 )
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
 from spark_mec_bp.data_preparation.getters import (
     PartitionFunctionDataGetter,
     IonizationEnergyDataGetter,
@@ -28,6 +51,8 @@ from spark_mec_bp.nist.fetchers import (
     AtomicLinesFetcher,
     AtomicLevelsFetcher,
     IonizationEnergyFetcher,
+    SingleFlightFetcher,
+    shared_single_flight,
 )
 
 from spark_mec_bp.nist.parsers import (
@@ -36,22 +61,63 @@ from spark_mec_bp.nist.parsers import (
     IonizationEnergyParser,
 )
 
+from spark_mec_bp.nist.offline import (
+    OfflineAtomicLinesFetcher,
+    OfflineAtomicLevelsFetcher,
+    OfflineIonizationEnergyFetcher,
+    load_bundle,
+)
+
+CONFIG_STAGE_NAMES = ["atomic_lines", "atomic_levels", "ionization_energies"]
+
+
+def create_nist_fetchers(nist_config: models.NISTConfig):
+    if nist_config.offline:
+        bundle = load_bundle(nist_config.bundle_file_path)
+
+        return (
+            OfflineAtomicLinesFetcher(bundle),
+            OfflineAtomicLevelsFetcher(bundle),
+            OfflineIonizationEnergyFetcher(bundle),
+        )
+
+    return (
+        SingleFlightFetcher(AtomicLinesFetcher(), shared_single_flight),
+        SingleFlightFetcher(AtomicLevelsFetcher(), shared_single_flight),
+        SingleFlightFetcher(IonizationEnergyFetcher(), shared_single_flight),
+    )
+
+
+def _is_config_stage(stage_name: str) -> bool:
+    return get_stage_group(stage_name) in CONFIG_STAGE_NAMES
+
+
+def _get_species_parameters(species_config: models.SpeciesConfig):
+    return (species_config.atom_name, species_config.ion_name, tuple(np.ravel(species_config.target_peaks).tolist()))
+
 
 class App:
-    def __init__(self, config: models.AppConfig):
+    def __init__(self, config: models.AppConfig, scheduler=None, stage_memo: Optional[StageMemo] = None):
         self.config = config
+        self.scheduler = scheduler if scheduler is not None else SerialScheduler()
+        self.stage_memo = stage_memo
+        if self.config.prometheus.enabled and self.config.prometheus.port is not None:
+            shared_prometheus_exporter.serve(self.config.prometheus.port, self.config.prometheus.host)
         self.logger = Logger().new()
         self.file_reader = ASCIISpectrumReader()
+        atomic_lines_fetcher, atomic_levels_fetcher, ionization_energy_fetcher = create_nist_fetchers(
+            self.config.nist
+        )
         self.atomic_lines_getter = AtomicLinesDataGetter(
-            atomic_lines_fetcher=AtomicLinesFetcher(),
+            atomic_lines_fetcher=atomic_lines_fetcher,
             atomic_lines_parser=AtomicLinesParser(),
         )
         self.partition_function_getter = PartitionFunctionDataGetter(
-            atomic_levels_fetcher=AtomicLevelsFetcher(),
+            atomic_levels_fetcher=atomic_levels_fetcher,
             atomic_levels_parser=AtomicLevelsParser(),
         )
         self.ionization_energy_getter = IonizationEnergyDataGetter(
-            ionization_energy_fetcher=IonizationEnergyFetcher(),
+            ionization_energy_fetcher=ionization_energy_fetcher,
             ionization_energy_parser=IonizationEnergyParser(),
         )
 
@@ -76,47 +142,254 @@ class App:
         self.atom_concentration_calculatior = AtomConcentraionCalculator()
         self.ion_atom_concentration_calculator = IonAtomConcentraionCalculator()
         self.total_concentration_calculator = TotalConcentrationCalculator()
-
-    def run(self):
-        spectrum = self._read_spectrum()
-        spectrum_correction_data = self._correct_spectrum(spectrum)
-        peak_indices = self._find_peaks(spectrum_correction_data)
-        atomic_lines = self._get_atomic_lines()
-        integrals_data = self._caluclate_integrals(spectrum_correction_data, peak_indices)
-        intensity_ratio_data = self._calculate_intensity_ratios(atomic_lines, integrals_data)
-        temperature = self._calculate_temperature(intensity_ratio_data)
-        partition_functions = self._get_partition_functions_from_nist(temperature)
-        ionization_energies = self._get_ionization_energies_from_nist()
-        atom_concentration = self._calculate_atom_concentration(
-            intensity_ratio_data, partition_functions
-        )
-        electron_concentration = self._calculate_electron_concentration(
-            temperature, partition_functions, ionization_energies
+        self.plasma_composition_calculator = PlasmaCompositionCalculator(
+            analyte_fraction=self.config.plasma_composition.analyte_fraction,
+            tolerance=self.config.plasma_composition.tolerance,
+            max_iterations=self.config.plasma_composition.max_iterations,
         )
-        ion_atom_concentrations = self._calculate_ion_atom_concentrations(
-            temperature,
-            partition_functions,
-            ionization_energies,
-            electron_concentration,
+        self.uncertainty_calculator = MonteCarloUncertaintyCalculator(
+            samples=self.config.uncertainty.samples,
+            unknown_aki_uncertainty=self.config.uncertainty.unknown_aki_uncertainty,
+            seed=self.config.uncertainty.seed,
+            plasma_composition_calculator=(
+                self.plasma_composition_calculator if self.config.plasma_composition.enabled else None
+            ),
+            unknown_integral_uncertainty=self.config.uncertainty.unknown_integral_uncertainty,
         )
-        total_concentration = self._calculate_total_concentration(
-            atom_concentration, ion_atom_concentrations
+
+    def run(self):
+        return self.execute(self.create_pipeline())
+
+    def prepare(self, spectrum_length: Optional[int] = None) -> "PreparedApp":
+        """Runs the stages depending only on the config, which are reused by every run of the prepared app."""
+        pipeline = self.create_pipeline()
+        config_results = self.run_pipeline(
+            pipeline.select([stage.name for stage in pipeline.stages if _is_config_stage(stage.name)])
         )
+        if spectrum_length is not None:
+            self.spectrum_corrector.prepare(spectrum_length)
+
+        return PreparedApp(self, config_results)
+
+    def create_result(self, results: Dict[str, Any]) -> models.Result:
+        spectrum_correction_data = results["spectrum_correction"]
+        intensity_ratio_data = results["intensity_ratios"]
+        atomic_lines = results["atomic_lines"]
+        integrals_data = results["integrals"]
 
         return models.Result(
-            original_spectrum=spectrum,
+            original_spectrum=results["spectrum"],
             corrected_spectrum=spectrum_correction_data.corrected_spectrum,
             baseline=spectrum_correction_data.baseline,
-            peak_indices=peak_indices,
+            peak_indices=results["peak_indices"],
             intensity_ratios=intensity_ratio_data.intensity_ratios,
             fitted_intensity_ratios=intensity_ratio_data.fitted_intensity_ratios,
-            total_concentration=total_concentration,
-            temperature=temperature,
+            total_concentration=results["total_concentration"],
+            temperature=results["temperature"],
             first_species_atomic_lines=atomic_lines.first_species,
             first_species_integrals_data=integrals_data.first_species,
             second_species_atomic_lines=atomic_lines.second_species,
             second_species_integrals_data=integrals_data.second_species,
-        )
+            additional_species_atomic_lines=atomic_lines.additional_species,
+            additional_species_integrals_data=integrals_data.additional_species,
+            additional_species_total_concentrations=results["additional_species_total_concentrations"],
+            uncertainty=results["uncertainty"],
+        )
+
+    def create_pipeline(self, spectrum: Optional[np.ndarray] = None) -> Pipeline:
+        species_configs = self._get_species_configs()
+        species = [_get_species_parameters(species_config) for species_config in species_configs]
+        carrier_gas = (self.config.carrier_gas.atom_name, self.config.carrier_gas.ion_name)
+        nist = astuple(self.config.nist)
+        # the per species stages are independent of each other, a concurrent scheduler runs them in parallel
+        atomic_lines_stages = [
+            Stage(
+                f"atomic_lines[{species_parameters[0]}]",
+                partial(self._get_atomic_lines, species_config),
+                parameters=(species_parameters, nist),
+            )
+            for species_config, species_parameters in zip(species_configs, species)
+        ]
+        integrals_stages = [
+            Stage(
+                f"integrals[{species_parameters[0]}]",
+                partial(self._caluclate_integrals, species_config),
+                ["spectrum_correction", "peak_indices"],
+                (astuple(self.config.voigt_integration), species_parameters[2]),
+            )
+            for species_config, species_parameters in zip(species_configs, species)
+        ]
+        # the level tables are only read by the Monte Carlo uncertainty
+        atomic_levels_stages = [
+            Stage(
+                f"atomic_levels[{atom_name}]",
+                partial(self._get_atomic_levels_from_nist, [atom_name, ion_name]),
+                parameters=((atom_name, ion_name), nist),
+            )
+            for atom_name, ion_name in [species_parameters[:2] for species_parameters in species] + [carrier_gas]
+        ] if self.config.uncertainty.enabled else []
+
+        return Pipeline(
+            [
+                Stage(
+                    "spectrum",
+                    self._read_spectrum if spectrum is None else lambda: spectrum,
+                    parameters=self._get_spectrum_parameters(spectrum),
+                ),
+                Stage(
+                    "spectrum_correction",
+                    self._correct_spectrum,
+                    ["spectrum"],
+                    (
+                        self.config.spectrum.wavelength_column_index,
+                        self.config.spectrum.intensity_column_index,
+                        astuple(self.config.spectrum_correction),
+                    ),
+                ),
+                Stage(
+                    "peak_indices",
+                    self._find_peaks,
+                    ["spectrum_correction"],
+                    astuple(self.config.peak_finding),
+                ),
+                *atomic_lines_stages,
+                Stage(
+                    "atomic_lines", self._collect_atomic_lines, [stage.name for stage in atomic_lines_stages]
+                ),
+                *integrals_stages,
+                Stage("integrals", self._collect_integrals, [stage.name for stage in integrals_stages]),
+                Stage("intensity_ratios", self._calculate_intensity_ratios, ["atomic_lines", "integrals"]),
+                Stage("temperature", self._calculate_temperature, ["intensity_ratios"]),
+                *atomic_levels_stages,
+                Stage(
+                    "partition_functions",
+                    self._get_partition_functions_from_nist,
+                    ["temperature"],
+                    (tuple(species_parameters[:2] for species_parameters in species), carrier_gas),
+                ),
+                Stage(
+                    "ionization_energies",
+                    self._get_ionization_energies_from_nist,
+                    parameters=(tuple(species_parameters[0] for species_parameters in species), carrier_gas[0], nist),
+                ),
+                Stage(
+                    "atom_concentration",
+                    self._calculate_atom_concentration,
+                    ["intensity_ratios", "partition_functions"],
+                ),
+                Stage(
+                    "electron_concentration",
+                    self._calculate_electron_concentration,
+                    ["temperature", "partition_functions", "ionization_energies", "intensity_ratios"],
+                    astuple(self.config.plasma_composition),
+                ),
+                Stage(
+                    "ion_atom_concentrations",
+                    self._calculate_ion_atom_concentrations,
+                    ["temperature", "partition_functions", "ionization_energies", "electron_concentration"],
+                ),
+                Stage(
+                    "total_concentration",
+                    self._calculate_total_concentration,
+                    ["atom_concentration", "ion_atom_concentrations"],
+                ),
+                Stage(
+                    "additional_species_total_concentrations",
+                    self._calculate_additional_species_total_concentrations,
+                    ["intensity_ratios", "partition_functions", "ion_atom_concentrations"],
+                ),
+                Stage(
+                    "uncertainty",
+                    self._calculate_uncertainty,
+                    ["atomic_lines", "integrals", "ionization_energies"],
+                    (astuple(self.config.uncertainty), astuple(self.config.plasma_composition)),
+                    after=[stage.name for stage in atomic_levels_stages],
+                ),
+            ]
+        )
+
+    def execute(self, pipeline: Pipeline) -> models.Result:
+        profiler = self._create_profiler(pipeline)
+        if not self.config.instrumentation.enabled and not self.config.prometheus.enabled:
+            with profiler.profile(RUN_TARGET):
+                return self.create_result(self.run_pipeline(pipeline, profiler=profiler))
+
+        try:
+            with recording(MetricsRecorder(self.config.instrumentation.trace_memory)) as recorder:
+                with profiler.profile(RUN_TARGET):
+                    results = self.run_pipeline(pipeline, recorder, profiler)
+        except Exception:
+            if self.config.prometheus.enabled:
+                shared_prometheus_exporter.observe_failure()
+                self._write_prometheus_file()
+            raise
+
+        result = self.create_result(results)
+        metrics = recorder.get_metrics()
+        if self.config.instrumentation.enabled:
+            result.metrics = metrics
+            if self.config.instrumentation.json_lines_file_path:
+                metrics.write_json_line(self.config.instrumentation.json_lines_file_path)
+        if self.config.prometheus.enabled:
+            self._export_to_prometheus(metrics)
+
+        return result
+
+    def run_pipeline(
+        self,
+        pipeline: Pipeline,
+        recorder: Optional[MetricsRecorder] = None,
+        profiler: Optional[StageProfiler] = None,
+    ) -> Dict[str, Any]:
+        if self.stage_memo is not None:
+            pipeline = pipeline.memoized(self.stage_memo)
+        if profiler is not None and profiler.targets:
+            pipeline = pipeline.profiled(profiler)
+        if recorder is not None:
+            pipeline = pipeline.instrumented(recorder)
+
+        return self.scheduler.run(pipeline)
+
+    def _export_to_prometheus(self, metrics: RunMetrics) -> None:
+        shared_prometheus_exporter.observe_run(metrics)
+        self._write_prometheus_file()
+
+    def _write_prometheus_file(self) -> None:
+        if self.config.prometheus.file_path:
+            shared_prometheus_exporter.write(self.config.prometheus.file_path)
+
+    def _create_profiler(self, pipeline: Pipeline) -> StageProfiler:
+        profiling = self.config.profiling
+        unknown_targets = (
+            set(profiling.targets)
+            - {name for stage in pipeline.stages for name in [stage.name, get_stage_group(stage.name)]}
+            - {RUN_TARGET}
+        )
+        if unknown_targets:
+            raise ValueError(f"Unknown profiling targets: {', '.join(sorted(unknown_targets))}")
+        # only one profiler can be active at a time (python 3.12+) and cProfile only sees the calling thread
+        if RUN_TARGET in profiling.targets and len(profiling.targets) > 1:
+            raise ValueError(f"The {RUN_TARGET} profiling target cannot be combined with stage targets")
+        if profiling.targets and not isinstance(self.scheduler, SerialScheduler):
+            raise ValueError("Profiling requires the serial scheduler, stages on worker threads are not profiled")
+
+        return StageProfiler(
+            targets=profiling.targets,
+            output_directory=profiling.output_directory,
+            cprofile=profiling.cprofile,
+            trace_memory=profiling.trace_memory,
+            top=profiling.top,
+        )
+
+    def _get_spectrum_parameters(self, spectrum: Optional[np.ndarray]):
+        # hashing the input is only worth it when the stage results are memoized
+        if self.stage_memo is None:
+            return None
+        if spectrum is not None:
+            return (spectrum.shape, str(spectrum.dtype), hashlib.sha1(np.ascontiguousarray(spectrum)).hexdigest())
+
+        with open(self.config.spectrum.file_path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
 
     def _read_spectrum(self):
         self.logger.info("Loading input spectrum")
@@ -141,54 +414,43 @@ class App:
             spectrum_correction_data.corrected_spectrum[:, 1]
         )
 
-    def _get_atomic_lines(self) -> models._NISTAtomicLinesData:
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.first_species.atom_name}"
-        )
-        first_species = self.atomic_lines_getter.get_data(
-            self.config.first_species.atom_name, self.config.first_species.target_peaks
-        )
+    def _get_species_configs(self) -> List[models.SpeciesConfig]:
+        return [self.config.first_species, self.config.second_species, *self.config.additional_species]
 
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.second_species.atom_name}"
-        )
-        second_species = self.atomic_lines_getter.get_data(
-            self.config.second_species.atom_name,
-            self.config.second_species.target_peaks,
-        )
+    def _get_atomic_lines(self, species_config: models.SpeciesConfig) -> np.ndarray:
+        self.logger.info(f"Retrieving atomic lines from NIST database for {species_config.atom_name}")
 
-        return models._NISTAtomicLinesData(
-            first_species,
-            second_species,
-        )
+        return self.atomic_lines_getter.get_data(species_config.atom_name, species_config.target_peaks)
 
-    def _caluclate_integrals(
-        self, spectrum_correction_data, peak_indices
-    ) -> models._IntegralsData:
-        self.logger.info("Calculating integrals")
+    def _collect_atomic_lines(self, *species_atomic_lines) -> models._NISTAtomicLinesData:
+        first_species, second_species, *additional_species = species_atomic_lines
 
-        first_species_data = self.integral_calculator.calculate(
-            spectrum_correction_data.corrected_spectrum,
-            peak_indices,
-            self.config.first_species.target_peaks,
-        )
+        return models._NISTAtomicLinesData(first_species, second_species, additional_species)
+
+    def _caluclate_integrals(self, species_config: models.SpeciesConfig, spectrum_correction_data, peak_indices):
+        self.logger.info(f"Calculating integrals for {species_config.atom_name}")
 
-        second_species_data = self.integral_calculator.calculate(
+        return self.integral_calculator.calculate(
             spectrum_correction_data.corrected_spectrum,
             peak_indices,
-            self.config.second_species.target_peaks,
+            species_config.target_peaks,
         )
 
-        return models._IntegralsData(first_species_data, second_species_data)
+    def _collect_integrals(self, *species_integrals_data) -> models._IntegralsData:
+        first_species, second_species, *additional_species = species_integrals_data
+
+        return models._IntegralsData(first_species, second_species, additional_species)
 
     def _calculate_intensity_ratios(self, atomic_lines, integrals_data):
         self.logger.info("Calculating intensity ratios")
 
-        return self.intensity_ratios_calculator.calculate(
-            first_species_atomic_lines=atomic_lines.first_species,
-            first_species_integrals=integrals_data.first_species.integrals,
-            second_species_atomic_lines=atomic_lines.second_species,
-            second_species_integrals=integrals_data.second_species.integrals,
+        return self.intensity_ratios_calculator.calculate_joint(
+            [atomic_lines.first_species, atomic_lines.second_species, *atomic_lines.additional_species],
+            [
+                integrals_data.first_species.integrals,
+                integrals_data.second_species.integrals,
+                *[species_integrals_data.integrals for species_integrals_data in integrals_data.additional_species],
+            ],
         )
 
     def _calculate_temperature(self, intensity_ratio_data):
@@ -198,55 +460,33 @@ class App:
             intensity_ratio_data.fitted_intensity_ratios
         )
 
-    def _get_partition_functions_from_nist(
-        self, temperature
-    ) -> models._NISTPartitionFunctionData:
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.first_species.atom_name}"
-        )
-        first_species_atom = self.partition_function_getter.get_data(
-            species_name=self.config.first_species.atom_name,
-            temperature=temperature,
-        )
+    def _get_atomic_levels_from_nist(self, species_names: List[str]) -> None:
+        self.logger.info(f"Retrieving atomic levels from NIST database for {', '.join(species_names)}")
 
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.first_species.ion_name}"
-        )
-        first_species_ion = self.partition_function_getter.get_data(
-            species_name=self.config.first_species.ion_name, temperature=temperature
-        )
+        for species_name in species_names:
+            self.partition_function_getter.get_atomic_levels(species_name)
 
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.second_species.atom_name}"
-        )
-        second_species_atom = self.partition_function_getter.get_data(
-            species_name=self.config.second_species.atom_name,
-            temperature=temperature,
-        )
-
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.second_species.ion_name}"
-        )
-        second_species_ion = self.partition_function_getter.get_data(
-            species_name=self.config.second_species.ion_name,
-            temperature=temperature,
-        )
+    def _get_partition_functions_from_nist(self, temperature) -> models._NISTPartitionFunctionData:
+        species_configs = self._get_species_configs()
+        species_names = [
+            species_name
+            for species_config in species_configs
+            for species_name in [species_config.atom_name, species_config.ion_name]
+        ] + [self.config.carrier_gas.atom_name, self.config.carrier_gas.ion_name]
+        self.logger.info(f"Retrieving partition functions from NIST database for {', '.join(species_names)}")
 
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.carrier_gas.atom_name}"
-        )
-        carrier_species_atom = self.partition_function_getter.get_data(
-            species_name=self.config.carrier_gas.atom_name,
-            temperature=temperature,
-        )
-
-        self.logger.info(
-            f"Retrieving partition function from NIST database for {self.config.carrier_gas.ion_name}"
-        )
-        carrier_species_ion = self.partition_function_getter.get_data(
-            species_name=self.config.carrier_gas.ion_name,
-            temperature=temperature,
-        )
+        (
+            first_species_atom,
+            first_species_ion,
+            second_species_atom,
+            second_species_ion,
+            *additional_species,
+            carrier_species_atom,
+            carrier_species_ion,
+        ) = [
+            self.partition_function_getter.get_data(species_name=species_name, temperature=temperature)
+            for species_name in species_names
+        ]
 
         return models._NISTPartitionFunctionData(
             first_species_atom,
@@ -255,34 +495,26 @@ class App:
             second_species_ion,
             carrier_species_atom,
             carrier_species_ion,
+            additional_species[0::2],
+            additional_species[1::2],
         )
 
     def _get_ionization_energies_from_nist(self) -> models._NISTIonizationEnergyData:
+        species_names = [species_config.atom_name for species_config in self._get_species_configs()] + [
+            self.config.carrier_gas.atom_name
+        ]
         self.logger.info(
-            f"Retrieving ionization_energy from NIST database for {self.config.first_species.atom_name}"
-        )
-        first_species = self.ionization_energy_getter.get_data(
-            self.config.first_species.atom_name
-        )
-
-        self.logger.info(
-            f"Retrieving ionization_energy from NIST database for {self.config.second_species.atom_name}"
-        )
-        second_species = self.ionization_energy_getter.get_data(
-            self.config.second_species.atom_name
-        )
-
-        self.logger.info(
-            f"Retrieving ionization_energy from NIST database for {self.config.carrier_gas.atom_name}"
+            f"Retrieving ionization_energy from NIST database for {', '.join(species_names)}"
         )
-        carrier_species = self.ionization_energy_getter.get_data(
-            self.config.carrier_gas.atom_name
+        first_species, second_species, *additional_species, carrier_species = (
+            self.ionization_energy_getter.get_bulk_data(species_names)
         )
 
         return models._NISTIonizationEnergyData(
             first_species,
             second_species,
             carrier_species,
+            additional_species,
         )
 
     def _calculate_atom_concentration(self, intensity_ratio_data, partition_functions):
@@ -295,8 +527,12 @@ class App:
         )
 
     def _calculate_electron_concentration(
-        self, temperature, partition_functions, ionization_energies
+        self, temperature, partition_functions, ionization_energies, intensity_ratio_data
     ):
+        if self.config.plasma_composition.enabled:
+            return self._solve_plasma_composition(
+                temperature, partition_functions, ionization_energies, intensity_ratio_data
+            )
         self.logger.info("Estimating electron concentration")
 
         return self.electron_concentration_calculation.calculate(
@@ -306,6 +542,54 @@ class App:
             partition_function_ion=partition_functions.carrier_species_ion,
         )
 
+    def _solve_plasma_composition(self, temperature, partition_functions, ionization_energies, intensity_ratio_data):
+        self.logger.info("Solving the charge balance of the plasma for the electron concentration")
+
+        slope = intensity_ratio_data.fitted_intensity_ratios[0]
+        species_intercepts = intensity_ratio_data.species_intercepts
+        partition_functions_atom = [
+            partition_functions.first_species_atom,
+            partition_functions.second_species_atom,
+            *partition_functions.additional_species_atom,
+        ]
+        partition_functions_ion = [
+            partition_functions.first_species_ion,
+            partition_functions.second_species_ion,
+            *partition_functions.additional_species_ion,
+        ]
+        species_ionization_energies = [
+            ionization_energies.first_species,
+            ionization_energies.second_species,
+            *ionization_energies.additional_species,
+        ]
+
+        return self.plasma_composition_calculator.calculate(
+            temperature=temperature,
+            carrier_gas_saha_factor=calculate_saha_boltzmann_factor(temperature, ionization_energies.carrier_species)
+            * partition_functions.carrier_species_ion
+            / partition_functions.carrier_species_atom,
+            species_saha_factors=np.array(
+                [
+                    calculate_saha_boltzmann_factor(temperature, ionization_energy) * partition_function_ion
+                    / partition_function_atom
+                    for ionization_energy, partition_function_atom, partition_function_ion in zip(
+                        species_ionization_energies, partition_functions_atom, partition_functions_ion
+                    )
+                ]
+            ),
+            # relative to the second species
+            species_atom_concentrations=np.array(
+                [
+                    self.atom_concentration_calculatior.calculate(
+                        fitted_ratios=[slope, intercept - species_intercepts[1]],
+                        first_species_atom_partition_function=partition_function_atom,
+                        second_species_atom_partition_function=partition_functions.second_species_atom,
+                    )
+                    for intercept, partition_function_atom in zip(species_intercepts, partition_functions_atom)
+                ]
+            ),
+        )
+
     def _calculate_ion_atom_concentrations(
         self,
         temperature,
@@ -315,25 +599,37 @@ class App:
     ) -> models._IonAtomConcentrationData:
         self.logger.info("Calculating ion-atom concentration")
 
-        first_species = self.ion_atom_concentration_calculator.calculate(
-            electron_concentration=electron_concentration,
-            temperature=temperature,
-            ionization_energy=ionization_energies.first_species,
-            partition_function_atom=partition_functions.first_species_atom,
-            partition_function_ion=partition_functions.first_species_ion,
-        )
-
-        second_species = self.ion_atom_concentration_calculator.calculate(
-            electron_concentration=electron_concentration,
-            temperature=temperature,
-            ionization_energy=ionization_energies.second_species,
-            partition_function_atom=partition_functions.second_species_atom,
-            partition_function_ion=partition_functions.second_species_ion,
-        )
+        first_species, second_species, *additional_species = [
+            self.ion_atom_concentration_calculator.calculate(
+                electron_concentration=electron_concentration,
+                temperature=temperature,
+                ionization_energy=ionization_energy,
+                partition_function_atom=partition_function_atom,
+                partition_function_ion=partition_function_ion,
+            )
+            for ionization_energy, partition_function_atom, partition_function_ion in zip(
+                [
+                    ionization_energies.first_species,
+                    ionization_energies.second_species,
+                    *ionization_energies.additional_species,
+                ],
+                [
+                    partition_functions.first_species_atom,
+                    partition_functions.second_species_atom,
+                    *partition_functions.additional_species_atom,
+                ],
+                [
+                    partition_functions.first_species_ion,
+                    partition_functions.second_species_ion,
+                    *partition_functions.additional_species_ion,
+                ],
+            )
+        ]
 
         return models._IonAtomConcentrationData(
             first_species,
             second_species,
+            additional_species,
         )
 
     def _calculate_total_concentration(
@@ -346,3 +642,76 @@ class App:
             ion_atom_concentrations.first_species,
             ion_atom_concentrations.second_species,
         )
+
+    def _calculate_additional_species_total_concentrations(
+        self, intensity_ratio_data, partition_functions, ion_atom_concentrations
+    ) -> List[float]:
+        if not self.config.additional_species:
+            return []
+        self.logger.info("Calculating total concentration of additional species")
+
+        # relative to the second species, like the total concentration of the first species
+        slope = intensity_ratio_data.fitted_intensity_ratios[0]
+        second_species_intercept = intensity_ratio_data.species_intercepts[1]
+
+        return [
+            self.total_concentration_calculator.calculate(
+                self.atom_concentration_calculatior.calculate(
+                    fitted_ratios=[slope, intercept - second_species_intercept],
+                    first_species_atom_partition_function=partition_function_atom,
+                    second_species_atom_partition_function=partition_functions.second_species_atom,
+                ),
+                ion_atom_concentration,
+                ion_atom_concentrations.second_species,
+            )
+            for intercept, partition_function_atom, ion_atom_concentration in zip(
+                intensity_ratio_data.species_intercepts[2:],
+                partition_functions.additional_species_atom,
+                ion_atom_concentrations.additional_species,
+            )
+        ]
+
+    def _calculate_uncertainty(self, atomic_lines, integrals_data, ionization_energies) -> Optional[UncertaintyData]:
+        if not self.config.uncertainty.enabled:
+            return None
+        self.logger.info(f"Propagating uncertainties with {self.config.uncertainty.samples} Monte Carlo samples")
+
+        species_data = [
+            UncertaintySpeciesData(
+                atomic_levels_atom=self.partition_function_getter.get_atomic_levels(species_config.atom_name),
+                atomic_levels_ion=self.partition_function_getter.get_atomic_levels(species_config.ion_name),
+                ionization_energy=ionization_energy,
+                atomic_lines=species_atomic_lines,
+                integrals=species_integrals_data.integrals,
+                integral_errors=species_integrals_data.integral_errors,
+            )
+            for species_config, species_atomic_lines, species_integrals_data, ionization_energy in zip(
+                self._get_species_configs(),
+                [atomic_lines.first_species, atomic_lines.second_species, *atomic_lines.additional_species],
+                [integrals_data.first_species, integrals_data.second_species, *integrals_data.additional_species],
+                [
+                    ionization_energies.first_species,
+                    ionization_energies.second_species,
+                    *ionization_energies.additional_species,
+                ],
+            )
+        ]
+        carrier_gas_data = UncertaintySpeciesData(
+            atomic_levels_atom=self.partition_function_getter.get_atomic_levels(self.config.carrier_gas.atom_name),
+            atomic_levels_ion=self.partition_function_getter.get_atomic_levels(self.config.carrier_gas.ion_name),
+            ionization_energy=ionization_energies.carrier_species,
+        )
+
+        return self.uncertainty_calculator.calculate(species_data, carrier_gas_data)
+
+
+class PreparedApp:
+    def __init__(self, app: App, config_results: Dict[str, Any]) -> None:
+        self.app = app
+        self.config_results = config_results
+
+    def run(self, spectrum: Optional[np.ndarray] = None) -> models.Result:
+        """Runs the spectrum dependent stages on the given spectrum or on the configured spectrum file."""
+        pipeline = self.app.create_pipeline(spectrum).with_results(self.config_results)
+
+        return self.app.execute(pipeline)
@@ -1,98 +1,296 @@
+import os
+
 import numpy as np
+import pytest
 from pytest import approx
 
 from spark_mec_bp import application
+from spark_mec_bp.instrumentation import MemoryBudget, PrometheusExporter, measure_memory
+from spark_mec_bp.synthetic import (
+    AU_AG_LINES,
+    SyntheticLine,
+    SyntheticSpectrumConfig,
+    SyntheticSpectrumGenerator,
+    write_spectrum,
+)
+from tests.shared_data import ATOMIC_LINES, create_config, mock_nist_getters
+
+# bytes per spectrum point, a result retains the original and corrected spectrum and the baseline of its shot
+BATCH_MEMORY_BUDGET_PER_SHOT = 64
+BATCH_MEMORY_BUDGET_FIXED = 512
+
+
+@pytest.mark.parametrize("scheduler", [None, application.ConcurrentScheduler()])
+def test_mec_bp_e2e(mocker, scheduler):
+    mock_nist_getters(mocker)
+
+    app = application.App(create_config(), scheduler)
+
+    result = app.run()
+
+    assert result.temperature == approx(12770.740, 0.001)
+    assert result.total_concentration == approx(1.11428, 0.001)
 
 
-def test_mec_bp_e2e(mocker):
-    first_species_atomic_lines = np.array(
-        [
-            [3.1227800e02, 1.9000000e07, 4.0000000e00, 4.1174613e04],
-            [4.0650700e02, 8.5000000e07, 4.0000000e00, 6.1951600e04],
-            [4.7925800e02, 8.9000000e07, 6.0000000e00, 6.2033700e04],
-        ]
+def test_prepared_app_reuses_config_results(mocker):
+    atomic_lines_getter, partition_function_getter, ioniztion_energy_getter = mock_nist_getters(mocker)
+    config = create_config()
+    spectrum = np.loadtxt(config.spectrum.file_path)
+
+    prepared_app = application.App(config).prepare(spectrum_length=len(spectrum))
+    results = [prepared_app.run(), prepared_app.run(spectrum)]
+
+    for result in results:
+        assert result.temperature == approx(12770.740, 0.001)
+        assert result.total_concentration == approx(1.11428, 0.001)
+    assert atomic_lines_getter.return_value.get_data.call_count == 2
+    partition_function_getter.return_value.get_atomic_levels.assert_not_called()
+    assert ioniztion_energy_getter.return_value.get_bulk_data.call_count == 1
+
+
+@pytest.mark.parametrize("scheduler", [None, application.ConcurrentScheduler()])
+def test_app_fits_additional_species_jointly(mocker, tmp_path, scheduler):
+    mock_nist_getters(mocker)
+    copper_lines = [SyntheticLine("Cu I", *line) for line in ATOMIC_LINES["Cu I"]]
+    spectrum_config = SyntheticSpectrumConfig(
+        temperature=12000.0,
+        population_ratios={"Au I": 1.0, "Ag I": 1.0, "Cu I": 2.0},
+        lines=AU_AG_LINES + copper_lines,
+        shots=1,
     )
-    second_species_atomic_lines = np.array(
-        [
-            [3.38288700e02, 1.30000000e08, 2.00000000e00, 2.95520574e04],
-            [5.20907800e02, 7.50000000e07, 4.00000000e00, 4.87439690e04],
-            [5.46549700e02, 8.60000000e07, 6.00000000e00, 4.87642190e04],
-        ]
+    spectrum_file_path = str(tmp_path / "synthetic.asc")
+    write_spectrum(spectrum_file_path, SyntheticSpectrumGenerator(spectrum_config).generate())
+    config = create_config()
+    config.spectrum = application.SpectrumConfig(
+        spectrum_file_path, wavelength_column_index=0, intensity_column_index=1
     )
-    partition_function_first_species_atom = 5.0
-    partition_function_second_species_atom = 3.04
-    partition_function_carrier_species_atom = 1.0
-    partition_function_carrier_species_ion = 5.7
-    partition_function_first_species_ion = 3.44
-    ionization_energy_carrier_species = 127109.842
-    ionization_energy_first_species = 74409.11
-    partition_function_second_species_ion = 1.19
-    ionization_energy_second_species = 61106.45
-
-    atomic_lines_getter = mocker.patch(
-        "spark_mec_bp.application.app.AtomicLinesDataGetter",
+    copper = application.SpeciesConfig(atom_name="Cu I", ion_name="Cu II", target_peaks=[324.754, 515.324, 521.82])
+    config.additional_species = [copper]
+
+    app = application.App(config, scheduler=scheduler)
+    stage_names = [stage.name for stage in app.create_pipeline().stages]
+    result = app.run()
+    config.first_species, config.additional_species = copper, []
+    copper_silver_result = application.App(config).run()
+
+    assert {"integrals[Au I]", "integrals[Ag I]", "integrals[Cu I]", "atomic_lines[Cu I]"} <= set(stage_names)
+    assert len(result.intensity_ratios) == 3 * 3 + 3 * 3 + 3 * 3
+    assert result.temperature == approx(12000.0, rel=0.03)
+    assert len(result.additional_species_integrals_data) == 1
+    assert result.additional_species_total_concentrations == approx(
+        [copper_silver_result.total_concentration], rel=0.05
     )
-    atomic_lines_getter.return_value.get_data.side_effect = [
-        first_species_atomic_lines,
-        second_species_atomic_lines,
-    ]
-    partition_function_getter = mocker.patch(
-        "spark_mec_bp.application.app.PartitionFunctionDataGetter",
+
+
+def test_app_propagates_uncertainties_if_enabled(mocker):
+    mock_nist_getters(mocker)
+    config = create_config()
+    default_stage_names = [stage.name for stage in application.App(config).create_pipeline().stages]
+    config.uncertainty = application.UncertaintyConfig(
+        enabled=True, samples=2000, unknown_aki_uncertainty=0.05, seed=0
     )
-    partition_function_getter.return_value.get_data.side_effect = [
-        partition_function_first_species_atom,
-        partition_function_first_species_ion,
-        partition_function_second_species_atom,
-        partition_function_second_species_ion,
-        partition_function_carrier_species_atom,
-        partition_function_carrier_species_ion,
+    stage_names = [stage.name for stage in application.App(config).create_pipeline().stages]
+
+    result = application.App(config).run()
+
+    assert np.isfinite(result.first_species_integrals_data.integral_errors).all()
+    assert result.uncertainty.temperatures.shape == (2000,)
+    assert np.median(result.uncertainty.temperatures) == approx(result.temperature, rel=0.02)
+    assert np.median(result.uncertainty.total_concentrations) == approx(result.total_concentration, rel=0.05)
+    assert result.uncertainty.temperature_std > 0
+    assert {"atomic_levels[Au I]", "atomic_levels[Ag I]", "atomic_levels[Ar I]"} <= set(stage_names)
+    assert not any(stage_name.startswith("atomic_levels") for stage_name in default_stage_names)
+
+
+def test_app_solves_the_plasma_composition_if_enabled(mocker):
+    mock_nist_getters(mocker)
+    default_result = application.App(create_config()).run()
+    config = create_config()
+    config.plasma_composition = application.PlasmaCompositionConfig(enabled=True, analyte_fraction=0.0)
+    carrier_gas_result = application.App(config).run()
+    config.plasma_composition = application.PlasmaCompositionConfig(enabled=True, analyte_fraction=0.05)
+    config.uncertainty = application.UncertaintyConfig(enabled=True, samples=2000, seed=0)
+
+    result = application.App(config).run()
+
+    assert carrier_gas_result.total_concentration == approx(default_result.total_concentration, rel=1e-10)
+    assert result.temperature == approx(default_result.temperature)
+    assert result.total_concentration != approx(default_result.total_concentration, rel=1e-3)
+    assert np.median(result.uncertainty.total_concentrations) == approx(result.total_concentration, rel=0.05)
+
+
+def test_app_has_no_uncertainty_by_default(mocker):
+    mock_nist_getters(mocker)
+
+    assert application.App(create_config()).run().uncertainty is None
+
+
+def run_batch(prepared_app, spectrum, shots):
+    return [prepared_app.run(spectrum[:, [0, shot]]) for shot in range(1, shots + 1)]
+
+
+def test_batch_memory_stays_within_budget_per_shot(mocker):
+    mock_nist_getters(mocker)
+    spectrum = SyntheticSpectrumGenerator(SyntheticSpectrumConfig(shots=8)).generate()
+    budget = MemoryBudget(
+        per_shot=BATCH_MEMORY_BUDGET_PER_SHOT * len(spectrum), fixed=BATCH_MEMORY_BUDGET_FIXED * len(spectrum)
+    )
+    config = create_config()
+    config.spectrum.intensity_column_index = 1
+    prepared_app = application.App(config).prepare(spectrum_length=len(spectrum))
+    run_batch(prepared_app, spectrum, 1)
+
+    usages = {}
+    for shots in [2, 8]:
+        with measure_memory() as usages[shots]:
+            results = run_batch(prepared_app, spectrum, shots)
+        del results
+
+        budget.check(usages[shots], shots)
+    assert usages[8].traced_peak - usages[2].traced_peak <= 6 * budget.per_shot
+
+
+def test_app_with_stage_memo_reruns_only_changed_stages(mocker):
+    atomic_lines_getter, _, _ = mock_nist_getters(mocker)
+    correct_spectrum = mocker.spy(application.app.SpectrumCorrector, "correct_spectrum")
+    find_peak_indices = mocker.spy(application.app.PeakFinder, "find_peak_indices")
+    stage_memo = application.StageMemo()
+    config = create_config()
+
+    first_result = application.App(config, stage_memo=stage_memo).run()
+    config.voigt_integration = application.VoigtIntegrationConfig(prominence_window_length=40)
+    second_result = application.App(config, stage_memo=stage_memo).run()
+    config.peak_finding = application.PeakFindingConfig(minimum_requred_height=120)
+    third_result = application.App(config, stage_memo=stage_memo).run()
+
+    assert second_result.temperature == first_result.temperature
+    assert third_result.temperature == approx(12770.740, 0.001)
+    assert correct_spectrum.call_count == 1
+    assert find_peak_indices.call_count == 2
+    assert atomic_lines_getter.return_value.get_data.call_count == 2
+
+
+def test_app_attaches_metrics_if_instrumented(mocker, tmp_path):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.instrumentation = application.InstrumentationConfig(
+        enabled=True, json_lines_file_path=str(tmp_path / "metrics.jsonl")
+    )
+
+    result = application.App(config).run()
+
+    assert [stage.name for stage in result.metrics.stages] == [
+        stage.name for stage in application.App(config).create_pipeline().stages
     ]
+    assert result.metrics.fits == 6
+    assert result.metrics.fit_iterations > 6
+    assert result.metrics.wall_time >= sum(stage.wall_time for stage in result.metrics.stages)
+    assert (tmp_path / "metrics.jsonl").read_text().count("\n") == 1
+
+
+def test_app_has_no_metrics_by_default(mocker):
+    mock_nist_getters(mocker)
+
+    assert application.App(create_config()).run().metrics is None
 
-    ioniztion_energy_getter = mocker.patch(
-        "spark_mec_bp.application.app.IonizationEnergyDataGetter",
+
+def test_app_profiles_selected_stages(mocker, tmp_path):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(
+        targets=["spectrum_correction", "peak_indices"], output_directory=str(tmp_path)
     )
-    ioniztion_energy_getter.return_value.get_data.side_effect = [
-        ionization_energy_first_species,
-        ionization_energy_second_species,
-        ionization_energy_carrier_species,
+
+    application.App(config).run()
+
+    run_directories = os.listdir(tmp_path)
+    assert len(run_directories) == 1
+    assert sorted(os.listdir(tmp_path / run_directories[0])) == [
+        "peak_indices.prof",
+        "peak_indices.txt",
+        "spectrum_correction.prof",
+        "spectrum_correction.txt",
     ]
+    with open(tmp_path / run_directories[0] / "spectrum_correction.txt") as file:
+        assert "_calculate_baseline" in file.read()
+
+
+def test_app_profiles_per_species_stages_by_their_group(mocker, tmp_path):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(targets=["integrals"], output_directory=str(tmp_path))
+
+    application.App(config).run()
+
+    run_directory = tmp_path / os.listdir(tmp_path)[0]
+    assert sorted(os.listdir(run_directory)) == ["integrals.prof", "integrals.txt"]
+    with open(run_directory / "integrals.txt") as file:
+        assert "voigt_integrals.py" in file.read()
+
+
+def test_app_rejects_unknown_profiling_target(mocker):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(targets=["baseline"])
 
-    config = application.AppConfig(
-        spectrum=application.SpectrumConfig(
-            file_path="spark_mec_bp/application/test_data/input_data.asc",
-            wavelength_column_index=0,
-            intensity_column_index=10
-        ),
-        first_species=application.SpeciesConfig(
-            atom_name="Au I",
-            ion_name="Au II",
-            target_peaks=[312.278, 406.507, 479.26]
-        ),
-        second_species=application.SpeciesConfig(
-            atom_name="Ag I",
-            ion_name="Ag II",
-            target_peaks=[338.29, 520.9078, 546.54]
-        ),
-        carrier_gas=application.CarrierGasConfig(
-            atom_name="Ar I",
-            ion_name="Ar II"
-        ),
-        spectrum_correction=application.SpectrumCorrectionConfig(
-            iteration_limit=50,
-            ratio=0.00001,
-            lam=1000000
-        ),
-        peak_finding=application.PeakFindingConfig(
-            minimum_requred_height=100
-        ),
-        voigt_integration=application.VoigtIntegrationConfig(
-            prominence_window_length=40
-        )
+    with pytest.raises(ValueError, match="Unknown profiling targets: baseline"):
+        application.App(config).run()
+
+
+def test_app_profiles_whole_run(mocker, tmp_path):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(targets=["run"], output_directory=str(tmp_path))
+
+    application.App(config).run()
+
+    run_directory = tmp_path / os.listdir(tmp_path)[0]
+    assert sorted(os.listdir(run_directory)) == ["run.prof", "run.txt"]
+    with open(run_directory / "run.txt") as file:
+        assert "_calculate_baseline" in file.read()
+
+
+def test_app_rejects_run_profiling_target_with_stage_targets(mocker):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(targets=["run", "spectrum_correction"])
+
+    with pytest.raises(ValueError, match="cannot be combined"):
+        application.App(config).run()
+
+
+def test_app_rejects_profiling_with_concurrent_scheduler(mocker):
+    mock_nist_getters(mocker)
+    config = create_config()
+    config.profiling = application.ProfilingConfig(targets=["run"])
+
+    with pytest.raises(ValueError, match="serial scheduler"):
+        application.App(config, scheduler=application.ConcurrentScheduler()).run()
+
+
+def test_profiling_config_from_environment(monkeypatch):
+    monkeypatch.setenv("SPARK_MEC_BP_PROFILE", "spectrum_correction, integrals")
+    monkeypatch.setenv("SPARK_MEC_BP_PROFILE_MEMORY", "1")
+    monkeypatch.setenv("SPARK_MEC_BP_PROFILE_DIRECTORY", "/tmp/profiles")
+
+    assert create_config().profiling == application.ProfilingConfig(
+        targets=["spectrum_correction", "integrals"], trace_memory=True, output_directory="/tmp/profiles"
     )
 
-    app = application.App(config)
 
-    result = app.run()
+def test_app_exports_prometheus_metrics(mocker, tmp_path):
+    mock_nist_getters(mocker)
+    exporter = mocker.patch(
+        "spark_mec_bp.application.app.shared_prometheus_exporter", PrometheusExporter()
+    )
+    config = create_config()
+    config.prometheus = application.PrometheusConfig(enabled=True, file_path=str(tmp_path / "metrics.prom"))
 
-    assert result.temperature == approx(12770.740, 0.001)
-    assert result.total_concentration == approx(1.11428, 0.001)
+    result = application.App(config).run()
+
+    assert result.metrics is None
+    metrics_file = (tmp_path / "metrics.prom").read_text()
+    assert "spark_mec_bp_spectra_processed_total 1.0\n" in metrics_file
+    assert "spark_mec_bp_fits_total 6.0\n" in metrics_file
+    assert "spark_mec_bp_baseline_iterations_count 1\n" in metrics_file
+    assert metrics_file == exporter.registry.render()
@@ -1,7 +1,11 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
 import numpy as np
 
-from spark_mec_bp.calculators import VoigtIntegralData
+from spark_mec_bp.calculators import UncertaintyData, VoigtIntegralData
+from spark_mec_bp.instrumentation import RunMetrics
 
 
 @dataclass
@@ -18,6 +22,12 @@ class Result:
     second_species_atomic_lines: np.ndarray
     first_species_integrals_data: VoigtIntegralData
     second_species_integrals_data: VoigtIntegralData
+    metrics: Optional[RunMetrics] = None
+    additional_species_atomic_lines: List[np.ndarray] = field(default_factory=list)
+    additional_species_integrals_data: List[VoigtIntegralData] = field(default_factory=list)
+    # total concentrations of the additional species relative to the second species
+    additional_species_total_concentrations: List[float] = field(default_factory=list)
+    uncertainty: Optional[UncertaintyData] = None
 
 
 @dataclass
@@ -60,6 +70,71 @@ class CarrierGasConfig:
     ion_name: int
 
 
+@dataclass
+class NISTConfig:
+    offline: bool = False
+    bundle_file_path: Optional[str] = None
+
+    def __post_init__(self):
+        if self.offline and not self.bundle_file_path:
+            raise ValueError("bundle_file_path must be set when NIST data is used offline")
+
+
+@dataclass
+class InstrumentationConfig:
+    enabled: bool = False
+    trace_memory: bool = False
+    json_lines_file_path: Optional[str] = None
+
+
+@dataclass
+class PrometheusConfig:
+    enabled: bool = False
+    port: Optional[int] = None
+    host: str = "127.0.0.1"
+    file_path: Optional[str] = None
+
+
+@dataclass
+class UncertaintyConfig:
+    enabled: bool = False
+    samples: int = 10000
+    unknown_aki_uncertainty: float = 0.5  # relative, for lines without a NIST accuracy class
+    seed: Optional[int] = None
+    unknown_integral_uncertainty: float = 0.5  # relative, for integrals whose fit gave no error estimate
+
+
+@dataclass
+class PlasmaCompositionConfig:
+    enabled: bool = False  # otherwise the electron concentration is estimated from the carrier gas alone
+    analyte_fraction: float = 0.01  # of the heavy particles, split between the species by their atom concentrations
+    tolerance: float = 1e-12  # relative
+    max_iterations: int = 50
+
+
+@dataclass
+class ProfilingConfig:
+    targets: List[str] = field(default_factory=list)
+    cprofile: bool = True
+    trace_memory: bool = False
+    output_directory: str = "profiles"
+    top: int = 20
+
+    def __post_init__(self):
+        if self.targets and not (self.cprofile or self.trace_memory):
+            raise ValueError("cprofile or trace_memory must be enabled to profile targets")
+
+    @classmethod
+    def from_environment(cls) -> "ProfilingConfig":
+        targets = os.environ.get("SPARK_MEC_BP_PROFILE", "").split(",")
+
+        return cls(
+            targets=[target.strip() for target in targets if target.strip()],
+            trace_memory=os.environ.get("SPARK_MEC_BP_PROFILE_MEMORY", "0") == "1",
+            output_directory=os.environ.get("SPARK_MEC_BP_PROFILE_DIRECTORY", "profiles"),
+        )
+
+
 @dataclass
 class AppConfig:
     spectrum: SpectrumConfig
@@ -69,12 +144,20 @@ class AppConfig:
     spectrum_correction: SpectrumCorrectionConfig
     peak_finding: PeakFindingConfig
     voigt_integration: VoigtIntegrationConfig
+    nist: NISTConfig = field(default_factory=NISTConfig)
+    instrumentation: InstrumentationConfig = field(default_factory=InstrumentationConfig)
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig.from_environment)
+    prometheus: PrometheusConfig = field(default_factory=PrometheusConfig)
+    additional_species: List[SpeciesConfig] = field(default_factory=list)
+    uncertainty: UncertaintyConfig = field(default_factory=UncertaintyConfig)
+    plasma_composition: PlasmaCompositionConfig = field(default_factory=PlasmaCompositionConfig)
 
 
 @dataclass
 class _NISTAtomicLinesData:
     first_species: np.ndarray
     second_species: np.ndarray
+    additional_species: List[np.ndarray] = field(default_factory=list)
 
 
 @dataclass
@@ -85,6 +168,8 @@ class _NISTPartitionFunctionData:
     second_species_ion: float
     carrier_species_atom: float
     carrier_species_ion: float
+    additional_species_atom: List[float] = field(default_factory=list)
+    additional_species_ion: List[float] = field(default_factory=list)
 
 
 @dataclass
@@ -92,15 +177,18 @@ class _NISTIonizationEnergyData:
     first_species: float
     second_species: float
     carrier_species: float
+    additional_species: List[float] = field(default_factory=list)
 
 
 @dataclass
 class _IntegralsData:
     first_species: VoigtIntegralData
     second_species: VoigtIntegralData
+    additional_species: List[VoigtIntegralData] = field(default_factory=list)
 
 
 @dataclass
 class _IonAtomConcentrationData:
     first_species: float
     second_species: float
+    additional_species: List[float] = field(default_factory=list)
@@ -0,0 +1,156 @@
+import contextvars
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, ContextManager, Dict, Hashable, List
+
+from spark_mec_bp.application.stage_memo import StageMemo
+from spark_mec_bp.instrumentation import MetricsRecorder, StageProfiler
+
+MAX_WORKERS = 4
+
+
+@dataclass
+class Stage:
+    name: str
+    function: Callable[..., Any]
+    dependencies: List[str] = field(default_factory=list)
+    parameters: Hashable = None
+    # stages to finish first without passing their results, e.g. ones filling a cache the stage reads
+    after: List[str] = field(default_factory=list)
+
+    def run(self, results: Dict[str, Any]) -> Any:
+        return self.function(*[results[dependency] for dependency in self.dependencies])
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage]) -> None:
+        self._validate_stages(stages)
+        self.stages = stages
+
+    def _validate_stages(self, stages: List[Stage]) -> None:
+        # stages must be listed in a topological order, which also rules out cycles
+        seen_stage_names = set()
+        for stage in stages:
+            if stage.name in seen_stage_names:
+                raise ValueError(f"Duplicate pipeline stage {stage.name}")
+            for dependency in stage.dependencies:
+                if dependency not in seen_stage_names:
+                    raise ValueError(
+                        f"Pipeline stage {stage.name} depends on {dependency} which is not declared before it"
+                    )
+            for predecessor in stage.after:
+                if predecessor not in seen_stage_names:
+                    raise ValueError(
+                        f"Pipeline stage {stage.name} runs after {predecessor} which is not declared before it"
+                    )
+            seen_stage_names.add(stage.name)
+
+    def with_results(self, results: Dict[str, Any]) -> "Pipeline":
+        """Returns a pipeline in which the given stages return their known results instead of running."""
+        return Pipeline(
+            [
+                Stage(stage.name, _constant(results[stage.name]), parameters=stage.parameters)
+                if stage.name in results
+                else stage
+                for stage in self.stages
+            ]
+        )
+
+    def memoized(self, stage_memo: StageMemo) -> "Pipeline":
+        """Returns a pipeline whose stages reuse the memoized results of previous runs.
+
+        The key of a stage is derived from its name, its parameters and the keys of its dependencies and of the
+        stages it runs after, so a changed parameter invalidates the stage and every stage downstream of it.
+        """
+        stage_keys = {}
+        memoized_stages = []
+        for stage in self.stages:
+            stage_key = hashlib.sha1(
+                repr(
+                    (
+                        stage.name,
+                        stage.parameters,
+                        [stage_keys[dependency] for dependency in stage.dependencies],
+                        [stage_keys[predecessor] for predecessor in stage.after],
+                    )
+                ).encode()
+            ).hexdigest()
+            stage_keys[stage.name] = stage_key
+            memoized_stages.append(replace(stage, function=_memoized(stage_memo, stage_key, stage.function)))
+
+        return Pipeline(memoized_stages)
+
+    def instrumented(self, recorder: MetricsRecorder) -> "Pipeline":
+        return self.wrapped(recorder.measure_stage)
+
+    def profiled(self, profiler: StageProfiler) -> "Pipeline":
+        return self.wrapped(profiler.profile)
+
+    def wrapped(self, create_context: Callable[[str], ContextManager]) -> "Pipeline":
+        """Returns a pipeline whose stages run in the context created for their name."""
+        return Pipeline(
+            [replace(stage, function=_wrapped(create_context, stage.name, stage.function)) for stage in self.stages]
+        )
+
+    def select(self, stage_names: List[str]) -> "Pipeline":
+        return Pipeline([stage for stage in self.stages if stage.name in stage_names])
+
+
+class SerialScheduler:
+    def run(self, pipeline: Pipeline) -> Dict[str, Any]:
+        results = {}
+        for stage in pipeline.stages:
+            results[stage.name] = stage.run(results)
+
+        return results
+
+
+class ConcurrentScheduler:
+    def __init__(self, max_workers: int = MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+
+    def run(self, pipeline: Pipeline) -> Dict[str, Any]:
+        results = {}
+        pending_stages = list(pipeline.stages)
+        running_stages = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending_stages or running_stages:
+                for stage in self._get_ready_stages(pending_stages, results):
+                    pending_stages.remove(stage)
+                    # the stage runs in the context of the caller, e.g. with its metrics recorder
+                    running_stages[
+                        executor.submit(contextvars.copy_context().run, stage.run, dict(results))
+                    ] = stage
+
+                done_futures, _ = wait(running_stages, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    stage = running_stages.pop(future)
+                    results[stage.name] = future.result()
+
+        return results
+
+    def _get_ready_stages(self, pending_stages: List[Stage], results: Dict[str, Any]) -> List[Stage]:
+        return [
+            stage
+            for stage in pending_stages
+            if all(dependency in results for dependency in stage.dependencies + stage.after)
+        ]
+
+
+def _constant(value: Any) -> Callable[[], Any]:
+    return lambda: value
+
+
+def _memoized(stage_memo: StageMemo, stage_key: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    return lambda *dependencies: stage_memo.get_or_run(stage_key, lambda: function(*dependencies))
+
+
+def _wrapped(
+    create_context: Callable[[str], ContextManager], stage_name: str, function: Callable[..., Any]
+) -> Callable[..., Any]:
+    def wrapped_function(*dependencies):
+        with create_context(stage_name):
+            return function(*dependencies)
+
+    return wrapped_function
@@ -0,0 +1,158 @@
+from threading import Barrier
+
+import pytest
+
+from spark_mec_bp.application.pipeline import ConcurrentScheduler, Pipeline, SerialScheduler, Stage
+from spark_mec_bp.application.stage_memo import StageMemo
+from spark_mec_bp.instrumentation import MetricsRecorder, get_recorder, recording
+
+
+def create_pipeline(calls):
+    def stage_function(name, value):
+        def function(*dependencies):
+            calls.append(name)
+            return value + sum(dependencies)
+
+        return function
+
+    return Pipeline(
+        [
+            Stage("a", stage_function("a", 1)),
+            Stage("b", stage_function("b", 10), ["a"]),
+            Stage("c", stage_function("c", 100)),
+            Stage("d", stage_function("d", 1000), ["b", "c"]),
+        ]
+    )
+
+
+@pytest.mark.parametrize("scheduler", [SerialScheduler(), ConcurrentScheduler()])
+def test_scheduler_runs_all_stages_with_dependency_results(scheduler):
+    calls = []
+
+    results = scheduler.run(create_pipeline(calls))
+
+    assert results == {"a": 1, "b": 11, "c": 100, "d": 1111}
+    assert sorted(calls) == ["a", "b", "c", "d"]
+    assert calls[-1] == "d"
+
+
+def test_serial_scheduler_keeps_declaration_order():
+    calls = []
+
+    SerialScheduler().run(create_pipeline(calls))
+
+    assert calls == ["a", "b", "c", "d"]
+
+
+def test_concurrent_scheduler_overlaps_independent_stages():
+    barrier = Barrier(2, timeout=5)
+    pipeline = Pipeline(
+        [
+            Stage("first", barrier.wait),
+            Stage("second", barrier.wait),
+            Stage("joined", lambda first, second: "done", ["first", "second"]),
+        ]
+    )
+
+    results = ConcurrentScheduler(max_workers=2).run(pipeline)
+
+    assert results["joined"] == "done"
+
+
+def test_concurrent_scheduler_raises_stage_error():
+    def fail():
+        raise RuntimeError("stage failed")
+
+    pipeline = Pipeline([Stage("failing", fail), Stage("next", lambda value: value, ["failing"])])
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        ConcurrentScheduler().run(pipeline)
+
+
+def test_pipeline_rejects_undeclared_dependency():
+    with pytest.raises(ValueError, match="depends on b"):
+        Pipeline([Stage("a", lambda b: b, ["b"]), Stage("b", lambda: 1)])
+
+
+@pytest.mark.parametrize("scheduler", [SerialScheduler(), ConcurrentScheduler()])
+def test_scheduler_runs_stage_after_its_predecessors_without_their_results(scheduler):
+    calls = []
+    pipeline = Pipeline(
+        [
+            Stage("cache", lambda: calls.append("cache")),
+            Stage("reader", lambda: calls.append("reader") or "read", after=["cache"]),
+        ]
+    )
+
+    results = scheduler.run(pipeline)
+
+    assert results["reader"] == "read"
+    assert calls == ["cache", "reader"]
+
+
+def test_pipeline_rejects_undeclared_predecessor():
+    with pytest.raises(ValueError, match="runs after b"):
+        Pipeline([Stage("a", lambda: 1, after=["b"]), Stage("b", lambda: 1)])
+
+
+def test_pipeline_rejects_duplicate_stage():
+    with pytest.raises(ValueError, match="Duplicate"):
+        Pipeline([Stage("a", lambda: 1), Stage("a", lambda: 2)])
+
+
+def test_pipeline_with_results_skips_known_stages():
+    calls = []
+
+    results = SerialScheduler().run(create_pipeline(calls).with_results({"b": 20}))
+
+    assert results == {"a": 1, "b": 20, "c": 100, "d": 1120}
+    assert calls == ["a", "c", "d"]
+
+
+def test_pipeline_select_keeps_given_stages():
+    calls = []
+
+    results = SerialScheduler().run(create_pipeline(calls).select(["a", "c"]))
+
+    assert results == {"a": 1, "c": 100}
+
+
+def test_memoized_pipeline_reruns_only_stages_downstream_of_changed_parameters():
+    stage_memo = StageMemo()
+    calls = []
+
+    def create_parametrized_pipeline(c_parameter):
+        return Pipeline(
+            [
+                Stage("a", lambda: calls.append("a") or 1, parameters=1),
+                Stage("b", lambda a: calls.append("b") or a + 10, ["a"]),
+                Stage("c", lambda b: calls.append("c") or b + c_parameter, ["b"], c_parameter),
+            ]
+        ).memoized(stage_memo)
+
+    first_results = SerialScheduler().run(create_parametrized_pipeline(100))
+    second_results = SerialScheduler().run(create_parametrized_pipeline(200))
+    third_results = SerialScheduler().run(create_parametrized_pipeline(100))
+
+    assert first_results == {"a": 1, "b": 11, "c": 111}
+    assert second_results == {"a": 1, "b": 11, "c": 211}
+    assert third_results == first_results
+    assert calls == ["a", "b", "c", "c"]
+
+
+def test_instrumented_pipeline_measures_stages_run_concurrently():
+    recorder = MetricsRecorder()
+    pipeline = Pipeline(
+        [
+            Stage("request", lambda: get_recorder().record_nist_request(10)),
+            Stage("fit", lambda: get_recorder().record_fit(3)),
+        ]
+    )
+
+    with recording(recorder):
+        ConcurrentScheduler().run(pipeline.instrumented(recorder))
+
+    metrics = recorder.get_metrics()
+    assert sorted(stage.name for stage in metrics.stages) == ["fit", "request"]
+    assert metrics.nist_requests == 1
+    assert metrics.fit_iterations == 3
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any, Callable, Hashable, Tuple
+
+from spark_mec_bp.instrumentation import estimate_size
+
+MEMORY_BUDGET = 512 * 1024 * 1024  # bytes
+
+
+@dataclass
+class StageMemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class StageMemo:
+    def __init__(self, memory_budget: int = MEMORY_BUDGET) -> None:
+        self.memory_budget = memory_budget
+        self._lock = Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._stats = StageMemoStats()
+
+    def get_or_run(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._stats.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self._stats.misses += 1
+
+        result = function()
+        self._put(key, result, estimate_size(result))
+
+        return result
+
+    def get_stats(self) -> StageMemoStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = StageMemoStats()
+
+    def _put(self, key: Hashable, result: Any, size: int) -> None:
+        if size > self.memory_budget:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (result, size)
+            self._stats.size += size
+            while self._stats.size > self.memory_budget:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._stats.size -= evicted_size
+                self._stats.evictions += 1
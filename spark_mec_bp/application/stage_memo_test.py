@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from spark_mec_bp.application.stage_memo import StageMemo, StageMemoStats, estimate_size
+
+
+@dataclass
+class DummyData:
+    first: np.ndarray
+    second: list
+
+
+def test_get_or_run_memoizes_result():
+    stage_memo = StageMemo()
+    calls = []
+
+    first_result = stage_memo.get_or_run("key", lambda: calls.append(1) or np.zeros(10))
+    second_result = stage_memo.get_or_run("key", lambda: calls.append(1) or np.zeros(10))
+
+    assert second_result is first_result
+    assert calls == [1]
+    assert stage_memo.get_stats() == StageMemoStats(hits=1, misses=1, evictions=0, size=80)
+
+
+def test_get_or_run_evicts_least_recently_used_results_over_budget():
+    stage_memo = StageMemo(memory_budget=200)
+
+    stage_memo.get_or_run("first", lambda: np.zeros(10))
+    stage_memo.get_or_run("second", lambda: np.zeros(10))
+    stage_memo.get_or_run("first", lambda: np.zeros(10))
+    stage_memo.get_or_run("third", lambda: np.zeros(10))
+
+    stats = stage_memo.get_stats()
+    assert stats.evictions == 1
+    assert stats.size == 160
+    stage_memo.get_or_run("first", lambda: np.ones(10))
+    assert stage_memo.get_stats().hits == 2
+    assert stage_memo.get_or_run("second", lambda: np.ones(10))[0] == 1
+
+
+def test_get_or_run_does_not_store_result_over_budget():
+    stage_memo = StageMemo(memory_budget=50)
+
+    stage_memo.get_or_run("key", lambda: np.zeros(10))
+
+    assert stage_memo.get_stats().size == 0
+    assert stage_memo.get_or_run("key", lambda: np.ones(10))[0] == 1
+
+
+def test_estimate_size_of_nested_data():
+    size = estimate_size(DummyData(np.zeros(100), [np.zeros(10), np.zeros(10)]))
+
+    assert size > 960
+    assert size < 2000
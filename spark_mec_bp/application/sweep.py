@@ -0,0 +1,140 @@
+import itertools
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import fields, replace
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from spark_mec_bp.application import models
+from spark_mec_bp.application.app import App
+from spark_mec_bp.application.stage_memo import StageMemo
+from spark_mec_bp.data_preparation.cache import AtomicLinesTileCache
+from spark_mec_bp.data_preparation.getters import (
+    AtomicLinesDataGetter,
+    IonizationEnergyDataGetter,
+    PartitionFunctionDataGetter,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# grid points sharing the values of these sections share the read spectrum and its baseline
+SHARED_PREFIX_SECTIONS = ["spectrum", "spectrum_correction"]
+RESULT_COLUMNS = ["temperature", "total_concentration", "error"]
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        config: models.AppConfig,
+        grid: Dict[str, list],
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        """Sweeps the AppConfig fields of the grid, given as "section.field" paths, e.g. "spectrum_correction.lam".
+
+        The grid points run on the given executor or on a process pool of max_workers started with mp_context.
+        """
+        self._validate_grid(config, grid)
+        self.config = config
+        self.grid = grid
+        self.max_workers = max_workers
+        self.executor = executor
+        self.mp_context = mp_context
+
+    def get_grid_points(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.grid, values)) for values in itertools.product(*self.grid.values())]
+
+    def group_grid_points(self, grid_points: List[Dict[str, Any]], workers: int = 1) -> List[List[Dict[str, Any]]]:
+        """Groups the grid points by their shared prefix and splits the groups into chunks for the workers.
+
+        Every chunk recomputes the prefix once, so the groups are only split as far as needed to keep all workers
+        busy.
+        """
+        groups: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        for grid_point in grid_points:
+            shared_prefix = tuple(
+                value for path, value in grid_point.items() if path.split(".")[0] in SHARED_PREFIX_SECTIONS
+            )
+            groups.setdefault(shared_prefix, []).append(grid_point)
+
+        chunk_size = max(math.ceil(len(grid_points) / workers), 1)
+
+        return [
+            group[start:start + chunk_size] for group in groups.values() for start in range(0, len(group), chunk_size)
+        ]
+
+    def create_config(self, grid_point: Dict[str, Any]) -> models.AppConfig:
+        sections = {}
+        for path, value in grid_point.items():
+            section_name, field_name = path.split(".")
+            section = sections.get(section_name, getattr(self.config, section_name))
+            sections[section_name] = replace(section, **{field_name: value})
+
+        return replace(self.config, **sections)
+
+    def run(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        App(self.config).prepare()
+        groups = self.group_grid_points(self.get_grid_points(), self.max_workers or os.cpu_count() or 1)
+        group_configs = [[self.create_config(grid_point) for grid_point in group] for group in groups]
+
+        if self.executor is not None:
+            group_results = list(self.executor.map(_run_group, group_configs))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_initialize_worker,
+                initargs=(
+                    AtomicLinesDataGetter.shared_tile_cache,
+                    PartitionFunctionDataGetter.shared_atomic_levels,
+                    IonizationEnergyDataGetter.shared_ionization_energies,
+                ),
+            ) as executor:
+                group_results = list(executor.map(_run_group, group_configs))
+
+        rows = [
+            {**grid_point, **dict(zip(RESULT_COLUMNS, result))}
+            for group, results in zip(groups, group_results)
+            for grid_point, result in zip(group, results)
+        ]
+
+        return pd.DataFrame(rows, columns=list(self.grid) + RESULT_COLUMNS)
+
+    def _validate_grid(self, config: models.AppConfig, grid: Dict[str, list]) -> None:
+        for path in grid:
+            section_name, _, field_name = path.partition(".")
+            section = getattr(config, section_name, None)
+            if section is None or field_name not in [field.name for field in fields(section)]:
+                raise ValueError(f"{path} is not a field of AppConfig")
+
+
+def _initialize_worker(
+    tile_cache: AtomicLinesTileCache,
+    atomic_levels: Dict[Tuple[Any, str], Any],
+    ionization_energies: Dict[Tuple[Any, str], float],
+) -> None:
+    # the atomic lines, level tables and ionization energies retrieved by the parent process are reused by all
+    # workers, the partition functions depend on the fitted temperature and are queried by every worker
+    AtomicLinesDataGetter.shared_tile_cache = tile_cache
+    PartitionFunctionDataGetter.shared_atomic_levels.update(atomic_levels)
+    IonizationEnergyDataGetter.shared_ionization_energies.update(ionization_energies)
+
+
+def _run_group(configs: List[models.AppConfig]) -> List[Tuple[float, float, Optional[str]]]:
+    stage_memo = StageMemo()
+    results = []
+    for config in configs:
+        try:
+            result = App(config, stage_memo=stage_memo).run()
+        except Exception as error:
+            results.append((float("nan"), float("nan"), repr(error)))
+        else:
+            results.append((result.temperature, result.total_concentration, None))
+
+    return results
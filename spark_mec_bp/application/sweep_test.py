@@ -0,0 +1,106 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from pytest import approx
+
+from spark_mec_bp import application
+from tests.shared_data import create_config, create_fixture_bundle, mock_nist_getters
+
+
+def test_parameter_sweep_rejects_unknown_field():
+    with pytest.raises(ValueError, match="peak_finding.height is not a field of AppConfig"):
+        application.ParameterSweep(create_config(), {"peak_finding.height": [100]})
+
+
+def test_group_grid_points_by_shared_prefix():
+    sweep = application.ParameterSweep(
+        create_config(),
+        {"spectrum_correction.lam": [1e6, 1e7], "peak_finding.minimum_requred_height": [100, 120]},
+    )
+
+    groups = sweep.group_grid_points(sweep.get_grid_points())
+
+    assert groups == [
+        [
+            {"spectrum_correction.lam": 1e6, "peak_finding.minimum_requred_height": 100},
+            {"spectrum_correction.lam": 1e6, "peak_finding.minimum_requred_height": 120},
+        ],
+        [
+            {"spectrum_correction.lam": 1e7, "peak_finding.minimum_requred_height": 100},
+            {"spectrum_correction.lam": 1e7, "peak_finding.minimum_requred_height": 120},
+        ],
+    ]
+
+
+def test_group_grid_points_splits_large_groups_across_workers():
+    sweep = application.ParameterSweep(
+        create_config(),
+        {"spectrum_correction.lam": [1e6], "peak_finding.minimum_requred_height": [100, 110, 120, 130, 140]},
+    )
+
+    groups = sweep.group_grid_points(sweep.get_grid_points(), workers=2)
+
+    assert [[grid_point["peak_finding.minimum_requred_height"] for grid_point in group] for group in groups] == [
+        [100, 110, 120],
+        [130, 140],
+    ]
+
+
+def test_create_config_replaces_grid_fields_only():
+    config = create_config()
+    sweep = application.ParameterSweep(config, {"spectrum_correction.lam": [1e7]})
+
+    swept_config = sweep.create_config({"spectrum_correction.lam": 1e7, "spectrum_correction.ratio": 1e-4})
+
+    assert swept_config.spectrum_correction == application.SpectrumCorrectionConfig(
+        iteration_limit=50, ratio=1e-4, lam=1e7
+    )
+    assert config.spectrum_correction.lam == 1000000
+    assert swept_config.peak_finding is config.peak_finding
+
+
+def test_parameter_sweep_computes_shared_baselines_once(mocker):
+    mock_nist_getters(mocker)
+    correct_spectrum = mocker.spy(application.app.SpectrumCorrector, "correct_spectrum")
+    sweep = application.ParameterSweep(
+        create_config(),
+        {"spectrum_correction.lam": [1000000, 2000000], "peak_finding.minimum_requred_height": [100, 120]},
+        max_workers=2,
+        executor=ThreadPoolExecutor(max_workers=2),
+    )
+
+    table = sweep.run()
+
+    assert list(table.columns) == [
+        "spectrum_correction.lam",
+        "peak_finding.minimum_requred_height",
+        "temperature",
+        "total_concentration",
+        "error",
+    ]
+    assert table["spectrum_correction.lam"].tolist() == [1000000, 1000000, 2000000, 2000000]
+    assert table["temperature"][0] == approx(12770.740, 0.001)
+    assert np.isfinite(table["total_concentration"]).all()
+    assert table["error"].isna().all()
+    assert correct_spectrum.call_count == 2
+
+
+def test_parameter_sweep_runs_on_spawned_process_pool(tmp_path):
+    # spawned workers receive the shared NIST caches of the parent pickled
+    bundle_file_path = str(tmp_path / "nist_bundle.json")
+    create_fixture_bundle().save(bundle_file_path)
+    config = create_config()
+    config.nist = application.NISTConfig(offline=True, bundle_file_path=bundle_file_path)
+    sweep = application.ParameterSweep(
+        config,
+        {"peak_finding.minimum_requred_height": [100, 120]},
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    table = sweep.run()
+
+    assert table["error"].isna().all()
+    assert np.isfinite(table["temperature"]).all()
@@ -4,5 +4,14 @@ from .total_concentration import TotalConcentrationCalculator
 from .electron_concetration import ElectronConcentrationCalculator
 from .voigt_integrals import VoigtIntegralCalculator, VoigtIntegralCalculatorConfig, VoigtIntegralData, VoigtIntegralFit
 from .temperature import TemperatureCalculator
-from .intensity_ratios import IntensityRatiosCalculator
-
+from .intensity_ratios import (
+    IntensityRatiosCalculator,
+    IntensityRatiosData,
+    BatchIntensityRatiosData,
+    JointBatchIntensityRatiosData,
+)
+from .boltzmann_plot_fitter import BoltzmannPlotFitter, BoltzmannPlotFitData
+from .partition_function import PartitionFunctionCalculator
+from .saha_factor_table import SahaFactorTable, SahaFactorTableCalculator
+from .plasma_composition import PlasmaCompositionCalculator
+from .monte_carlo_uncertainty import MonteCarloUncertaintyCalculator, UncertaintyData, UncertaintySpeciesData
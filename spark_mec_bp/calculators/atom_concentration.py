@@ -12,3 +12,16 @@ class AtomConcentraionCalculator:
             first_species_atom_partition_function
             / second_species_atom_partition_function
         )
+
+    def calculate_batch(
+        self,
+        fitted_ratios: np.ndarray,
+        first_species_atom_partition_functions: np.ndarray,
+        second_species_atom_partition_functions: np.ndarray,
+    ) -> np.ndarray:
+        """Takes the fitted slopes and intercepts of the shots as rows."""
+        return self.calculate(
+            np.asarray(fitted_ratios).T,
+            first_species_atom_partition_functions,
+            second_species_atom_partition_functions,
+        )
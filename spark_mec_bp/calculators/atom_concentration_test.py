@@ -0,0 +1,19 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import AtomConcentraionCalculator
+
+
+def test_calculate_batch_matches_calculate():
+    calculator = AtomConcentraionCalculator()
+    fitted_ratios = np.array([[1.1e-4, 0.1], [1.3e-4, 0.2], [1.5e-4, 0.3]])
+    first_species_atom_partition_functions = np.array([4.9, 5.0, 5.1])
+
+    atom_concentrations = calculator.calculate_batch(fitted_ratios, first_species_atom_partition_functions, 3.04)
+
+    assert atom_concentrations == approx(
+        [
+            calculator.calculate(shot_fitted_ratios, partition_function, 3.04)
+            for shot_fitted_ratios, partition_function in zip(fitted_ratios, first_species_atom_partition_functions)
+        ]
+    )
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class BoltzmannPlotFitData:
+    slopes: np.ndarray
+    intercepts: np.ndarray
+    slope_errors: np.ndarray
+    intercept_errors: np.ndarray
+
+    @property
+    def fitted_ratios(self) -> np.ndarray:
+        """Slope and intercept of every shot as rows, in the order of np.polyfit."""
+        return np.stack((self.slopes, self.intercepts), axis=-1)
+
+
+class BoltzmannPlotFitter:
+    def __init__(self, e_values: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        """Fits lines of the same energy differences for many shots, the weights are 1 / sigma of the points."""
+        e_values = np.asarray(e_values, dtype=float)
+        self.weights = np.ones_like(e_values) if weights is None else np.asarray(weights, dtype=float)
+        if len(e_values) < 2 or self.weights.shape != e_values.shape:
+            raise ValueError("At least 2 energy differences with one weight each are needed to fit a line")
+
+        self._design_matrix = np.stack((e_values, np.ones_like(e_values)), axis=-1) * self.weights[:, np.newaxis]
+        self._pseudo_inverse = np.linalg.pinv(self._design_matrix)
+        self._unscaled_covariance_diagonal = np.sum(self._pseudo_inverse ** 2, axis=1)
+
+    def fit(self, ln_ratios: np.ndarray) -> BoltzmannPlotFitData:
+        """Takes the ln intensity ratios of the shots as rows."""
+        weighted_ln_ratios = np.atleast_2d(ln_ratios) * self.weights
+        coefficients = weighted_ln_ratios @ self._pseudo_inverse.T
+        residuals = weighted_ln_ratios - coefficients @ self._design_matrix.T
+
+        degrees_of_freedom = len(self.weights) - 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            residual_variances = np.sum(residuals ** 2, axis=1) / degrees_of_freedom
+        errors = np.sqrt(residual_variances[:, np.newaxis] * self._unscaled_covariance_diagonal)
+
+        return BoltzmannPlotFitData(
+            slopes=coefficients[:, 0],
+            intercepts=coefficients[:, 1],
+            slope_errors=errors[:, 0],
+            intercept_errors=errors[:, 1],
+        )
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from pytest import approx
+
+from spark_mec_bp.calculators import BoltzmannPlotFitter
+
+E_VALUES = np.array([-11622.6, 7569.4, 7589.6, -32399.5, -13207.6, -13187.4, -32481.6, -13289.7, -13269.5])
+
+
+def create_ln_ratios(shots):
+    random = np.random.default_rng(0)
+
+    return 1.1e-4 * E_VALUES + 0.1 + 0.05 * random.standard_normal((shots, len(E_VALUES)))
+
+
+@pytest.mark.parametrize("weights", [None, np.linspace(0.5, 2.0, len(E_VALUES))])
+def test_fit_matches_polyfit_for_every_shot(weights):
+    ln_ratios = create_ln_ratios(5)
+
+    fit_data = BoltzmannPlotFitter(E_VALUES, weights).fit(ln_ratios)
+
+    for shot, shot_ln_ratios in enumerate(ln_ratios):
+        coefficients, covariance = np.polyfit(E_VALUES, shot_ln_ratios, 1, w=weights, cov=True)
+        assert fit_data.fitted_ratios[shot] == approx(coefficients)
+        assert [fit_data.slope_errors[shot], fit_data.intercept_errors[shot]] == approx(
+            np.sqrt(np.diag(covariance))
+        )
+
+
+def test_fit_accepts_a_single_shot():
+    fit_data = BoltzmannPlotFitter(E_VALUES).fit(create_ln_ratios(1)[0])
+
+    assert fit_data.slopes.shape == (1,)
+
+
+def test_fitter_rejects_mismatched_weights():
+    with pytest.raises(ValueError):
+        BoltzmannPlotFitter(E_VALUES, np.ones(3))
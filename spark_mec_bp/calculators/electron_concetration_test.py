@@ -0,0 +1,41 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import ElectronConcentrationCalculator
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
+
+
+def test_calculate_returns_the_root_of_the_saha_equation():
+    electron_concentration = ElectronConcentrationCalculator().calculate(12770.74, 127109.842, 1.0, 5.7)
+
+    assert electron_concentration == approx(1.23786e17, rel=1e-5)
+
+
+def test_calculate_batch_matches_calculate():
+    calculator = ElectronConcentrationCalculator()
+    temperatures = np.array([9000.0, 12000.0, 15000.0])
+    partition_functions_atom = np.array([1.0, 1.01, 1.02])
+    partition_functions_ion = np.array([5.5, 5.7, 5.9])
+
+    electron_concentrations = calculator.calculate_batch(
+        temperatures, 127109.842, partition_functions_atom, partition_functions_ion
+    )
+
+    assert electron_concentrations == approx(
+        [
+            calculator.calculate(temperature, 127109.842, partition_function_atom, partition_function_ion)
+            for temperature, partition_function_atom, partition_function_ion in zip(
+                temperatures, partition_functions_atom, partition_functions_ion
+            )
+        ]
+    )
+
+
+def test_calculate_from_saha_factors_matches_calculate_batch():
+    calculator = ElectronConcentrationCalculator()
+    temperatures = np.array([9000.0, 12000.0, 15000.0])
+    saha_factors = 5.7 * calculate_saha_boltzmann_factor(temperatures, 127109.842)
+
+    assert calculator.calculate_from_saha_factors(temperatures, saha_factors) == approx(
+        calculator.calculate_batch(temperatures, 127109.842, 1.0, 5.7)
+    )
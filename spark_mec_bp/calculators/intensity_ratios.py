@@ -1,12 +1,31 @@
 from dataclasses import dataclass
+from typing import List, Optional
 
 import numpy as np
 
+from spark_mec_bp.calculators.boltzmann_plot_fitter import BoltzmannPlotFitData, BoltzmannPlotFitter
+
 
 @dataclass
 class IntensityRatiosData:
     intensity_ratios: np.ndarray
     fitted_intensity_ratios: np.ndarray
+    # ln(n / Z) of every species relative to the first species, set by the joint fit
+    species_intercepts: Optional[np.ndarray] = None
+
+
+@dataclass
+class JointBatchIntensityRatiosData:
+    slopes: np.ndarray
+    # ln(n / Z) of every species relative to the first species with the shots as rows
+    species_intercepts: np.ndarray
+
+
+@dataclass
+class BatchIntensityRatiosData:
+    e_values: np.ndarray
+    ln_ratios: np.ndarray
+    fit: BoltzmannPlotFitData
 
 
 class IntensityRatiosCalculator:
@@ -30,6 +49,76 @@ class IntensityRatiosCalculator:
             fitted_intensity_ratios=fitted_ratios,
         )
 
+    def calculate_joint(
+        self, species_atomic_lines: List[np.ndarray], species_integrals: List[np.ndarray]
+    ) -> IntensityRatiosData:
+        """Fits one temperature to the line pairs of every two species, with an intercept per species.
+
+        For two species the line pairs and the fit are the same as the ones of calculate.
+        """
+        e_values, ln_ratios, coefficients = self._fit_joint(
+            species_atomic_lines, [np.atleast_2d(integrals) for integrals in species_integrals]
+        )
+        species_intercepts = np.concatenate(([0.0], coefficients[0, 1:]))
+
+        return IntensityRatiosData(
+            intensity_ratios=np.stack((e_values, ln_ratios[0]), axis=-1),
+            fitted_intensity_ratios=np.array([coefficients[0, 0], species_intercepts[0] - species_intercepts[1]]),
+            species_intercepts=species_intercepts,
+        )
+
+    def calculate_joint_batch(
+        self, species_atomic_lines: List[np.ndarray], species_integrals: List[np.ndarray]
+    ) -> JointBatchIntensityRatiosData:
+        """Takes the integrals of every species with the shots as rows, all shots are fitted at once."""
+        _, _, coefficients = self._fit_joint(species_atomic_lines, species_integrals)
+
+        return JointBatchIntensityRatiosData(
+            slopes=coefficients[:, 0],
+            species_intercepts=np.column_stack((np.zeros(len(coefficients)), coefficients[:, 1:])),
+        )
+
+    def calculate_batch(
+        self,
+        first_species_atomic_lines: np.ndarray,
+        first_species_integrals: np.ndarray,
+        second_species_atomic_lines: np.ndarray,
+        second_species_integrals: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+    ) -> BatchIntensityRatiosData:
+        """Takes the integrals of the shots as rows, the line pairs of every shot are fitted at once."""
+        first_species_ln = self._get_ln(first_species_atomic_lines, np.atleast_2d(first_species_integrals))
+        second_species_ln = self._get_ln(second_species_atomic_lines, np.atleast_2d(second_species_integrals))
+        ln_ratios = np.log(first_species_ln[:, :, np.newaxis] / second_species_ln[:, np.newaxis, :])
+        e_values = second_species_atomic_lines[:, 3] - first_species_atomic_lines[:, 3][:, np.newaxis]
+        ln_ratios = ln_ratios.reshape(len(ln_ratios), -1)
+        e_values = e_values.flatten()
+
+        return BatchIntensityRatiosData(
+            e_values=e_values,
+            ln_ratios=ln_ratios,
+            fit=BoltzmannPlotFitter(e_values, weights).fit(ln_ratios),
+        )
+
+    def _fit_joint(self, species_atomic_lines, species_integrals):
+        species_indices = np.concatenate(
+            [np.full(len(atomic_lines), index) for index, atomic_lines in enumerate(species_atomic_lines)]
+        )
+        atomic_lines = np.concatenate(species_atomic_lines)
+        ln = np.log(self._get_ln(atomic_lines, np.concatenate(species_integrals, axis=-1)))
+        first_lines, second_lines = np.nonzero(species_indices[:, np.newaxis] < species_indices)
+        e_values = atomic_lines[second_lines, 3] - atomic_lines[first_lines, 3]
+        ln_ratios = ln[:, first_lines] - ln[:, second_lines]
+
+        # ln_ratio = e_value / kT + c_first - c_second with c of the first species fixed to 0
+        species_columns = np.eye(len(species_atomic_lines))[:, 1:]
+        design_matrix = np.column_stack(
+            (e_values, species_columns[species_indices[first_lines]] - species_columns[species_indices[second_lines]])
+        )
+        coefficients = np.linalg.lstsq(design_matrix, ln_ratios.T, rcond=None)[0].T
+
+        return e_values, ln_ratios, coefficients
+
     def _calculate_intensity_ratios(
         self,
         first_species_atomic_lines,
@@ -0,0 +1,92 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import IntensityRatiosCalculator
+from tests.shared_data import FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES
+
+
+def test_calculate_batch_matches_calculate_for_every_shot():
+    calculator = IntensityRatiosCalculator()
+    random = np.random.default_rng(0)
+    first_species_integrals = random.uniform(10, 100, (4, 3))
+    second_species_integrals = random.uniform(10, 100, (4, 3))
+
+    batch_data = calculator.calculate_batch(
+        FIRST_SPECIES_ATOMIC_LINES,
+        first_species_integrals,
+        SECOND_SPECIES_ATOMIC_LINES,
+        second_species_integrals,
+    )
+
+    for shot in range(4):
+        data = calculator.calculate(
+            FIRST_SPECIES_ATOMIC_LINES,
+            first_species_integrals[shot],
+            SECOND_SPECIES_ATOMIC_LINES,
+            second_species_integrals[shot],
+        )
+        assert batch_data.e_values == approx(data.intensity_ratios[:, 0])
+        assert batch_data.ln_ratios[shot] == approx(data.intensity_ratios[:, 1])
+        assert batch_data.fit.fitted_ratios[shot] == approx(data.fitted_intensity_ratios)
+
+
+def test_calculate_joint_matches_calculate_for_two_species():
+    calculator = IntensityRatiosCalculator()
+    first_species_integrals = np.array([94.6, 12.4, 16.3])
+    second_species_integrals = np.array([1926.4, 64.0, 106.0])
+
+    joint_data = calculator.calculate_joint(
+        [FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES], [first_species_integrals, second_species_integrals]
+    )
+    data = calculator.calculate(
+        FIRST_SPECIES_ATOMIC_LINES, first_species_integrals, SECOND_SPECIES_ATOMIC_LINES, second_species_integrals
+    )
+
+    assert joint_data.intensity_ratios == approx(data.intensity_ratios)
+    assert joint_data.fitted_intensity_ratios == approx(data.fitted_intensity_ratios)
+    assert joint_data.species_intercepts == approx([0.0, -data.fitted_intensity_ratios[1]])
+
+
+def test_calculate_joint_fits_one_temperature_to_every_species():
+    third_species_atomic_lines = np.array(
+        [
+            [3.24754e02, 1.39e08, 4.0, 3.0783686e04],
+            [5.15324e02, 6.00e07, 4.0, 4.9935195e04],
+        ]
+    )
+    species_atomic_lines = [FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES, third_species_atomic_lines]
+    slope = 1 / (0.695035 * 12000)
+    ln_populations = [0.0, -0.5, 0.7]
+    # integrals of exact Boltzmann distributions, the inverse of ln(I * lambda / (g * A)) = ln(n / Z) - E / kT
+    species_integrals = [
+        np.exp(ln_population - slope * atomic_lines[:, 3])
+        * atomic_lines[:, 2]
+        * atomic_lines[:, 1]
+        / (atomic_lines[:, 0] * 1e-7)
+        for ln_population, atomic_lines in zip(ln_populations, species_atomic_lines)
+    ]
+
+    data = IntensityRatiosCalculator().calculate_joint(species_atomic_lines, species_integrals)
+
+    assert len(data.intensity_ratios) == 3 * 3 + 3 * 2 + 3 * 2
+    assert data.fitted_intensity_ratios == approx([slope, 0.5])
+    assert data.species_intercepts == approx(ln_populations)
+
+
+def test_calculate_joint_batch_matches_calculate_joint_for_every_shot():
+    calculator = IntensityRatiosCalculator()
+    random = np.random.default_rng(0)
+    first_species_integrals = random.uniform(10, 100, (4, 3))
+    second_species_integrals = random.uniform(10, 100, (4, 3))
+    species_atomic_lines = [FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES]
+
+    batch_data = calculator.calculate_joint_batch(
+        species_atomic_lines, [first_species_integrals, second_species_integrals]
+    )
+
+    for shot in range(4):
+        data = calculator.calculate_joint(
+            species_atomic_lines, [first_species_integrals[shot], second_species_integrals[shot]]
+        )
+        assert batch_data.slopes[shot] == approx(data.fitted_intensity_ratios[0])
+        assert batch_data.species_intercepts[shot] == approx(data.species_intercepts)
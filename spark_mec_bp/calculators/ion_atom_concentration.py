@@ -1,13 +1,6 @@
 import numpy as np
 
-m = 9.10938291e-28  # g
-k = 1.3807e-16  # cm2 g s-2 K-1
-h = 6.6261e-27  # cm2 g s-1
-e = -1  # elementary charge
-c = 2.99792458e10  # cm/s
-p = 1e6  # g/s^2 m
-
-X = (2 * np.pi * m * k) / np.power(h, 2)  # constant in Saha-Boltzmann equation
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
 
 
 class IonAtomConcentraionCalculator:
@@ -19,17 +12,24 @@ class IonAtomConcentraionCalculator:
         partition_function_atom: float,
         partition_function_ion: float,
     ) -> float:
-        ion_concentration = self._saha_boltzmann(
-            electron_concentration, temperature, ionization_energy
+        return self.calculate_batch(
+            electron_concentration, temperature, ionization_energy, partition_function_atom, partition_function_ion
         )
 
-        return ion_concentration * (partition_function_ion / partition_function_atom)
-
-    def _saha_boltzmann(self, electron_concentration, temperature, ionization_energy):
-        return (
-            2
-            * (1 / electron_concentration)
-            * np.power(X, 1.5)
-            * np.power(temperature, 1.5)
-            * np.exp(-(ionization_energy / (temperature * 0.695028)))
+    def calculate_batch(
+        self,
+        electron_concentrations: np.ndarray,
+        temperatures: np.ndarray,
+        ionization_energy: float,
+        partition_functions_atom: np.ndarray,
+        partition_functions_ion: np.ndarray,
+    ) -> np.ndarray:
+        return self.calculate_from_saha_factors(
+            electron_concentrations,
+            calculate_saha_boltzmann_factor(temperatures, ionization_energy)
+            * (partition_functions_ion / partition_functions_atom),
         )
+
+    def calculate_from_saha_factors(self, electron_concentrations: np.ndarray, saha_factors: np.ndarray) -> np.ndarray:
+        """Takes the Saha factors with the partition function ratio, e.g. looked up in a SahaFactorTable."""
+        return saha_factors / electron_concentrations
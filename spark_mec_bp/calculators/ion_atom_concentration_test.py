@@ -0,0 +1,37 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import IonAtomConcentraionCalculator
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
+
+
+def test_calculate_returns_the_saha_ion_atom_ratio():
+    ion_atom_concentration = IonAtomConcentraionCalculator().calculate(1e15, 12770.74, 74409.11, 5.0, 3.44)
+
+    assert ion_atom_concentration == approx(1096.6316, rel=1e-6)
+
+
+def test_calculate_batch_matches_calculate():
+    calculator = IonAtomConcentraionCalculator()
+    electron_concentrations = np.array([1e15, 2e15, 4e15])
+    temperatures = np.array([9000.0, 12000.0, 15000.0])
+
+    ion_atom_concentrations = calculator.calculate_batch(electron_concentrations, temperatures, 74409.11, 5.0, 3.44)
+
+    assert ion_atom_concentrations == approx(
+        [
+            calculator.calculate(electron_concentration, temperature, 74409.11, 5.0, 3.44)
+            for electron_concentration, temperature in zip(electron_concentrations, temperatures)
+        ]
+    )
+
+
+def test_calculate_from_saha_factors_matches_calculate_batch():
+    calculator = IonAtomConcentraionCalculator()
+    electron_concentrations = np.array([1e15, 2e15, 4e15])
+    temperatures = np.array([9000.0, 12000.0, 15000.0])
+    saha_factors = 3.44 / 5.0 * calculate_saha_boltzmann_factor(temperatures, 74409.11)
+
+    assert calculator.calculate_from_saha_factors(electron_concentrations, saha_factors) == approx(
+        calculator.calculate_batch(electron_concentrations, temperatures, 74409.11, 5.0, 3.44)
+    )
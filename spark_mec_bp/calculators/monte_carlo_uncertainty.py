@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from spark_mec_bp.calculators.atom_concentration import AtomConcentraionCalculator
+from spark_mec_bp.calculators.electron_concetration import ElectronConcentrationCalculator
+from spark_mec_bp.calculators.intensity_ratios import IntensityRatiosCalculator
+from spark_mec_bp.calculators.ion_atom_concentration import IonAtomConcentraionCalculator
+from spark_mec_bp.calculators.plasma_composition import PlasmaCompositionCalculator
+from spark_mec_bp.calculators.saha_factor_table import SahaFactorTableCalculator
+from spark_mec_bp.calculators.temperature import TemperatureCalculator
+from spark_mec_bp.calculators.total_concentration import TotalConcentrationCalculator
+
+AKI_UNCERTAINTY_COLUMN = 4
+
+
+@dataclass
+class UncertaintySpeciesData:
+    atomic_levels_atom: np.ndarray  # g and level energy rows
+    atomic_levels_ion: np.ndarray
+    ionization_energy: float
+    atomic_lines: Optional[np.ndarray] = None  # not needed for the carrier gas
+    integrals: Optional[np.ndarray] = None
+    integral_errors: Optional[np.ndarray] = None
+
+
+@dataclass
+class UncertaintyData:
+    temperatures: np.ndarray
+    total_concentrations: np.ndarray
+    # samples of the additional species as columns, relative to the second species
+    additional_species_total_concentrations: np.ndarray
+
+    @property
+    def temperature_std(self) -> float:
+        return float(np.nanstd(self.temperatures))
+
+    @property
+    def total_concentration_std(self) -> float:
+        return float(np.nanstd(self.total_concentrations))
+
+    def get_intervals(self, confidence: float = 0.95) -> dict:
+        """Returns the central confidence interval of the temperature and of the concentrations."""
+        percentiles = [50 * (1 - confidence), 50 * (1 + confidence)]
+
+        return {
+            "temperature": np.nanpercentile(self.temperatures, percentiles),
+            "total_concentration": np.nanpercentile(self.total_concentrations, percentiles),
+            "additional_species_total_concentrations": np.nanpercentile(
+                self.additional_species_total_concentrations, percentiles, axis=0
+            ).T,
+        }
+
+
+class MonteCarloUncertaintyCalculator:
+    def __init__(
+        self,
+        samples: int = 10000,
+        unknown_aki_uncertainty: float = 0.5,
+        seed: Optional[int] = None,
+        plasma_composition_calculator: Optional[PlasmaCompositionCalculator] = None,
+        unknown_integral_uncertainty: float = 0.5,
+    ):
+        self.samples = samples
+        self.unknown_aki_uncertainty = unknown_aki_uncertainty
+        self.seed = seed
+        # the electron concentration is estimated from the carrier gas alone without it
+        self.plasma_composition_calculator = plasma_composition_calculator
+        self.unknown_integral_uncertainty = unknown_integral_uncertainty
+        self.intensity_ratios_calculator = IntensityRatiosCalculator()
+        self.temperature_calculator = TemperatureCalculator()
+        self.saha_factor_table_calculator = SahaFactorTableCalculator()
+        self.atom_concentration_calculator = AtomConcentraionCalculator()
+        self.electron_concentration_calculator = ElectronConcentrationCalculator()
+        self.ion_atom_concentration_calculator = IonAtomConcentraionCalculator()
+        self.total_concentration_calculator = TotalConcentrationCalculator()
+
+    def calculate(
+        self, species_data: List[UncertaintySpeciesData], carrier_gas_data: UncertaintySpeciesData
+    ) -> UncertaintyData:
+        """Propagates the integral errors and the Aki accuracies of the species, first and second one first."""
+        random = np.random.default_rng(self.seed)
+        # a sampled Aki scales ln(I * lambda / (g * Aki)) like the inverse of a sampled integral
+        species_integrals = [
+            self._sample(random, data.integrals, self._get_integral_uncertainties(data))
+            / self._sample(random, np.ones(len(data.atomic_lines)), self._get_aki_uncertainties(data))
+            for data in species_data
+        ]
+        fit_data = self.intensity_ratios_calculator.calculate_joint_batch(
+            [data.atomic_lines for data in species_data], species_integrals
+        )
+        intercepts = fit_data.species_intercepts
+        temperatures = self.temperature_calculator.calculate_batch(
+            np.column_stack((fit_data.slopes, intercepts[:, 0] - intercepts[:, 1]))
+        )
+
+        species_tables = [self._get_saha_factor_table(data) for data in species_data]
+        partition_functions_atom = [table.get_partition_functions_atom(temperatures) for table in species_tables]
+        species_saha_factors = [table.get_saha_factors(temperatures) for table in species_tables]
+        carrier_gas_saha_factors = self._get_saha_factor_table(carrier_gas_data).get_saha_factors(temperatures)
+        # relative to the second species
+        atom_concentrations = [
+            self.atom_concentration_calculator.calculate_batch(
+                np.column_stack((fit_data.slopes, intercepts[:, index] - intercepts[:, 1])),
+                partition_functions_atom[index],
+                partition_functions_atom[1],
+            )
+            for index in range(len(species_data))
+        ]
+        if self.plasma_composition_calculator is None:
+            electron_concentrations = self.electron_concentration_calculator.calculate_from_saha_factors(
+                temperatures, carrier_gas_saha_factors
+            )
+        else:
+            electron_concentrations = self.plasma_composition_calculator.calculate_batch(
+                temperatures,
+                carrier_gas_saha_factors,
+                np.column_stack(species_saha_factors),
+                np.column_stack(atom_concentrations),
+            )
+        ion_atom_concentrations = [
+            self.ion_atom_concentration_calculator.calculate_from_saha_factors(electron_concentrations, saha_factors)
+            for saha_factors in species_saha_factors
+        ]
+        total_concentrations = [
+            self.total_concentration_calculator.calculate_batch(
+                atom_concentrations[index], ion_atom_concentrations[index], ion_atom_concentrations[1]
+            )
+            for index in [0] + list(range(2, len(species_data)))
+        ]
+
+        return UncertaintyData(
+            temperatures=temperatures,
+            total_concentrations=total_concentrations[0],
+            additional_species_total_concentrations=np.column_stack(
+                total_concentrations[1:] or [np.empty((self.samples, 0))]
+            ),
+        )
+
+    def _sample(self, random, values, relative_uncertainties):
+        # log-normal, so that large uncertainties of poor accuracy classes cannot yield negative values
+        return values * np.exp(relative_uncertainties * random.standard_normal((self.samples, len(values))))
+
+    def _get_integral_uncertainties(self, data):
+        if data.integral_errors is None:
+            return np.zeros(len(data.integrals))
+
+        integral_uncertainties = data.integral_errors / data.integrals
+
+        # the error of a fit without a covariance estimate is unknown rather than zero
+        return np.where(
+            np.isfinite(integral_uncertainties), integral_uncertainties, self.unknown_integral_uncertainty
+        )
+
+    def _get_aki_uncertainties(self, data):
+        if data.atomic_lines.shape[1] <= AKI_UNCERTAINTY_COLUMN:
+            return np.full(len(data.atomic_lines), self.unknown_aki_uncertainty)
+
+        aki_uncertainties = data.atomic_lines[:, AKI_UNCERTAINTY_COLUMN]
+
+        return np.where(np.isnan(aki_uncertainties), self.unknown_aki_uncertainty, aki_uncertainties)
+
+    def _get_saha_factor_table(self, data):
+        return self.saha_factor_table_calculator.calculate(
+            data.ionization_energy, data.atomic_levels_atom, data.atomic_levels_ion
+        )
@@ -0,0 +1,151 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import (
+    AtomConcentraionCalculator,
+    ElectronConcentrationCalculator,
+    IntensityRatiosCalculator,
+    IonAtomConcentraionCalculator,
+    MonteCarloUncertaintyCalculator,
+    PlasmaCompositionCalculator,
+    TemperatureCalculator,
+    TotalConcentrationCalculator,
+    UncertaintySpeciesData,
+)
+from tests.shared_data import FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
+
+FIRST_SPECIES_INTEGRALS = np.array([94.6, 12.4, 16.3])
+SECOND_SPECIES_INTEGRALS = np.array([1926.4, 64.0, 106.0])
+
+
+def create_levels(partition_function):
+    # a single ground level gives a partition function independent of the temperature
+    return np.array([[partition_function, 0.0]])
+
+
+def create_species_data(aki_uncertainty=0.0, integral_uncertainty=0.0):
+    return [
+        UncertaintySpeciesData(
+            atomic_levels_atom=create_levels(atom_partition_function),
+            atomic_levels_ion=create_levels(ion_partition_function),
+            ionization_energy=ionization_energy,
+            atomic_lines=np.column_stack((atomic_lines, np.full(len(atomic_lines), aki_uncertainty))),
+            integrals=integrals,
+            integral_errors=integral_uncertainty * integrals,
+        )
+        for atomic_lines, integrals, atom_partition_function, ion_partition_function, ionization_energy in [
+            (FIRST_SPECIES_ATOMIC_LINES, FIRST_SPECIES_INTEGRALS, 5.0, 3.44, 74409.11),
+            (SECOND_SPECIES_ATOMIC_LINES, SECOND_SPECIES_INTEGRALS, 3.04, 1.19, 61106.45),
+        ]
+    ]
+
+
+def create_carrier_gas_data():
+    return UncertaintySpeciesData(create_levels(1.0), create_levels(5.7), 127109.842)
+
+
+def calculate_point_estimates():
+    fitted_ratios = IntensityRatiosCalculator().calculate(
+        FIRST_SPECIES_ATOMIC_LINES, FIRST_SPECIES_INTEGRALS, SECOND_SPECIES_ATOMIC_LINES, SECOND_SPECIES_INTEGRALS
+    ).fitted_intensity_ratios
+    temperature = TemperatureCalculator().calculate(fitted_ratios)
+    electron_concentration = ElectronConcentrationCalculator().calculate(temperature, 127109.842, 1.0, 5.7)
+    ion_atom_calculator = IonAtomConcentraionCalculator()
+    total_concentration = TotalConcentrationCalculator().calculate(
+        AtomConcentraionCalculator().calculate(fitted_ratios, 5.0, 3.04),
+        ion_atom_calculator.calculate(electron_concentration, temperature, 74409.11, 5.0, 3.44),
+        ion_atom_calculator.calculate(electron_concentration, temperature, 61106.45, 3.04, 1.19),
+    )
+
+    return temperature, total_concentration
+
+
+def test_calculate_without_uncertainties_returns_the_point_estimates():
+    temperature, total_concentration = calculate_point_estimates()
+
+    uncertainty_data = MonteCarloUncertaintyCalculator(samples=100, seed=0).calculate(
+        create_species_data(), create_carrier_gas_data()
+    )
+
+    assert uncertainty_data.temperatures == approx(np.full(100, temperature))
+    assert uncertainty_data.total_concentrations == approx(np.full(100, total_concentration))
+    assert uncertainty_data.additional_species_total_concentrations.shape == (100, 0)
+
+
+def test_calculate_propagates_integral_and_aki_uncertainties():
+    temperature, total_concentration = calculate_point_estimates()
+    calculator = MonteCarloUncertaintyCalculator(samples=10000, seed=0)
+
+    integral_uncertainty_data = calculator.calculate(
+        create_species_data(integral_uncertainty=0.02), create_carrier_gas_data()
+    )
+    aki_uncertainty_data = calculator.calculate(
+        create_species_data(aki_uncertainty=0.1, integral_uncertainty=0.02), create_carrier_gas_data()
+    )
+
+    assert np.median(integral_uncertainty_data.temperatures) == approx(temperature, rel=0.01)
+    assert np.median(integral_uncertainty_data.total_concentrations) == approx(total_concentration, rel=0.05)
+    assert 0 < integral_uncertainty_data.temperature_std < aki_uncertainty_data.temperature_std
+    lower, upper = aki_uncertainty_data.get_intervals(0.95)["temperature"]
+    assert lower < temperature < upper
+
+
+def test_calculate_uses_the_unknown_aki_uncertainty_for_lines_without_accuracy():
+    species_data = create_species_data()
+    for data in species_data:
+        data.atomic_lines = data.atomic_lines[:, :4]
+
+    uncertainty_data = MonteCarloUncertaintyCalculator(samples=1000, unknown_aki_uncertainty=0.1, seed=0).calculate(
+        species_data, create_carrier_gas_data()
+    )
+
+    assert uncertainty_data.temperature_std > 0
+
+
+def test_calculate_uses_the_unknown_integral_uncertainty_for_integrals_without_error():
+    species_data = create_species_data()
+    for data in species_data:
+        data.integral_errors = np.full(len(data.integrals), np.nan)
+    calculator = MonteCarloUncertaintyCalculator(samples=1000, seed=0, unknown_integral_uncertainty=0.2)
+
+    uncertainty_data = calculator.calculate(species_data, create_carrier_gas_data())
+
+    expected_uncertainty_data = calculator.calculate(
+        create_species_data(integral_uncertainty=0.2), create_carrier_gas_data()
+    )
+    assert uncertainty_data.temperature_std > 0
+    assert uncertainty_data.temperature_std == approx(expected_uncertainty_data.temperature_std)
+
+
+def test_calculate_solves_the_plasma_composition_if_given_a_calculator():
+    plasma_composition_calculator = PlasmaCompositionCalculator(analyte_fraction=0.01)
+    fitted_ratios = IntensityRatiosCalculator().calculate(
+        FIRST_SPECIES_ATOMIC_LINES, FIRST_SPECIES_INTEGRALS, SECOND_SPECIES_ATOMIC_LINES, SECOND_SPECIES_INTEGRALS
+    ).fitted_intensity_ratios
+    temperature = TemperatureCalculator().calculate(fitted_ratios)
+    atom_concentration = AtomConcentraionCalculator().calculate(fitted_ratios, 5.0, 3.04)
+    electron_concentration = plasma_composition_calculator.calculate(
+        temperature,
+        5.7 * calculate_saha_boltzmann_factor(temperature, 127109.842),
+        np.array(
+            [
+                3.44 / 5.0 * calculate_saha_boltzmann_factor(temperature, 74409.11),
+                1.19 / 3.04 * calculate_saha_boltzmann_factor(temperature, 61106.45),
+            ]
+        ),
+        np.array([atom_concentration, 1.0]),
+    )
+    ion_atom_calculator = IonAtomConcentraionCalculator()
+    total_concentration = TotalConcentrationCalculator().calculate(
+        atom_concentration,
+        ion_atom_calculator.calculate(electron_concentration, temperature, 74409.11, 5.0, 3.44),
+        ion_atom_calculator.calculate(electron_concentration, temperature, 61106.45, 3.04, 1.19),
+    )
+
+    uncertainty_data = MonteCarloUncertaintyCalculator(
+        samples=100, seed=0, plasma_composition_calculator=plasma_composition_calculator
+    ).calculate(create_species_data(), create_carrier_gas_data())
+
+    assert uncertainty_data.total_concentrations == approx(np.full(100, total_concentration), rel=1e-4)
+    assert total_concentration != approx(calculate_point_estimates()[1], rel=1e-3)
@@ -0,0 +1,34 @@
+import numpy as np
+
+ELECTRONVOLT_TO_WAVENUMBER_CONVERSION_FACTOR = 8065.543937  # cm-1 / eV
+KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR = 8.61732814974493e-05  # eV / K
+
+
+class PartitionFunctionCalculator:
+    def calculate(
+        self,
+        statistical_weights: np.ndarray,
+        level_energies: np.ndarray,
+        temperature: float,
+    ) -> float:
+        """Sums g * exp(-E / kT) over the levels, with level energies in cm-1 and temperature in eV."""
+        return float(
+            np.sum(
+                statistical_weights
+                * np.exp(
+                    -level_energies
+                    / (temperature * ELECTRONVOLT_TO_WAVENUMBER_CONVERSION_FACTOR)
+                )
+            )
+        )
+
+    def calculate_batch(
+        self,
+        statistical_weights: np.ndarray,
+        level_energies: np.ndarray,
+        temperatures: np.ndarray,
+    ) -> np.ndarray:
+        """Evaluates the partition function at every temperature, in eV, with one pass over the levels."""
+        return np.exp(
+            -np.outer(1 / (np.asarray(temperatures) * ELECTRONVOLT_TO_WAVENUMBER_CONVERSION_FACTOR), level_energies)
+        ) @ statistical_weights
@@ -0,0 +1,113 @@
+import numpy as np
+
+from spark_mec_bp.calculators.saha_boltzmann import k, p
+
+
+class PlasmaCompositionCalculator:
+    """Solves the charge balance of the carrier gas and the analysed species at the pressure p.
+
+    The analysed species make up analyte_fraction of the heavy particles, split by their atom concentrations.
+    """
+
+    def __init__(self, analyte_fraction: float = 0.01, tolerance: float = 1e-12, max_iterations: int = 50) -> None:
+        self.analyte_fraction = analyte_fraction
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    def calculate(
+        self,
+        temperature: float,
+        carrier_gas_saha_factor: float,
+        species_saha_factors: np.ndarray,
+        species_atom_concentrations: np.ndarray,
+    ) -> float:
+        return float(
+            self.calculate_batch(
+                np.atleast_1d(temperature),
+                np.atleast_1d(carrier_gas_saha_factor),
+                np.atleast_2d(species_saha_factors),
+                np.atleast_2d(species_atom_concentrations),
+            )[0]
+        )
+
+    def calculate_batch(
+        self,
+        temperatures: np.ndarray,
+        carrier_gas_saha_factors: np.ndarray,
+        species_saha_factors: np.ndarray,
+        species_atom_concentrations: np.ndarray,
+    ) -> np.ndarray:
+        """Returns the electron concentration of every shot, NaN where the iteration did not converge.
+
+        The Saha factors include the partition function ratio, the species and their atom concentrations, in any
+        common unit, are columns.
+        """
+        # the atom concentrations do not depend on n_e, so the analysed species ionize like a single species with
+        # the atom weighted mean of their Saha factors
+        analyte_saha_factors = np.sum(species_saha_factors * species_atom_concentrations, axis=-1) / np.sum(
+            species_atom_concentrations, axis=-1
+        )
+
+        return self.solve_charge_balance(
+            temperatures,
+            np.column_stack((carrier_gas_saha_factors, analyte_saha_factors)),
+            np.array([1 - self.analyte_fraction, self.analyte_fraction]),
+        )
+
+    def solve_charge_balance(
+        self, temperatures: np.ndarray, saha_factors: np.ndarray, fractions: np.ndarray
+    ) -> np.ndarray:
+        """Solves n_e = (p / kT - n_e) * sum(x * a / (a + n_e)) with Newton iteration for every shot at once.
+
+        The species with fixed heavy particle fractions x are columns. a is twice the Saha factor, like in
+        ElectronConcentrationCalculator, so the carrier gas alone gives its closed form estimate.
+        """
+        heavy_and_electron_concentrations = p / (np.asarray(temperatures, dtype=float) * k)
+        ionization_factors = 2 * np.atleast_2d(saha_factors)
+        fractions = np.broadcast_to(fractions, ionization_factors.shape)
+
+        electron_concentrations = self._get_initial_electron_concentrations(
+            heavy_and_electron_concentrations, np.sum(fractions * ionization_factors, axis=-1)
+        )
+        # the balance increases monotonically in n_e between 0 and p / kT, Newton steps leaving the bracket bisect it
+        lower_bounds = np.zeros_like(electron_concentrations)
+        upper_bounds = heavy_and_electron_concentrations.copy()
+        converged = np.zeros(len(electron_concentrations), dtype=bool)
+        for _ in range(self.max_iterations):
+            ionized_fractions = ionization_factors / (ionization_factors + electron_concentrations[:, np.newaxis])
+            charge = np.sum(fractions * ionized_fractions, axis=-1)
+            heavy_concentrations = heavy_and_electron_concentrations - electron_concentrations
+            balance = electron_concentrations - heavy_concentrations * charge
+            balance_derivative = (
+                1
+                + charge
+                + heavy_concentrations
+                * np.sum(
+                    fractions * ionized_fractions / (ionization_factors + electron_concentrations[:, np.newaxis]),
+                    axis=-1,
+                )
+            )
+            lower_bounds = np.where(balance < 0, electron_concentrations, lower_bounds)
+            upper_bounds = np.where(balance > 0, electron_concentrations, upper_bounds)
+
+            next_electron_concentrations = electron_concentrations - balance / balance_derivative
+            next_electron_concentrations = np.where(
+                (next_electron_concentrations <= lower_bounds) | (next_electron_concentrations >= upper_bounds),
+                (lower_bounds + upper_bounds) / 2,
+                next_electron_concentrations,
+            )
+            converged = np.abs(next_electron_concentrations - electron_concentrations) <= (
+                self.tolerance * next_electron_concentrations
+            )
+            electron_concentrations = next_electron_concentrations
+            if np.all(converged):
+                break
+
+        return np.where(converged, electron_concentrations, np.nan)
+
+    def _get_initial_electron_concentrations(self, heavy_and_electron_concentrations, ionization_factors):
+        # root of n_e^2 + 2 * a * n_e - a * p / kT = 0, exact for a single species
+        return (ionization_factors * heavy_and_electron_concentrations) / (
+            ionization_factors
+            + np.sqrt(np.power(ionization_factors, 2) + ionization_factors * heavy_and_electron_concentrations)
+        )
@@ -0,0 +1,95 @@
+import numpy as np
+from pytest import approx
+from scipy.optimize import brentq
+
+from spark_mec_bp.calculators import ElectronConcentrationCalculator, PlasmaCompositionCalculator
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor, k, p
+
+TEMPERATURES = np.linspace(4000.0, 30000.0, 7)
+CARRIER_GAS_SAHA_FACTORS = 5.7 * calculate_saha_boltzmann_factor(TEMPERATURES, 127109.842)
+SPECIES_SAHA_FACTORS = np.column_stack(
+    (
+        3.44 / 5.0 * calculate_saha_boltzmann_factor(TEMPERATURES, 74409.11),
+        1.19 / 3.04 * calculate_saha_boltzmann_factor(TEMPERATURES, 61106.45),
+    )
+)
+SPECIES_ATOM_CONCENTRATIONS = np.tile([0.8, 1.0], (len(TEMPERATURES), 1))
+
+
+def solve_charge_balance_of_every_species(temperature, carrier_gas_saha_factor, saha_factors, atom_concentrations):
+    """Reference solution with the fractions of every analysed species following n_e."""
+    heavy_and_electron_concentration = p / (k * temperature)
+
+    def get_balance(electron_concentration):
+        ionization_factors = 2 * np.concatenate(([carrier_gas_saha_factor], saha_factors))
+        species_concentrations = atom_concentrations * (1 + ionization_factors[1:] / electron_concentration)
+        fractions = np.concatenate(([0.99], 0.01 * species_concentrations / species_concentrations.sum()))
+
+        return electron_concentration - (heavy_and_electron_concentration - electron_concentration) * np.sum(
+            fractions * ionization_factors / (ionization_factors + electron_concentration)
+        )
+
+    return brentq(get_balance, 1e-30, heavy_and_electron_concentration, xtol=1e-30, rtol=1e-14)
+
+
+def test_carrier_gas_alone_gives_the_closed_form_estimate():
+    electron_concentrations = PlasmaCompositionCalculator().solve_charge_balance(
+        TEMPERATURES, CARRIER_GAS_SAHA_FACTORS[:, np.newaxis], np.array([1.0])
+    )
+
+    assert electron_concentrations == approx(
+        ElectronConcentrationCalculator().calculate_batch(TEMPERATURES, 127109.842, 1.0, 5.7), rel=1e-10
+    )
+
+
+def test_calculate_batch_solves_the_charge_balance_with_the_analysed_species():
+    electron_concentrations = PlasmaCompositionCalculator(analyte_fraction=0.01).calculate_batch(
+        TEMPERATURES, CARRIER_GAS_SAHA_FACTORS, SPECIES_SAHA_FACTORS, SPECIES_ATOM_CONCENTRATIONS
+    )
+
+    assert electron_concentrations == approx(
+        [
+            solve_charge_balance_of_every_species(*arguments)
+            for arguments in zip(
+                TEMPERATURES, CARRIER_GAS_SAHA_FACTORS, SPECIES_SAHA_FACTORS, SPECIES_ATOM_CONCENTRATIONS
+            )
+        ],
+        rel=1e-10,
+    )
+
+
+def test_analysed_species_raise_the_electron_concentration_of_a_cold_plasma():
+    calculator = PlasmaCompositionCalculator(analyte_fraction=0.01)
+
+    electron_concentration = calculator.calculate(
+        TEMPERATURES[0], CARRIER_GAS_SAHA_FACTORS[0], SPECIES_SAHA_FACTORS[0], SPECIES_ATOM_CONCENTRATIONS[0]
+    )
+
+    assert electron_concentration > 100 * ElectronConcentrationCalculator().calculate(
+        TEMPERATURES[0], 127109.842, 1.0, 5.7
+    )
+
+
+def test_calculate_matches_calculate_batch():
+    calculator = PlasmaCompositionCalculator()
+
+    electron_concentrations = calculator.calculate_batch(
+        TEMPERATURES, CARRIER_GAS_SAHA_FACTORS, SPECIES_SAHA_FACTORS, SPECIES_ATOM_CONCENTRATIONS
+    )
+
+    assert electron_concentrations == approx(
+        [
+            calculator.calculate(*arguments)
+            for arguments in zip(
+                TEMPERATURES, CARRIER_GAS_SAHA_FACTORS, SPECIES_SAHA_FACTORS, SPECIES_ATOM_CONCENTRATIONS
+            )
+        ]
+    )
+
+
+def test_calculate_batch_returns_nan_for_shots_not_converged():
+    electron_concentrations = PlasmaCompositionCalculator(max_iterations=1).calculate_batch(
+        TEMPERATURES, CARRIER_GAS_SAHA_FACTORS, SPECIES_SAHA_FACTORS, SPECIES_ATOM_CONCENTRATIONS
+    )
+
+    assert np.isnan(electron_concentrations).any()
@@ -0,0 +1,20 @@
+import numpy as np
+
+m = 9.10938291e-28  # g
+k = 1.3807e-16  # cm2 g s-2 K-1
+h = 6.6261e-27  # cm2 g s-1
+e = -1  # elementary charge
+c = 2.99792458e10  # cm/s
+p = 1e6  # g/s^2 m
+
+X = (2 * np.pi * m * k) / np.power(h, 2)  # constant in Saha-Boltzmann equation
+
+
+def calculate_saha_boltzmann_factor(temperature, ionization_energy):
+    """Returns n_e * n_ion / n_atom without the partition function ratio, elementwise for arrays."""
+    return 2 * np.power(X, 1.5) * np.power(temperature, 1.5) * np.exp(-(ionization_energy / (temperature * 0.695028)))
+
+
+def calculate_ln_saha_boltzmann_factor(temperature, ionization_energy):
+    """Returns the natural logarithm of calculate_saha_boltzmann_factor without underflowing at low temperatures."""
+    return np.log(2 * np.power(X, 1.5)) + 1.5 * np.log(temperature) - ionization_energy / (temperature * 0.695028)
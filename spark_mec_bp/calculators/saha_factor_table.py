@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from spark_mec_bp.calculators.partition_function import (
+    KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR,
+    PartitionFunctionCalculator,
+)
+from spark_mec_bp.calculators.saha_boltzmann import calculate_ln_saha_boltzmann_factor
+
+MINIMUM_TEMPERATURE = 2000.0  # K
+MAXIMUM_TEMPERATURE = 50000.0  # K
+TABLE_POINTS = 4096
+
+
+@dataclass
+class SahaFactorTable:
+    """ln of the Saha factors and of the atom partition functions on a grid evenly spaced in 1 / T.
+
+    exp(-E / kT) is linear in 1 / T, so only T^1.5 and the partition functions add interpolation error.
+    """
+
+    inverse_temperatures: np.ndarray  # ascending
+    ln_saha_factors: np.ndarray  # n_e * n_ion / n_atom with the partition function ratio
+    ln_partition_functions_atom: np.ndarray
+    # bound of the relative interpolation error, from the errors at the midpoints of the grid intervals
+    max_relative_error: float
+    ionization_energy: float
+    atomic_levels_atom: np.ndarray
+    atomic_levels_ion: np.ndarray
+
+    def get_saha_factors(self, temperatures: np.ndarray) -> np.ndarray:
+        return self._look_up(self.ln_saha_factors, temperatures, self._calculate_ln_saha_factors)
+
+    def get_partition_functions_atom(self, temperatures: np.ndarray) -> np.ndarray:
+        return self._look_up(
+            self.ln_partition_functions_atom,
+            temperatures,
+            lambda temperatures: _calculate_ln_partition_functions(self.atomic_levels_atom, temperatures),
+        )
+
+    def _look_up(self, ln_values, temperatures, calculate_ln_values):
+        inverse_temperatures = 1 / np.atleast_1d(np.asarray(temperatures, dtype=float))
+        ln_looked_up_values = np.interp(inverse_temperatures, self.inverse_temperatures, ln_values)
+        # temperatures off the grid are calculated, np.interp would clamp them to the edges
+        off_grid = (inverse_temperatures < self.inverse_temperatures[0]) | (
+            inverse_temperatures > self.inverse_temperatures[-1]
+        )
+        if np.any(off_grid):
+            ln_looked_up_values[off_grid] = calculate_ln_values(1 / inverse_temperatures[off_grid])
+
+        return np.exp(ln_looked_up_values).reshape(np.shape(temperatures))
+
+    def _calculate_ln_saha_factors(self, temperatures):
+        return _calculate_ln_saha_factors(
+            self.ionization_energy, self.atomic_levels_atom, self.atomic_levels_ion, temperatures
+        )
+
+
+class SahaFactorTableCalculator:
+    def __init__(
+        self,
+        minimum_temperature: float = MINIMUM_TEMPERATURE,
+        maximum_temperature: float = MAXIMUM_TEMPERATURE,
+        points: int = TABLE_POINTS,
+    ) -> None:
+        self.minimum_temperature = minimum_temperature
+        self.maximum_temperature = maximum_temperature
+        self.points = points
+        self.tables: Dict[Tuple[float, bytes, bytes], SahaFactorTable] = {}
+
+    def calculate(
+        self, ionization_energy: float, atomic_levels_atom: np.ndarray, atomic_levels_ion: np.ndarray
+    ) -> SahaFactorTable:
+        """Returns the table of a species from its ionization energy and g and level energy rows, cached."""
+        key = (float(ionization_energy), atomic_levels_atom.tobytes(), atomic_levels_ion.tobytes())
+        if key not in self.tables:
+            self.tables[key] = self._create_table(ionization_energy, atomic_levels_atom, atomic_levels_ion)
+
+        return self.tables[key]
+
+    def _create_table(self, ionization_energy, atomic_levels_atom, atomic_levels_ion):
+        inverse_temperatures = np.linspace(1 / self.maximum_temperature, 1 / self.minimum_temperature, self.points)
+        midpoint_inverse_temperatures = (inverse_temperatures[1:] + inverse_temperatures[:-1]) / 2
+        ln_saha_factors, midpoint_ln_saha_factors = [
+            _calculate_ln_saha_factors(ionization_energy, atomic_levels_atom, atomic_levels_ion, 1 / grid)
+            for grid in [inverse_temperatures, midpoint_inverse_temperatures]
+        ]
+        ln_partition_functions_atom, midpoint_ln_partition_functions_atom = [
+            _calculate_ln_partition_functions(atomic_levels_atom, 1 / grid)
+            for grid in [inverse_temperatures, midpoint_inverse_temperatures]
+        ]
+        ln_errors = [
+            np.abs((ln_values[1:] + ln_values[:-1]) / 2 - midpoint_ln_values)
+            for ln_values, midpoint_ln_values in [
+                (ln_saha_factors, midpoint_ln_saha_factors),
+                (ln_partition_functions_atom, midpoint_ln_partition_functions_atom),
+            ]
+        ]
+        # the error peaks near the midpoints, the change between neighbouring intervals covers the rest of an interval
+        max_ln_error = max(np.max(errors) + np.max(np.abs(np.diff(errors)), initial=0) for errors in ln_errors)
+
+        return SahaFactorTable(
+            inverse_temperatures=inverse_temperatures,
+            ln_saha_factors=ln_saha_factors,
+            ln_partition_functions_atom=ln_partition_functions_atom,
+            max_relative_error=float(np.expm1(max_ln_error)),
+            ionization_energy=ionization_energy,
+            atomic_levels_atom=atomic_levels_atom,
+            atomic_levels_ion=atomic_levels_ion,
+        )
+
+
+def _calculate_ln_partition_functions(atomic_levels, temperatures):
+    return np.log(
+        PartitionFunctionCalculator().calculate_batch(
+            atomic_levels[:, 0], atomic_levels[:, 1], temperatures * KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR
+        )
+    )
+
+
+def _calculate_ln_saha_factors(ionization_energy, atomic_levels_atom, atomic_levels_ion, temperatures):
+    return (
+        calculate_ln_saha_boltzmann_factor(temperatures, ionization_energy)
+        + _calculate_ln_partition_functions(atomic_levels_ion, temperatures)
+        - _calculate_ln_partition_functions(atomic_levels_atom, temperatures)
+    )
@@ -0,0 +1,76 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import PartitionFunctionCalculator, SahaFactorTableCalculator
+from spark_mec_bp.calculators.partition_function import KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR
+from spark_mec_bp.calculators.saha_boltzmann import calculate_saha_boltzmann_factor
+
+IONIZATION_ENERGY = 61106.45
+ATOMIC_LEVELS_ATOM = np.array([[2.0, 0.0], [2.0, 29552.05741], [4.0, 30472.66516], [6.0, 30242.298349]])
+ATOMIC_LEVELS_ION = np.array([[1.0, 0.0], [5.0, 39168.032], [7.0, 46046.276]])
+
+
+def calculate_partition_functions(atomic_levels, temperatures):
+    return PartitionFunctionCalculator().calculate_batch(
+        atomic_levels[:, 0], atomic_levels[:, 1], temperatures * KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR
+    )
+
+
+def calculate_saha_factors(temperatures):
+    return (
+        calculate_saha_boltzmann_factor(temperatures, IONIZATION_ENERGY)
+        * calculate_partition_functions(ATOMIC_LEVELS_ION, temperatures)
+        / calculate_partition_functions(ATOMIC_LEVELS_ATOM, temperatures)
+    )
+
+
+def test_look_up_stays_within_the_error_bound():
+    for points in [64, 4096]:
+        table = SahaFactorTableCalculator(points=points).calculate(
+            IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION
+        )
+        temperatures = 1 / np.linspace(1 / 50000, 1 / 2000, 200001)
+
+        saha_factor_errors = np.abs(table.get_saha_factors(temperatures) / calculate_saha_factors(temperatures) - 1)
+        partition_function_errors = np.abs(
+            table.get_partition_functions_atom(temperatures)
+            / calculate_partition_functions(ATOMIC_LEVELS_ATOM, temperatures)
+            - 1
+        )
+
+        assert saha_factor_errors.max() <= table.max_relative_error
+        assert partition_function_errors.max() <= table.max_relative_error
+
+
+def test_default_table_error_bound_is_small():
+    table = SahaFactorTableCalculator().calculate(IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION)
+
+    assert table.max_relative_error < 1e-5
+
+
+def test_look_up_calculates_temperatures_off_the_grid():
+    table = SahaFactorTableCalculator(minimum_temperature=5000, maximum_temperature=20000, points=16).calculate(
+        IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION
+    )
+    temperatures = np.array([3000.0, 30000.0])
+
+    assert table.get_saha_factors(temperatures) == approx(calculate_saha_factors(temperatures), rel=1e-12)
+    assert table.get_partition_functions_atom(temperatures) == approx(
+        calculate_partition_functions(ATOMIC_LEVELS_ATOM, temperatures), rel=1e-12
+    )
+
+
+def test_look_up_keeps_the_shape_of_the_temperatures():
+    table = SahaFactorTableCalculator().calculate(IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION)
+
+    assert table.get_saha_factors(12000.0).shape == ()
+    assert table.get_saha_factors(np.full((2, 3), 12000.0)).shape == (2, 3)
+
+
+def test_calculate_caches_the_table_of_a_species():
+    calculator = SahaFactorTableCalculator()
+
+    table = calculator.calculate(IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION)
+
+    assert calculator.calculate(IONIZATION_ENERGY, ATOMIC_LEVELS_ATOM.copy(), ATOMIC_LEVELS_ION.copy()) is table
+    assert calculator.calculate(74409.11, ATOMIC_LEVELS_ATOM, ATOMIC_LEVELS_ION) is not table
@@ -4,3 +4,7 @@ import numpy as np
 class TemperatureCalculator:
     def calculate(self, fitted_ratios: np.ndarray) -> float:
         return 1 / (0.695035 * fitted_ratios[0])
+
+    def calculate_batch(self, fitted_ratios: np.ndarray) -> np.ndarray:
+        """Takes the fitted slopes and intercepts of the shots as rows."""
+        return self.calculate(np.asarray(fitted_ratios).T)
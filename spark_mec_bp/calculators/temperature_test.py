@@ -0,0 +1,13 @@
+import numpy as np
+from pytest import approx
+
+from spark_mec_bp.calculators import TemperatureCalculator
+
+
+def test_calculate_batch_matches_calculate():
+    calculator = TemperatureCalculator()
+    fitted_ratios = np.array([[1.1e-4, 0.1], [1.3e-4, 0.2], [1.5e-4, 0.3]])
+
+    temperatures = calculator.calculate_batch(fitted_ratios)
+
+    assert temperatures == approx([calculator.calculate(shot_fitted_ratios) for shot_fitted_ratios in fitted_ratios])
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class TotalConcentrationCalculator:
     def calculate(
         self,
@@ -9,3 +12,15 @@ class TotalConcentrationCalculator:
             (first_species_ion_atom_concentration + 1)
             / (second_species_ion_atom_concentration + 1)
         ) * atom_concentration
+
+    def calculate_batch(
+        self,
+        atom_concentrations: np.ndarray,
+        first_species_ion_atom_concentrations: np.ndarray,
+        second_species_ion_atom_concentrations: np.ndarray,
+    ) -> np.ndarray:
+        return self.calculate(
+            np.asarray(atom_concentrations),
+            np.asarray(first_species_ion_atom_concentrations),
+            np.asarray(second_species_ion_atom_concentrations),
+        )
@@ -0,0 +1,11 @@
+from pytest import approx
+
+from spark_mec_bp.calculators import TotalConcentrationCalculator
+
+
+def test_calculate_batch_matches_calculate():
+    calculator = TotalConcentrationCalculator()
+
+    total_concentrations = calculator.calculate_batch([1.0, 2.0], [0.5, 1.5], [3.0, 4.0])
+
+    assert total_concentrations == approx([calculator.calculate(1.0, 0.5, 3.0), calculator.calculate(2.0, 1.5, 4.0)])
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 
 from scipy.signal import peak_prominences
 from lmfit.models import PseudoVoigtModel
 
+from spark_mec_bp.instrumentation import get_recorder
+
 
 @dataclass
 class VoigtIntegralFit:
@@ -18,6 +20,8 @@ class VoigtIntegralFit:
 class VoigtIntegralData:
     integrals: np.ndarray
     fits: List[VoigtIntegralFit]
+    # standard errors of the integrals from the fitted amplitudes, NaN if the fit could not estimate them
+    integral_errors: Optional[np.ndarray] = None
 
 
 @dataclass
@@ -36,7 +40,7 @@ class VoigtIntegralCalculator:
             wavelengths, peak_index_table
         )
 
-        voigt_integrals, voigt_fits = [], []
+        voigt_integrals, voigt_integral_errors, voigt_fits = [], [], []
         peak_indices_to_integrate = (
             self._find_peak_indices_nearest_to_target_wavelengths(
                 peak_index_table_with_wavelengths, target_wavelengths
@@ -44,15 +48,17 @@ class VoigtIntegralCalculator:
         )
 
         for peak_index in peak_indices_to_integrate:
-            area, voigt_fit = self._caluclate_voigt_integral(
+            area, area_error, voigt_fit = self._caluclate_voigt_integral(
                 peak_index, peak_index_table_with_wavelengths, wavelengths, intensities
             )
             voigt_integrals.append(area)
+            voigt_integral_errors.append(area_error)
             voigt_fits.append(voigt_fit)
 
         return VoigtIntegralData(
             integrals=np.array(voigt_integrals),
             fits=voigt_fits,
+            integral_errors=np.array(voigt_integral_errors),
         )
 
     def _combine_peak_indices_with_wavelengths(
@@ -91,9 +97,18 @@ class VoigtIntegralCalculator:
         voigt_model = PseudoVoigtModel()
         params = voigt_model.guess(peak_intensities, x=peak_wavelengths)
         voigt_fit = voigt_model.fit(peak_intensities, params, x=peak_wavelengths)
+        get_recorder().record_fit(voigt_fit.nfev, voigt_fit.success)
+        area = np.trapz(voigt_fit.best_fit, peak_wavelengths)
 
-        return np.trapz(voigt_fit.best_fit, peak_wavelengths), VoigtIntegralFit(
+        return area, self._get_area_error(area, voigt_fit.params["amplitude"]), VoigtIntegralFit(
             intensities=peak_intensities,
             wavelengths=peak_wavelengths,
             fit=voigt_fit.best_fit
         )
+
+    def _get_area_error(self, area, amplitude):
+        # the amplitude of the pseudo-Voigt model is its area
+        if amplitude.stderr is None or amplitude.value == 0:
+            return np.nan
+
+        return abs(area * amplitude.stderr / amplitude.value)
@@ -0,0 +1,2 @@
+from .atomic_line_index import AtomicLineIndex
+from .atomic_lines_tile_cache import AtomicLinesTileCache
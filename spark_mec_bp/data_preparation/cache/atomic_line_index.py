@@ -0,0 +1,55 @@
+from typing import Optional
+
+import numpy as np
+
+
+class AtomicLineIndex:
+    def __init__(self, lines: np.ndarray) -> None:
+        """Indexes line rows of wavelength, Aki, g_k and Ek, sorted by wavelength."""
+        order = np.argsort(lines[:, 0], kind="stable")
+        self.wavelengths = np.ascontiguousarray(lines[order, 0])
+        self.line_data = np.ascontiguousarray(lines[order, 1:])
+
+    def __len__(self) -> int:
+        return len(self.wavelengths)
+
+    def window(self, lower_wavelength: float, upper_wavelength: float) -> np.ndarray:
+        start, end = self._get_window_bounds(lower_wavelength, upper_wavelength)
+
+        return self._get_rows(np.arange(start, end))
+
+    def nearest(
+        self,
+        target_peaks: np.ndarray,
+        lower_wavelength: Optional[float] = None,
+        upper_wavelength: Optional[float] = None,
+    ) -> np.ndarray:
+        start, end = self._get_window_bounds(lower_wavelength, upper_wavelength)
+        wavelengths = self.wavelengths[start:end]
+        if len(wavelengths) == 0:
+            raise ValueError(
+                f"No atomic lines between {lower_wavelength} and {upper_wavelength} nm to match target peaks"
+            )
+
+        right_indices = np.clip(np.searchsorted(wavelengths, target_peaks), 0, len(wavelengths) - 1)
+        left_indices = np.clip(right_indices - 1, 0, None)
+        indices = np.where(
+            target_peaks - wavelengths[left_indices] <= wavelengths[right_indices] - target_peaks,
+            left_indices,
+            right_indices,
+        )
+
+        return self._get_rows(start + indices)
+
+    def _get_window_bounds(self, lower_wavelength, upper_wavelength):
+        start = 0 if lower_wavelength is None else int(np.searchsorted(self.wavelengths, lower_wavelength))
+        end = (
+            len(self.wavelengths)
+            if upper_wavelength is None
+            else int(np.searchsorted(self.wavelengths, upper_wavelength))
+        )
+
+        return start, end
+
+    def _get_rows(self, indices):
+        return np.column_stack((self.wavelengths[indices], self.line_data[indices]))
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from spark_mec_bp.data_preparation.cache import AtomicLineIndex
+
+
+@pytest.fixture()
+def lines():
+    return np.array(
+        [
+            [479.258, 8.9e7, 6.0, 62033.7],
+            [312.278, 1.9e7, 4.0, 41174.613],
+            [406.507, 8.5e7, 4.0, 61951.6],
+            [520.9078, 7.5e7, 4.0, 48743.969],
+        ]
+    )
+
+
+def test_atomic_line_index_finds_nearest_lines(lines):
+    index = AtomicLineIndex(lines)
+
+    actual_result = index.nearest(np.array([300.0, 406.0, 440.0, 600.0]))
+
+    np.testing.assert_array_equal(actual_result, lines[[1, 2, 2, 3]])
+
+
+def test_atomic_line_index_finds_nearest_lines_within_window(lines):
+    index = AtomicLineIndex(lines)
+
+    actual_result = index.nearest(np.array([300.0, 600.0]), 400, 500)
+
+    np.testing.assert_array_equal(actual_result, lines[[2, 0]])
+
+
+def test_atomic_line_index_returns_lines_of_window_sorted_by_wavelength(lines):
+    index = AtomicLineIndex(lines)
+
+    np.testing.assert_array_equal(index.window(300, 500), lines[[1, 2, 0]])
+    assert index.line_data.flags["C_CONTIGUOUS"]
+
+
+def test_atomic_line_index_raises_error_on_empty_window(lines):
+    with pytest.raises(ValueError):
+        AtomicLineIndex(lines).nearest(np.array([600.0]), 600, 700)
@@ -0,0 +1,69 @@
+from threading import Lock
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from spark_mec_bp.data_preparation.cache.atomic_line_index import AtomicLineIndex
+
+TILE_WIDTH = 100  # nm
+
+
+class AtomicLinesTileCache:
+    """Tiles are kept per source of the lines, e.g. online NIST or a bundle, and per species."""
+
+    def __init__(self, tile_width: int = TILE_WIDTH) -> None:
+        self.tile_width = tile_width
+        self._tiles: Dict[Tuple[Hashable, str], Dict[int, np.ndarray]] = {}
+        self._indices: Dict[Tuple[Hashable, str], AtomicLineIndex] = {}
+        self._lock = Lock()
+
+    def get_tiles(self, target_peaks: np.ndarray) -> List[int]:
+        """Returns the sorted tiles containing a target peak, the tiles between them are skipped."""
+        return [int(tile) * self.tile_width for tile in np.unique(np.floor(target_peaks / self.tile_width))]
+
+    def get_ranges(self, tiles: List[int]) -> List[Tuple[int, int]]:
+        """Merges adjacent sorted tiles into wavelength ranges."""
+        ranges: List[Tuple[int, int]] = []
+        for tile in tiles:
+            if ranges and ranges[-1][1] == tile:
+                ranges[-1] = (ranges[-1][0], tile + self.tile_width)
+            else:
+                ranges.append((tile, tile + self.tile_width))
+
+        return ranges
+
+    def get_missing_ranges(self, source: Hashable, species_name: str, tiles: List[int]) -> List[Tuple[int, int]]:
+        with self._lock:
+            cached_tiles = set(self._tiles.get((source, species_name), {}))
+
+        return self.get_ranges([tile for tile in tiles if tile not in cached_tiles])
+
+    def add_lines(
+        self, source: Hashable, species_name: str, lower_wavelength: int, upper_wavelength: int, lines: np.ndarray
+    ) -> None:
+        lines = lines[~np.isnan(lines[:, 0])]
+        line_tiles = np.floor(lines[:, 0] / self.tile_width) * self.tile_width
+
+        with self._lock:
+            species_tiles = self._tiles.setdefault((source, species_name), {})
+            for tile in range(lower_wavelength, upper_wavelength, self.tile_width):
+                species_tiles[tile] = lines[line_tiles == tile]
+
+            self._indices[(source, species_name)] = AtomicLineIndex(
+                np.concatenate(list(species_tiles.values()))
+            )
+
+    def get_index(self, source: Hashable, species_name: str) -> AtomicLineIndex:
+        with self._lock:
+            return self._indices[(source, species_name)]
+
+    def __getstate__(self):
+        with self._lock:
+            state = self.__dict__.copy()
+        del state["_lock"]
+
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
@@ -0,0 +1,25 @@
+import pickle
+
+import numpy as np
+
+from spark_mec_bp.data_preparation.cache import AtomicLinesTileCache
+
+
+def test_tile_cache_survives_pickling():
+    tile_cache = AtomicLinesTileCache()
+    tile_cache.add_lines("nist", "Ag I", 300, 400, np.array([[338.2887, 1.3e8, 2.0, 29552.0574]]))
+
+    unpickled_tile_cache = pickle.loads(pickle.dumps(tile_cache))
+
+    assert unpickled_tile_cache.get_missing_ranges("nist", "Ag I", [300, 400]) == [(400, 500)]
+    assert unpickled_tile_cache.get_index("nist", "Ag I").wavelengths.tolist() == [338.2887]
+    unpickled_tile_cache.add_lines("nist", "Ag I", 500, 600, np.array([[520.9078, 7.5e7, 4.0, 48743.969]]))
+
+
+def test_tile_cache_skips_the_tiles_between_target_peaks():
+    tile_cache = AtomicLinesTileCache()
+
+    tiles = tile_cache.get_tiles(np.array([830.0, 240.0, 250.0, 320.0]))
+
+    assert tiles == [200, 300, 800]
+    assert tile_cache.get_missing_ranges("nist", "Ag I", tiles) == [(200, 400), (800, 900)]
@@ -0,0 +1,181 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from spark_mec_bp.data_preparation.cache import AtomicLinesTileCache
+from spark_mec_bp.data_preparation.getters import (
+    AtomicLinesDataGetter,
+    IonizationEnergyDataGetter,
+    PartitionFunctionDataGetter,
+)
+from spark_mec_bp.nist.offline import NISTBundle, NISTBundleBuilder
+
+MAX_WORKERS = 8
+
+
+@dataclass
+class WarmupSpecies:
+    atom_name: str
+    ion_name: Optional[str] = None
+    target_peaks: List[float] = field(default_factory=list)
+
+
+@dataclass
+class WarmupFailure:
+    data_name: str
+    species_name: str
+    error: str
+
+
+@dataclass
+class WarmupReport:
+    warmed: List[str] = field(default_factory=list)
+    failures: List[WarmupFailure] = field(default_factory=list)
+
+
+@dataclass
+class _WarmupTask:
+    data_name: str
+    species_name: str
+    function: Callable[[], object]
+
+
+class CacheWarmer:
+    """Fills the in-process caches of the getters, call it at the start of every worker process.
+
+    Only the atomic lines, the ionization energies and the atomic level tables of the Monte Carlo uncertainty are
+    cached. The partition functions depend on the fitted temperature and are still queried from NIST by every run,
+    use BundleWarmer and the offline mode to avoid that. The caches live as long as the process.
+    """
+
+    def __init__(
+        self,
+        atomic_lines_getter: AtomicLinesDataGetter,
+        partition_function_getter: PartitionFunctionDataGetter,
+        ionization_energy_getter: IonizationEnergyDataGetter,
+        max_workers: int = MAX_WORKERS,
+    ) -> None:
+        self.atomic_lines_getter = atomic_lines_getter
+        self.partition_function_getter = partition_function_getter
+        self.ionization_energy_getter = ionization_energy_getter
+        self.max_workers = max_workers
+
+    def warm(self, manifest: List[WarmupSpecies]) -> WarmupReport:
+        return _run_tasks(self._create_tasks(manifest), self.max_workers)
+
+    def _create_tasks(self, manifest: List[WarmupSpecies]) -> List[_WarmupTask]:
+        tasks = []
+        for species in manifest:
+            if len(species.target_peaks):
+                tasks.append(
+                    _WarmupTask(
+                        "atomic lines",
+                        species.atom_name,
+                        _bind(self.atomic_lines_getter.get_data, species.atom_name, np.array(species.target_peaks)),
+                    )
+                )
+            for species_name in filter(None, [species.atom_name, species.ion_name]):
+                tasks.append(
+                    _WarmupTask(
+                        "atomic levels",
+                        species_name,
+                        _bind(self.partition_function_getter.get_atomic_levels, species_name),
+                    )
+                )
+
+        atom_names = list(dict.fromkeys(species.atom_name for species in manifest))
+        if atom_names:
+            tasks.append(
+                _WarmupTask(
+                    "ionization energies",
+                    ", ".join(atom_names),
+                    _bind(self.ionization_energy_getter.get_bulk_data, atom_names),
+                )
+            )
+
+        return tasks
+
+
+class BundleWarmer:
+    """Fetches the NIST data of a manifest in parallel into an offline bundle, which workers load from its file.
+
+    The atomic lines of an atom are snapshotted from its lowest to its highest cache tile of the target peaks, as a
+    bundle holds one range per species, which covers every range the atomic lines getter requests for them.
+    """
+
+    def __init__(self, bundle_builder: NISTBundleBuilder, max_workers: int = MAX_WORKERS) -> None:
+        self.bundle_builder = bundle_builder
+        self.max_workers = max_workers
+        self.tile_cache = AtomicLinesTileCache()
+
+    def build(self, manifest: List[WarmupSpecies]) -> Tuple[NISTBundle, WarmupReport]:
+        bundle = self.bundle_builder.create_bundle()
+
+        return bundle, _run_tasks(self._create_tasks(bundle, manifest), self.max_workers)
+
+    def _create_tasks(self, bundle: NISTBundle, manifest: List[WarmupSpecies]) -> List[_WarmupTask]:
+        tasks = []
+        for species in manifest:
+            if len(species.target_peaks):
+                tiles = self.tile_cache.get_tiles(np.array(species.target_peaks))
+                tasks.append(
+                    _WarmupTask(
+                        "atomic lines",
+                        species.atom_name,
+                        _bind(
+                            self.bundle_builder.add_atomic_lines,
+                            bundle,
+                            species.atom_name,
+                            tiles[0],
+                            tiles[-1] + self.tile_cache.tile_width,
+                        ),
+                    )
+                )
+            for species_name in filter(None, [species.atom_name, species.ion_name]):
+                tasks.append(
+                    _WarmupTask(
+                        "atomic levels",
+                        species_name,
+                        _bind(self.bundle_builder.add_atomic_levels, bundle, species_name),
+                    )
+                )
+
+        # the bundle stores the ionization energy of every species on its own and joins them for bulk requests
+        for atom_name in dict.fromkeys(species.atom_name for species in manifest):
+            tasks.append(
+                _WarmupTask(
+                    "ionization energy",
+                    atom_name,
+                    _bind(self.bundle_builder.add_ionization_energy, bundle, atom_name),
+                )
+            )
+
+        return tasks
+
+
+def _run_tasks(tasks: List[_WarmupTask], max_workers: int) -> WarmupReport:
+    report = WarmupReport()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(task.function) for task in tasks]
+        for task, future in zip(tasks, futures):
+            error = future.exception()
+            if error is None:
+                report.warmed.append(f"{task.data_name} of {task.species_name}")
+            else:
+                report.failures.append(WarmupFailure(task.data_name, task.species_name, repr(error)))
+
+    return report
+
+
+def _bind(function, *args):
+    return lambda: function(*args)
+
+
+def load_manifest(file_path: str) -> List[WarmupSpecies]:
+    with open(file_path) as file:
+        content = json.load(file)
+
+    return [WarmupSpecies(**species) for species in content["species"]]
@@ -0,0 +1,63 @@
+import numpy as np
+
+from spark_mec_bp.data_preparation.cache_warmer import BundleWarmer, CacheWarmer, WarmupFailure, WarmupSpecies
+from spark_mec_bp.nist.fetchers import AtomicLevelsData, AtomicLinesData, IonizationEnergyData
+from spark_mec_bp.nist.offline import AtomicLinesSnapshot, NISTBundleBuilder
+
+
+def get_atomic_levels(species_name):
+    if species_name == "Ar II":
+        raise ValueError("dummy_error")
+
+
+def test_cache_warmer_prefetches_all_data_of_manifest_and_reports_failures(mocker):
+    atomic_lines_getter = mocker.MagicMock()
+    partition_function_getter = mocker.MagicMock()
+    partition_function_getter.get_atomic_levels.side_effect = get_atomic_levels
+    ionization_energy_getter = mocker.MagicMock()
+    manifest = [
+        WarmupSpecies("Au I", "Au II", [312.278, 406.507]),
+        WarmupSpecies("Ar I", "Ar II"),
+    ]
+
+    report = CacheWarmer(atomic_lines_getter, partition_function_getter, ionization_energy_getter).warm(manifest)
+
+    species_name, target_peaks = atomic_lines_getter.get_data.call_args[0]
+    assert species_name == "Au I"
+    np.testing.assert_array_equal(target_peaks, [312.278, 406.507])
+    assert atomic_lines_getter.get_data.call_count == 1
+    assert sorted(call[0][0] for call in partition_function_getter.get_atomic_levels.call_args_list) == [
+        "Ar I",
+        "Ar II",
+        "Au I",
+        "Au II",
+    ]
+    ionization_energy_getter.get_bulk_data.assert_called_once_with(["Au I", "Ar I"])
+    assert report.failures == [WarmupFailure("atomic levels", "Ar II", "ValueError('dummy_error')")]
+    assert len(report.warmed) == 5
+
+
+def test_bundle_warmer_fetches_manifest_into_bundle_and_reports_failures(mocker):
+    atomic_lines_fetcher = mocker.MagicMock()
+    atomic_lines_fetcher.fetch.return_value = AtomicLinesData(data="dummy_lines")
+    atomic_levels_fetcher = mocker.MagicMock()
+    atomic_levels_fetcher.fetch.side_effect = lambda species_name, temperature: (
+        get_atomic_levels(species_name) or AtomicLevelsData(data=f"dummy_levels of {species_name}")
+    )
+    ionization_energy_fetcher = mocker.MagicMock()
+    ionization_energy_fetcher.fetch.return_value = IonizationEnergyData(data="dummy_ionization_energy")
+    manifest = [
+        WarmupSpecies("Au I", "Au II", [312.278, 406.507]),
+        WarmupSpecies("Ar I", "Ar II"),
+    ]
+
+    bundle, report = BundleWarmer(
+        NISTBundleBuilder(atomic_lines_fetcher, atomic_levels_fetcher, ionization_energy_fetcher)
+    ).build(manifest)
+
+    atomic_lines_fetcher.fetch.assert_called_once_with("Au I", 300, 500)
+    assert bundle.atomic_lines == {"Au I": AtomicLinesSnapshot(300, 500, "dummy_lines")}
+    assert sorted(bundle.atomic_levels) == ["Ar I", "Au I", "Au II"]
+    assert sorted(bundle.ionization_energies) == ["Ar I", "Au I"]
+    assert report.failures == [WarmupFailure("atomic levels", "Ar II", "ValueError('dummy_error')")]
+    assert len(report.warmed) == 6
@@ -1,46 +1,63 @@
+from typing import Optional
+
 import numpy as np
+from spark_mec_bp.data_preparation.cache import AtomicLinesTileCache
+from spark_mec_bp.instrumentation import get_recorder
 from spark_mec_bp.nist.fetchers import AtomicLinesFetcher
 from spark_mec_bp.nist.parsers import AtomicLinesParser
 
-TARGET_COLUMNS = ["obs_wl_air(nm)", "Aki(s^-1)", "g_k", "Ek(cm-1)"]
+# the accuracy class of Aki is parsed to its relative uncertainty
+TARGET_COLUMNS = ["obs_wl_air(nm)", "Aki(s^-1)", "g_k", "Ek(cm-1)", "Acc"]
 NOT_NA_FILTER_COLUMN = "Aki(s^-1)"
 
 
 class AtomicLinesDataGetter:
+    shared_tile_cache = AtomicLinesTileCache()
+
     def __init__(
         self,
         atomic_lines_fetcher: AtomicLinesFetcher,
         atomic_lines_parser: AtomicLinesParser,
+        tile_cache: Optional[AtomicLinesTileCache] = None,
     ) -> None:
         self.atomic_lines_fetcher = atomic_lines_fetcher
         self.atomic_lines_parser = atomic_lines_parser
+        self.tile_cache = tile_cache if tile_cache is not None else self.shared_tile_cache
+        # tiles of different sources, e.g. online NIST and an offline bundle, must not be mixed in the shared cache
+        self.source = getattr(atomic_lines_fetcher, "source", type(atomic_lines_fetcher).__name__)
 
     def get_data(self, species_name: str, target_peaks: np.ndarray) -> np.ndarray:
-        lower_wavelength, upper_wavelength = self._get_wavelength_range(target_peaks)
+        tiles = self.tile_cache.get_tiles(target_peaks)
+        missing_ranges = self.tile_cache.get_missing_ranges(self.source, species_name, tiles)
+        get_recorder().record_nist_cache_lookup(hit=not missing_ranges)
+        for lower_wavelength, upper_wavelength in missing_ranges:
+            self._fetch_tiles(species_name, lower_wavelength, upper_wavelength)
+
+        # peaks are only matched to lines of the ranges of their requested tiles, whatever else is cached
+        index = self.tile_cache.get_index(self.source, species_name)
+        peak_positions, matched_lines = [], []
+        for lower_wavelength, upper_wavelength in self.tile_cache.get_ranges(tiles):
+            in_range = np.flatnonzero((target_peaks >= lower_wavelength) & (target_peaks < upper_wavelength))
+            peak_positions.append(in_range)
+            matched_lines.append(index.nearest(target_peaks[in_range], lower_wavelength, upper_wavelength))
+
+        return np.concatenate(matched_lines)[np.argsort(np.concatenate(peak_positions))]
+
+    def _fetch_tiles(self, species_name, lower_wavelength, upper_wavelength):
         atomic_lines_data = self._fetch_atomic_lines_data_from_nist(
             species_name, lower_wavelength, upper_wavelength
         )
-        parsed_data = self._parse_data_into_dataframe(atomic_lines_data)
+        parsed_data = self._parse_data_into_numpy(atomic_lines_data)
         filtered_data = self._filter_data(parsed_data)
-
-        return self._find_rows_nearest_to_target_peaks(
-            filtered_data.to_numpy().astype(float), target_peaks
+        self.tile_cache.add_lines(
+            self.source, species_name, lower_wavelength, upper_wavelength, filtered_data
         )
 
-    def _get_wavelength_range(self, target_peaks: np.ndarray):
-        lower_wavelength = int((np.floor(target_peaks / 100) * 100).min())
-        upper_wavelength = int((np.ceil(target_peaks / 100) * 100).max())
-
-        return lower_wavelength, upper_wavelength
-
     def _filter_data(self, parsed_data):
-        column_filtered_data = parsed_data[TARGET_COLUMNS]
-        colunm_and_row_filtered_data = column_filtered_data[
-            column_filtered_data[NOT_NA_FILTER_COLUMN].notna()
+        return parsed_data[
+            ~np.isnan(parsed_data[:, TARGET_COLUMNS.index(NOT_NA_FILTER_COLUMN)])
         ]
 
-        return colunm_and_row_filtered_data
-
     def _fetch_atomic_lines_data_from_nist(
         self, species_name, lower_wavelength, upper_wavelength
     ):
@@ -48,12 +65,7 @@ class AtomicLinesDataGetter:
             species_name, lower_wavelength, upper_wavelength
         )
 
-    def _parse_data_into_dataframe(self, atomic_lines_data):
-        return self.atomic_lines_parser.parse_atomic_lines(atomic_lines_data)
-
-    def _find_rows_nearest_to_target_peaks(self, spectrum_data, target_peaks):
-        indices = np.abs(spectrum_data[:, 0] - target_peaks[:, np.newaxis]).argmin(
-            axis=1
+    def _parse_data_into_numpy(self, atomic_lines_data):
+        return self.atomic_lines_parser.parse_atomic_lines_to_numpy(
+            atomic_lines_data, TARGET_COLUMNS
         )
-
-        return spectrum_data[indices]
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spark_mec_bp.data_preparation.cache import AtomicLinesTileCache
+from spark_mec_bp.data_preparation.getters import AtomicLinesDataGetter
+
+LINES = pd.DataFrame(
+    {
+        "obs_wl_air(nm)": [312.278, 330.0, 406.507, 479.258, 520.9078, 546.5497],
+        "Aki(s^-1)": [1.9e7, np.nan, 8.5e7, 8.9e7, 7.5e7, 8.6e7],
+        "g_k": [4.0, 2.0, 4.0, 6.0, 4.0, 6.0],
+        "Ek(cm-1)": [41174.613, 30000.0, 61951.6, 62033.7, 48743.969, 48764.219],
+    }
+)
+
+
+@pytest.fixture()
+def atomic_lines_parser(mocker):
+    def parse_atomic_lines(atomic_lines_data, columns):
+        lower_wavelength, upper_wavelength = atomic_lines_data
+        wavelengths = LINES["obs_wl_air(nm)"]
+
+        return LINES[(wavelengths >= lower_wavelength) & (wavelengths <= upper_wavelength)].to_numpy()
+
+    parser = mocker.MagicMock()
+    parser.parse_atomic_lines_to_numpy.side_effect = parse_atomic_lines
+
+    return parser
+
+
+@pytest.fixture()
+def atomic_lines_fetcher(mocker):
+    fetcher = mocker.MagicMock()
+    fetcher.fetch.side_effect = lambda species, lower, upper: (lower, upper)
+
+    return fetcher
+
+
+def test_atomic_lines_data_getter_returns_rows_nearest_to_target_peaks(
+    atomic_lines_fetcher, atomic_lines_parser
+):
+    getter = AtomicLinesDataGetter(atomic_lines_fetcher, atomic_lines_parser, AtomicLinesTileCache())
+
+    actual_result = getter.get_data("Au I", np.array([312.3, 406.5, 479.26]))
+
+    np.testing.assert_array_equal(actual_result, LINES.to_numpy()[[0, 2, 3]])
+    atomic_lines_fetcher.fetch.assert_called_once_with("Au I", 300, 500)
+
+
+def test_atomic_lines_data_getter_fetches_only_missing_tiles(
+    atomic_lines_fetcher, atomic_lines_parser
+):
+    getter = AtomicLinesDataGetter(atomic_lines_fetcher, atomic_lines_parser, AtomicLinesTileCache())
+
+    getter.get_data("Au I", np.array([406.5, 479.26]))
+    getter.get_data("Au I", np.array([312.3, 406.5, 546.5]))
+    actual_result = getter.get_data("Au I", np.array([312.3, 520.9]))
+
+    assert atomic_lines_fetcher.fetch.call_args_list == [
+        (("Au I", 400, 500),),
+        (("Au I", 300, 400),),
+        (("Au I", 500, 600),),
+    ]
+    np.testing.assert_array_equal(actual_result, LINES.to_numpy()[[0, 4]])
+
+
+def test_atomic_lines_data_getter_matches_peaks_only_to_lines_of_their_ranges(
+    atomic_lines_fetcher, atomic_lines_parser
+):
+    getter = AtomicLinesDataGetter(atomic_lines_fetcher, atomic_lines_parser, AtomicLinesTileCache())
+
+    getter.get_data("Au I", np.array([406.5]))
+    actual_result = getter.get_data("Au I", np.array([546.5, 399.0]))
+
+    assert atomic_lines_fetcher.fetch.call_args_list == [
+        (("Au I", 400, 500),),
+        (("Au I", 300, 400),),
+        (("Au I", 500, 600),),
+    ]
+    np.testing.assert_array_equal(actual_result, LINES.to_numpy()[[5, 0]])
+
+
+def test_atomic_lines_data_getters_share_line_index_across_runs(
+    mocker, atomic_lines_fetcher, atomic_lines_parser
+):
+    mocker.patch.object(AtomicLinesDataGetter, "shared_tile_cache", AtomicLinesTileCache())
+
+    AtomicLinesDataGetter(atomic_lines_fetcher, atomic_lines_parser).get_data("Ag I", np.array([520.9]))
+    AtomicLinesDataGetter(atomic_lines_fetcher, atomic_lines_parser).get_data("Ag I", np.array([546.5]))
+
+    atomic_lines_fetcher.fetch.assert_called_once_with("Ag I", 500, 600)
+
+
+def test_atomic_lines_tile_cache_coalesces_missing_tiles():
+    cache = AtomicLinesTileCache()
+    cache.add_lines("nist", "Au I", 400, 500, LINES.to_numpy()[[2, 3]])
+
+    assert cache.get_missing_ranges("nist", "Au I", [200, 300, 400, 500, 600]) == [(200, 400), (500, 700)]
+
+
+def test_atomic_lines_data_getters_keep_the_tiles_of_sources_apart(mocker, atomic_lines_parser):
+    mocker.patch.object(AtomicLinesDataGetter, "shared_tile_cache", AtomicLinesTileCache())
+    online_fetcher, offline_fetcher = mocker.MagicMock(), mocker.MagicMock()
+    for fetcher, source in [(online_fetcher, "nist"), (offline_fetcher, ("bundle", "nist_bundle.json"))]:
+        fetcher.source = source
+        fetcher.fetch.side_effect = lambda species, lower, upper: (lower, upper)
+
+    AtomicLinesDataGetter(online_fetcher, atomic_lines_parser).get_data("Ag I", np.array([520.9]))
+    AtomicLinesDataGetter(offline_fetcher, atomic_lines_parser).get_data("Ag I", np.array([520.9]))
+
+    online_fetcher.fetch.assert_called_once_with("Ag I", 500, 600)
+    offline_fetcher.fetch.assert_called_once_with("Ag I", 500, 600)
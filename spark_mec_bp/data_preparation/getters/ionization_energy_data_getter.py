@@ -1,22 +1,59 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from spark_mec_bp.instrumentation import get_recorder
 from spark_mec_bp.nist.fetchers import IonizationEnergyFetcher
 from spark_mec_bp.nist.parsers import IonizationEnergyParser
 
+SPECTRA_SEPARATOR = "; "
+
 
 class IonizationEnergyDataGetter:
+    # keyed by the source of the fetcher and the species name
+    shared_ionization_energies: Dict[Tuple[Any, str], float] = {}
+
     def __init__(
         self,
         ionization_energy_fetcher: IonizationEnergyFetcher,
         ionization_energy_parser: IonizationEnergyParser,
+        ionization_energies: Optional[Dict[Tuple[Any, str], float]] = None,
     ) -> None:
         self.ionization_energy_fetcher = ionization_energy_fetcher
         self.ionization_energy_parser = ionization_energy_parser
+        self.ionization_energies = (
+            ionization_energies if ionization_energies is not None else self.shared_ionization_energies
+        )
+        self.source = getattr(ionization_energy_fetcher, "source", type(ionization_energy_fetcher).__name__)
 
     def get_data(self, species_name: str) -> float:
-        ionziation_energy_data = self.ionization_energy_fetcher.fetch(species_name)
-        parsed_ionization_energy_data = (
-            self.ionization_energy_parser.parse_ionization_energy(
+        return self.get_bulk_data([species_name])[0]
+
+    def get_bulk_data(self, species_names: List[str]) -> List[float]:
+        missing_species_names = [
+            species_name
+            for species_name in dict.fromkeys(species_names)
+            if (self.source, species_name) not in self.ionization_energies
+        ]
+        get_recorder().record_nist_cache_lookup(hit=not missing_species_names)
+        if missing_species_names:
+            self._fetch_ionization_energies(missing_species_names)
+
+        return [self._get_ionization_energy(species_name) for species_name in species_names]
+
+    def _fetch_ionization_energies(self, species_names: List[str]) -> None:
+        ionziation_energy_data = self.ionization_energy_fetcher.fetch(
+            SPECTRA_SEPARATOR.join(species_names)
+        )
+        parsed_species_names, parsed_ionization_energies = (
+            self.ionization_energy_parser.parse_ionization_energy_to_numpy(
                 ionziation_energy_data
             )
         )
 
-        return float(parsed_ionization_energy_data["Ionization Energy (1/cm)"].iloc[0])
+        for species_name, ionization_energy in zip(parsed_species_names, parsed_ionization_energies):
+            self.ionization_energies[self.source, str(species_name)] = float(ionization_energy)
+
+    def _get_ionization_energy(self, species_name: str) -> float:
+        if (self.source, species_name) not in self.ionization_energies:
+            raise ValueError(f"NIST returned no ionization energy for {species_name}")
+
+        return self.ionization_energies[self.source, species_name]
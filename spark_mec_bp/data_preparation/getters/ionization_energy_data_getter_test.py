@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from spark_mec_bp.data_preparation.getters import IonizationEnergyDataGetter
+
+
+@pytest.fixture()
+def ionization_energy_parser(mocker):
+    parser = mocker.MagicMock()
+    parser.parse_ionization_energy_to_numpy.return_value = (
+        np.array(["Ar I", "Ag I", "Au I"]),
+        np.array([127109.842, 61106.45, 74409.11]),
+    )
+
+    return parser
+
+
+def test_ionization_energy_data_getter_fetches_all_species_in_one_request(
+    mocker, ionization_energy_parser
+):
+    ionization_energy_fetcher = mocker.MagicMock()
+    getter = IonizationEnergyDataGetter(ionization_energy_fetcher, ionization_energy_parser, {})
+
+    actual_result = getter.get_bulk_data(["Au I", "Ag I", "Ar I"])
+
+    assert actual_result == [74409.11, 61106.45, 127109.842]
+    ionization_energy_fetcher.fetch.assert_called_once_with("Au I; Ag I; Ar I")
+
+
+def test_ionization_energy_data_getter_serves_repeated_species_from_memory(
+    mocker, ionization_energy_parser
+):
+    mocker.patch.object(IonizationEnergyDataGetter, "shared_ionization_energies", {})
+    ionization_energy_fetcher = mocker.MagicMock()
+
+    IonizationEnergyDataGetter(ionization_energy_fetcher, ionization_energy_parser).get_bulk_data(
+        ["Au I", "Ag I", "Ar I"]
+    )
+    actual_result = IonizationEnergyDataGetter(ionization_energy_fetcher, ionization_energy_parser).get_data("Ag I")
+
+    assert actual_result == 61106.45
+    ionization_energy_fetcher.fetch.assert_called_once()
+
+
+def test_ionization_energy_data_getter_raises_error_on_missing_species(
+    mocker, ionization_energy_parser
+):
+    getter = IonizationEnergyDataGetter(mocker.MagicMock(), ionization_energy_parser, {})
+
+    with pytest.raises(ValueError):
+        getter.get_bulk_data(["Cu I"])
+
+
+def test_ionization_energy_data_getters_keep_the_energies_of_sources_apart(mocker, ionization_energy_parser):
+    mocker.patch.object(IonizationEnergyDataGetter, "shared_ionization_energies", {})
+    online_fetcher, offline_fetcher = mocker.MagicMock(), mocker.MagicMock()
+    online_fetcher.source, offline_fetcher.source = "nist", ("bundle", "nist_bundle.json")
+
+    IonizationEnergyDataGetter(online_fetcher, ionization_energy_parser).get_data("Ag I")
+    IonizationEnergyDataGetter(offline_fetcher, ionization_energy_parser).get_data("Ag I")
+
+    online_fetcher.fetch.assert_called_once_with("Ag I")
+    offline_fetcher.fetch.assert_called_once_with("Ag I")
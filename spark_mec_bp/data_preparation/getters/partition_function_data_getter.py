@@ -1,17 +1,30 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from spark_mec_bp.instrumentation import get_recorder
 from spark_mec_bp.nist.fetchers import AtomicLevelsFetcher
 from spark_mec_bp.nist.parsers import AtomicLevelsParser
 
 KELVIN_TO_ELECTRONVOLT_CONVERSION_FACTOR = 8.61732814974493e-05
+LEVELS_TEMPERATURE = 1.0  # eV, levels are the same for any temperature of the query
+TARGET_COLUMNS = ["g", "Level (cm-1)"]
 
 
 class PartitionFunctionDataGetter:
+    # keyed by the source of the fetcher and the species name
+    shared_atomic_levels: Dict[Tuple[Any, str], np.ndarray] = {}
+
     def __init__(
         self,
         atomic_levels_fetcher: AtomicLevelsFetcher,
         atomic_levels_parser: AtomicLevelsParser,
+        atomic_levels: Optional[Dict[Tuple[Any, str], np.ndarray]] = None,
     ) -> None:
         self.atomic_levels_fetcher = atomic_levels_fetcher
         self.atomic_levels_parser = atomic_levels_parser
+        self.atomic_levels = atomic_levels if atomic_levels is not None else self.shared_atomic_levels
+        self.source = getattr(atomic_levels_fetcher, "source", type(atomic_levels_fetcher).__name__)
 
     def get_data(self, species_name: str, temperature: float) -> float:
         atomic_levels_data = self.atomic_levels_fetcher.fetch(
@@ -19,3 +32,18 @@ class PartitionFunctionDataGetter:
         )
 
         return self.atomic_levels_parser.parse_partition_function(atomic_levels_data)
+
+    def get_atomic_levels(self, species_name: str) -> np.ndarray:
+        key = (self.source, species_name)
+        is_cached = key in self.atomic_levels
+        get_recorder().record_nist_cache_lookup(hit=is_cached)
+        if not is_cached:
+            atomic_levels_data = self.atomic_levels_fetcher.fetch(
+                species_name, LEVELS_TEMPERATURE
+            )
+            atomic_levels = self.atomic_levels_parser.parse_atomic_levels_to_numpy(
+                atomic_levels_data, TARGET_COLUMNS
+            )
+            self.atomic_levels[key] = atomic_levels[~np.isnan(atomic_levels).any(axis=1)]
+
+        return self.atomic_levels[key]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from spark_mec_bp.data_preparation.getters import PartitionFunctionDataGetter
+from spark_mec_bp.nist.fetchers import AtomicLevelsData
+from spark_mec_bp.nist.parsers import AtomicLevelsParser
+
+
+@pytest.fixture()
+def test_data_directory():
+    return "/app/spark_mec_bp/nist/parsers/test_data"
+
+
+@pytest.fixture()
+def atomic_levels_fetcher(mocker, test_data_directory):
+    with open(f"{test_data_directory}/atomic_levels/input_data.txt") as file:
+        atomic_levels_data = AtomicLevelsData(data=file.read())
+
+    fetcher = mocker.MagicMock()
+    fetcher.fetch.return_value = atomic_levels_data
+
+    return fetcher
+
+
+def test_partition_function_data_getter_reads_partition_function_of_nist(atomic_levels_fetcher):
+    getter = PartitionFunctionDataGetter(atomic_levels_fetcher, AtomicLevelsParser(), {})
+
+    actual_partition_function = getter.get_data("Ag I", 5 / 8.61732814974493e-05)
+
+    assert actual_partition_function == pytest.approx(117.92)
+    atomic_levels_fetcher.fetch.assert_called_once_with("Ag I", pytest.approx(5))
+
+
+def test_partition_function_data_getter_fetches_atomic_levels_once(atomic_levels_fetcher):
+    getter = PartitionFunctionDataGetter(atomic_levels_fetcher, AtomicLevelsParser(), {})
+
+    getter.get_atomic_levels("Ag I")
+    actual_atomic_levels = getter.get_atomic_levels("Ag I")
+
+    assert actual_atomic_levels.shape[1] == 2
+    assert not np.isnan(actual_atomic_levels).any()
+    atomic_levels_fetcher.fetch.assert_called_once_with("Ag I", 1.0)
+
+
+def test_partition_function_data_getters_keep_the_atomic_levels_of_sources_apart(mocker, atomic_levels_fetcher):
+    mocker.patch.object(PartitionFunctionDataGetter, "shared_atomic_levels", {})
+    offline_fetcher = mocker.MagicMock()
+    offline_fetcher.fetch.return_value = atomic_levels_fetcher.fetch.return_value
+    atomic_levels_fetcher.source, offline_fetcher.source = "nist", ("bundle", "nist_bundle.json")
+
+    PartitionFunctionDataGetter(atomic_levels_fetcher, AtomicLevelsParser()).get_atomic_levels("Ag I")
+    PartitionFunctionDataGetter(offline_fetcher, AtomicLevelsParser()).get_atomic_levels("Ag I")
+
+    atomic_levels_fetcher.fetch.assert_called_once_with("Ag I", 1.0)
+    offline_fetcher.fetch.assert_called_once_with("Ag I", 1.0)
@@ -0,0 +1,5 @@
+from .metrics import RunMetrics, StageMetrics, get_stage_group
+from .recorder import MetricsRecorder, NullRecorder, get_recorder, recording
+from .profiler import RUN_TARGET, StageProfiler
+from .prometheus import Counter, Histogram, Registry, PrometheusExporter, shared_prometheus_exporter
+from .memory import MemoryBudget, MemoryBudgetExceededError, MemoryUsage, estimate_size, measure_memory
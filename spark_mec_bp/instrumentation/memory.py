@@ -0,0 +1,89 @@
+import dataclasses
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import numpy as np
+
+STATM_FILE_PATH = "/proc/self/statm"
+
+
+class MemoryBudgetExceededError(Exception):
+    pass
+
+
+@dataclass
+class MemoryUsage:
+    traced_peak: int = 0  # bytes, peak of the python allocations during the block
+    rss_growth: int = 0  # bytes, growth of the current resident set size of the process over the block
+
+
+@dataclass
+class MemoryBudget:
+    per_shot: int  # bytes
+    fixed: int = 0  # bytes, independent of the number of shots
+
+    def get_limit(self, shots: int) -> int:
+        return self.fixed + self.per_shot * shots
+
+    def check(self, usage: MemoryUsage, shots: int) -> None:
+        limit = self.get_limit(shots)
+        for name, value in [("tracemalloc peak", usage.traced_peak), ("RSS growth", usage.rss_growth)]:
+            if value > limit:
+                raise MemoryBudgetExceededError(
+                    f"{name} of {value / 2 ** 20:.1f} MiB exceeds the budget of {limit / 2 ** 20:.1f} MiB "
+                    f"for {shots} shots"
+                )
+
+
+@contextmanager
+def measure_memory() -> Iterator[MemoryUsage]:
+    """Measures the memory used by the block, the usage is filled in when the block exits."""
+    usage = MemoryUsage()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):  # python 3.9+
+        tracemalloc.reset_peak()
+    start_traced, _ = tracemalloc.get_traced_memory()
+    start_rss = get_rss()
+    try:
+        yield usage
+    finally:
+        _, traced_peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        usage.traced_peak = max(traced_peak - start_traced, 0)
+        usage.rss_growth = max(get_rss() - start_rss, 0)
+
+
+def get_rss() -> int:
+    """Returns the current resident set size of the process in bytes, or 0 where /proc is not available.
+
+    The peak resident set size of getrusage is the high-water mark of the whole process lifetime, so it does not
+    grow during a block that stays below an earlier peak.
+    """
+    try:
+        with open(STATM_FILE_PATH) as file:
+            resident_pages = int(file.read().split()[1])
+    except OSError:
+        return 0
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def estimate_size(value: Any) -> int:
+    """Estimates the bytes held by arrays, dataclasses, containers and strings, e.g. for memo budgets."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if dataclasses.is_dataclass(value):
+        return sum(estimate_size(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+
+    return sys.getsizeof(value)
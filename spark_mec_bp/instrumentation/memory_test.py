@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pytest
+
+from spark_mec_bp.instrumentation import MemoryBudget, MemoryBudgetExceededError, MemoryUsage, measure_memory
+from spark_mec_bp.instrumentation.memory import STATM_FILE_PATH
+
+
+def test_measure_memory_measures_the_traced_peak():
+    with measure_memory() as usage:
+        array = np.ones(2 ** 20)
+        del array
+
+    assert usage.traced_peak >= 8 * 2 ** 20
+    assert usage.rss_growth >= 0
+
+
+@pytest.mark.skipif(not os.path.exists(STATM_FILE_PATH), reason="needs /proc")
+def test_measure_memory_measures_the_growth_of_the_current_rss():
+    large_array = np.ones(2 ** 25)
+    del large_array
+
+    with measure_memory() as usage:
+        retained_array = np.ones(2 ** 23)
+
+    assert len(retained_array) == 2 ** 23
+    assert usage.rss_growth >= 0.9 * 8 * 2 ** 23
+
+
+def test_memory_budget_limit_grows_per_shot():
+    assert MemoryBudget(per_shot=10, fixed=100).get_limit(5) == 150
+
+
+def test_memory_budget_check_passes_within_budget():
+    MemoryBudget(per_shot=10, fixed=100).check(MemoryUsage(traced_peak=150, rss_growth=150), 5)
+
+
+@pytest.mark.parametrize(
+    "usage", [MemoryUsage(traced_peak=151, rss_growth=0), MemoryUsage(traced_peak=0, rss_growth=151)]
+)
+def test_memory_budget_check_raises_when_exceeded(usage):
+    with pytest.raises(MemoryBudgetExceededError):
+        MemoryBudget(per_shot=10, fixed=100).check(usage, 5)
@@ -0,0 +1,44 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    wall_time: float  # s
+    cpu_time: float  # s, of the thread running the stage
+    # bytes allocated above the start of the stage, if memory is traced and no other stage ran at the same time
+    peak_memory: Optional[int] = None
+
+
+@dataclass
+class RunMetrics:
+    wall_time: float = 0.0  # s
+    stages: List[StageMetrics] = field(default_factory=list)
+    nist_requests: int = 0
+    nist_bytes: int = 0
+    nist_cache_hits: int = 0
+    nist_cache_misses: int = 0
+    fits: int = 0
+    fit_failures: int = 0
+    fit_iterations: int = 0  # objective function evaluations of all fits
+    baseline_iterations: List[int] = field(default_factory=list)
+
+    def get_stage_group_wall_times(self) -> Dict[str, float]:
+        """Returns the wall time of every stage group, summed over its per species stages."""
+        wall_times: Dict[str, float] = {}
+        for stage_metrics in self.stages:
+            group = get_stage_group(stage_metrics.name)
+            wall_times[group] = wall_times.get(group, 0.0) + stage_metrics.wall_time
+
+        return wall_times
+
+    def write_json_line(self, file_path: str) -> None:
+        with open(file_path, "a") as file:
+            file.write(json.dumps(asdict(self)) + "\n")
+
+
+def get_stage_group(stage_name: str) -> str:
+    """Returns the group of a stage, per species stages like "integrals[Au I]" belong to "integrals"."""
+    return stage_name.split("[")[0]
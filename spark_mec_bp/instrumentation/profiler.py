@@ -0,0 +1,120 @@
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+from spark_mec_bp.instrumentation.metrics import get_stage_group
+
+RUN_TARGET = "run"
+TOP = 20
+
+_run_counter = itertools.count()
+
+
+class StageProfiler:
+    def __init__(
+        self,
+        targets: List[str],
+        output_directory: str,
+        cprofile: bool = True,
+        trace_memory: bool = False,
+        top: int = TOP,
+    ) -> None:
+        """Profiles the targets, stage names or "run" for the whole run, into a new directory per run.
+
+        A stage group like "integrals" profiles all of its per species stages into one target.
+        """
+        self.targets = targets
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.top = top
+        self.run_directory = os.path.join(
+            output_directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_run_counter)}"
+        )
+        self._lock = Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._memory_summaries: Dict[str, List[str]] = {}
+
+    def profile(self, stage_name: str) -> ContextManager[None]:
+        target = self.get_target(stage_name)
+        if target is None:
+            return nullcontext()
+
+        return self._profile(target, stage_name)
+
+    def get_target(self, stage_name: str) -> Optional[str]:
+        for target in [stage_name, get_stage_group(stage_name)]:
+            if target in self.targets:
+                return target
+
+        return None
+
+    @contextmanager
+    def _profile(self, target: str, stage_name: str) -> Iterator[None]:
+        profile = cProfile.Profile() if self.cprofile else None
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        start_snapshot = tracemalloc.take_snapshot() if self.trace_memory else None
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            end_snapshot = tracemalloc.take_snapshot() if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            self._write_artifacts(target, stage_name, profile, start_snapshot, end_snapshot)
+
+    def _write_artifacts(
+        self,
+        target: str,
+        stage_name: str,
+        profile: Optional[cProfile.Profile],
+        start_snapshot: Optional[tracemalloc.Snapshot],
+        end_snapshot: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        # the artifacts of a target are rewritten with the stages profiled so far after each of its stages
+        with self._lock:
+            os.makedirs(self.run_directory, exist_ok=True)
+            summary = []
+            if profile is not None:
+                stats = self._stats.get(target)
+                if stats is None:
+                    stats = self._stats[target] = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+                stats.dump_stats(os.path.join(self.run_directory, f"{target}.prof"))
+                summary.append(self._summarize_profile(stats))
+            if end_snapshot is not None:
+                memory_summaries = self._memory_summaries.setdefault(target, [])
+                memory_summaries.append(self._summarize_memory(stage_name, start_snapshot, end_snapshot))
+                summary.extend(memory_summaries)
+
+            with open(os.path.join(self.run_directory, f"{target}.txt"), "w") as file:
+                file.write("\n".join(summary))
+
+    def _summarize_profile(self, stats: pstats.Stats) -> str:
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(self.top)
+
+        return stream.getvalue()
+
+    def _summarize_memory(
+        self, stage_name: str, start_snapshot: tracemalloc.Snapshot, end_snapshot: tracemalloc.Snapshot
+    ) -> str:
+        statistics = end_snapshot.compare_to(start_snapshot, "lineno")[: self.top]
+
+        return "\n".join(
+            [f"Top {self.top} memory allocations retained by {stage_name}"]
+            + [str(statistic) for statistic in statistics]
+        )
@@ -0,0 +1,69 @@
+import os
+import pstats
+
+from spark_mec_bp.instrumentation import StageProfiler
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(1000)]
+
+
+def test_profile_writes_cprofile_stats_and_summary(tmp_path):
+    profiler = StageProfiler(["allocating"], str(tmp_path), top=5)
+
+    with profiler.profile("allocating"):
+        allocate()
+
+    assert os.path.dirname(profiler.run_directory) == str(tmp_path)
+    stats = pstats.Stats(os.path.join(profiler.run_directory, "allocating.prof"))
+    assert any(function_name == "allocate" for _, _, function_name in stats.stats)
+    with open(os.path.join(profiler.run_directory, "allocating.txt")) as file:
+        assert "allocate" in file.read()
+
+
+def test_profile_writes_memory_summary_if_traced(tmp_path):
+    profiler = StageProfiler(["allocating"], str(tmp_path), cprofile=False, trace_memory=True)
+
+    with profiler.profile("allocating"):
+        data = allocate()
+
+    assert len(data) == 1000
+    assert os.listdir(profiler.run_directory) == ["allocating.txt"]
+    with open(os.path.join(profiler.run_directory, "allocating.txt")) as file:
+        summary = file.read()
+    assert "memory allocations" in summary
+    assert "profiler_test.py" in summary
+
+
+def allocate_more():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def test_profile_collects_per_species_stages_into_their_group_target(tmp_path):
+    profiler = StageProfiler(["allocating"], str(tmp_path), trace_memory=True)
+
+    with profiler.profile("allocating[Au I]"):
+        allocate()
+    with profiler.profile("allocating[Ag I]"):
+        allocate_more()
+
+    assert sorted(os.listdir(profiler.run_directory)) == ["allocating.prof", "allocating.txt"]
+    stats = pstats.Stats(os.path.join(profiler.run_directory, "allocating.prof"))
+    assert {"allocate", "allocate_more"} <= {function_name for _, _, function_name in stats.stats}
+    with open(os.path.join(profiler.run_directory, "allocating.txt")) as file:
+        summary = file.read()
+    assert "retained by allocating[Au I]" in summary
+    assert "retained by allocating[Ag I]" in summary
+
+
+def test_profile_skips_other_targets(tmp_path):
+    profiler = StageProfiler(["allocating"], str(tmp_path))
+
+    with profiler.profile("other"):
+        allocate()
+
+    assert not os.path.exists(profiler.run_directory)
+
+
+def test_profilers_write_into_separate_run_directories(tmp_path):
+    assert StageProfiler([], str(tmp_path)).run_directory != StageProfiler([], str(tmp_path)).run_directory
@@ -0,0 +1,228 @@
+import bisect
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from spark_mec_bp.instrumentation.metrics import RunMetrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ITERATION_BUCKETS = (1, 2, 5, 10, 20, 30, 40, 50, 75, 100)
+PREFIX = "spark_mec_bp_"
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        label_values = _get_label_values(self.label_names, labels)
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+                for label_values, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        label_values = _get_label_values(self.label_names, labels)
+        with self._lock:
+            bucket_counts, total, count = self._values.get(label_values, ([0] * len(self.buckets), 0.0, 0))
+            bucket_index = bisect.bisect_left(self.buckets, value)
+            if bucket_index < len(self.buckets):
+                bucket_counts[bucket_index] += 1
+            self._values[label_values] = (bucket_counts, total + value, count + 1)
+
+    def collect(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for label_values, (bucket_counts, total, count) in sorted(self._values.items()):
+                cumulative_count = 0
+                for bucket, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative_count += bucket_count
+                    labels = _format_labels(self.label_names + ("le",), label_values + (_format_value(bucket),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative_count}")
+                labels = _format_labels(self.label_names + ("le",), label_values + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.collect())
+
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    def __init__(self, registry: Optional[Registry] = None) -> None:
+        self.registry = registry if registry is not None else Registry()
+        self.spectra_processed = self.registry.register(
+            Counter(f"{PREFIX}spectra_processed_total", "Spectra processed.")
+        )
+        self.spectra_failed = self.registry.register(
+            Counter(f"{PREFIX}spectra_failed_total", "Spectra whose processing raised an error.")
+        )
+        self.run_duration = self.registry.register(
+            Histogram(f"{PREFIX}run_duration_seconds", "Wall time of processing a spectrum.")
+        )
+        self.stage_duration = self.registry.register(
+            Histogram(
+                f"{PREFIX}stage_duration_seconds",
+                "Wall time of pipeline stages, summed over the per species stages of a group.",
+                ["stage"],
+            )
+        )
+        self.nist_requests = self.registry.register(
+            Counter(f"{PREFIX}nist_requests_total", "Requests sent to the NIST database.")
+        )
+        self.nist_response_bytes = self.registry.register(
+            Counter(f"{PREFIX}nist_response_bytes_total", "Bytes received from the NIST database.")
+        )
+        self.nist_cache_lookups = self.registry.register(
+            Counter(f"{PREFIX}nist_cache_lookups_total", "Lookups of the NIST data caches.", ["result"])
+        )
+        self.fits = self.registry.register(Counter(f"{PREFIX}fits_total", "Voigt fits of peaks."))
+        self.fit_failures = self.registry.register(
+            Counter(f"{PREFIX}fit_failures_total", "Voigt fits that did not converge.")
+        )
+        self.baseline_iterations = self.registry.register(
+            Histogram(
+                f"{PREFIX}baseline_iterations",
+                "arPLS iterations until the baseline converged or hit the iteration limit.",
+                buckets=ITERATION_BUCKETS,
+            )
+        )
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_lock = Lock()
+
+    def observe_run(self, metrics: RunMetrics) -> None:
+        self.spectra_processed.inc()
+        self.run_duration.observe(metrics.wall_time)
+        for stage, wall_time in metrics.get_stage_group_wall_times().items():
+            self.stage_duration.observe(wall_time, stage=stage)
+        self.nist_requests.inc(metrics.nist_requests)
+        self.nist_response_bytes.inc(metrics.nist_bytes)
+        self.nist_cache_lookups.inc(metrics.nist_cache_hits, result="hit")
+        self.nist_cache_lookups.inc(metrics.nist_cache_misses, result="miss")
+        self.fits.inc(metrics.fits)
+        self.fit_failures.inc(metrics.fit_failures)
+        for iterations in metrics.baseline_iterations:
+            self.baseline_iterations.observe(iterations)
+
+    def observe_failure(self) -> None:
+        self.spectra_failed.inc()
+
+    def write(self, file_path: str) -> None:
+        """Writes the metrics atomically, e.g. for the textfile collector of the node exporter."""
+        temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary_file_path, "w") as file:
+            file.write(self.registry.render())
+        os.replace(temporary_file_path, file_path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves the metrics on http://host:port/metrics from a daemon thread, once per exporter."""
+        with self._server_lock:
+            if self._server is None:
+                self._server = ThreadingHTTPServer((host, port), _create_request_handler(self.registry))
+                Thread(target=self._server.serve_forever, daemon=True).start()
+
+            return self._server
+
+    def shutdown(self) -> None:
+        with self._server_lock:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                self._server = None
+
+
+def _create_request_handler(registry: Registry):
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    return MetricsRequestHandler
+
+
+def _get_label_values(label_names: Tuple[str, ...], labels: Dict[str, str]) -> LabelValues:
+    if set(labels) != set(label_names):
+        raise ValueError(f"Expected labels {', '.join(label_names)}, got {', '.join(labels)}")
+
+    return tuple(str(labels[label_name]) for label_name in label_names)
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: LabelValues) -> str:
+    if not label_names:
+        return ""
+
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+shared_prometheus_exporter = PrometheusExporter()
@@ -0,0 +1,97 @@
+import urllib.request
+
+import pytest
+
+from spark_mec_bp.instrumentation import Counter, Histogram, PrometheusExporter, Registry, RunMetrics, StageMetrics
+
+
+def test_registry_renders_counters_in_text_exposition_format():
+    registry = Registry()
+    counter = registry.register(Counter("lookups_total", "Cache lookups.", ["result"]))
+    counter.inc(result="hit")
+    counter.inc(2, result="hit")
+    counter.inc(result='mi"ss')
+
+    assert registry.render() == (
+        "# HELP lookups_total Cache lookups.\n"
+        "# TYPE lookups_total counter\n"
+        'lookups_total{result="hit"} 3.0\n'
+        'lookups_total{result="mi\\"ss"} 1.0\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("duration_seconds", "Duration.", buckets=[0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.collect() == [
+        'duration_seconds_bucket{le="0.1"} 2',
+        'duration_seconds_bucket{le="1.0"} 3',
+        'duration_seconds_bucket{le="+Inf"} 4',
+        "duration_seconds_sum 2.65",
+        "duration_seconds_count 4",
+    ]
+
+
+def test_metrics_reject_wrong_labels():
+    with pytest.raises(ValueError, match="Expected labels stage"):
+        Histogram("duration_seconds", "Duration.", ["stage"]).observe(1.0, name="spectrum")
+
+
+def test_exporter_observes_run_metrics():
+    exporter = PrometheusExporter()
+
+    exporter.observe_run(
+        RunMetrics(
+            wall_time=1.2,
+            stages=[
+                StageMetrics("spectrum_correction", 0.8, 0.7),
+                StageMetrics("integrals[Au I]", 0.25, 0.25),
+                StageMetrics("integrals[Ag I]", 0.5, 0.5),
+            ],
+            nist_requests=2,
+            nist_bytes=2048,
+            nist_cache_hits=3,
+            nist_cache_misses=1,
+            fits=6,
+            fit_failures=1,
+            baseline_iterations=[12],
+        )
+    )
+    exporter.observe_failure()
+
+    rendered = exporter.registry.render()
+    assert "spark_mec_bp_spectra_processed_total 1.0\n" in rendered
+    assert "spark_mec_bp_spectra_failed_total 1.0\n" in rendered
+    assert 'spark_mec_bp_stage_duration_seconds_count{stage="spectrum_correction"} 1\n' in rendered
+    assert 'spark_mec_bp_stage_duration_seconds_count{stage="integrals"} 1\n' in rendered
+    assert 'spark_mec_bp_stage_duration_seconds_sum{stage="integrals"} 0.75\n' in rendered
+    assert "spark_mec_bp_nist_response_bytes_total 2048.0\n" in rendered
+    assert 'spark_mec_bp_nist_cache_lookups_total{result="hit"} 3.0\n' in rendered
+    assert "spark_mec_bp_fit_failures_total 1.0\n" in rendered
+    assert 'spark_mec_bp_baseline_iterations_bucket{le="10.0"} 0\n' in rendered
+    assert 'spark_mec_bp_baseline_iterations_bucket{le="20.0"} 1\n' in rendered
+
+
+def test_exporter_writes_metrics_file(tmp_path):
+    exporter = PrometheusExporter()
+    exporter.observe_failure()
+
+    exporter.write(str(tmp_path / "metrics.prom"))
+
+    assert (tmp_path / "metrics.prom").read_text() == exporter.registry.render()
+    assert [path.name for path in tmp_path.iterdir()] == ["metrics.prom"]
+
+
+def test_exporter_serves_metrics_over_http():
+    exporter = PrometheusExporter()
+    exporter.observe_failure()
+    server = exporter.serve(port=0)
+    try:
+        assert exporter.serve(port=0) is server
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode() == exporter.registry.render()
+    finally:
+        exporter.shutdown()
@@ -0,0 +1,142 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+from threading import Lock
+from typing import Iterator, Union
+
+from spark_mec_bp.instrumentation.metrics import RunMetrics, StageMetrics
+
+
+class NullRecorder:
+    enabled = False
+
+    @contextmanager
+    def measure_stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def record_nist_request(self, size: int) -> None:
+        pass
+
+    def record_nist_cache_lookup(self, hit: bool) -> None:
+        pass
+
+    def record_fit(self, iterations: int, success: bool = True) -> None:
+        pass
+
+    def record_baseline(self, iterations: int) -> None:
+        pass
+
+
+class MetricsRecorder:
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._lock = Lock()
+        self._metrics = RunMetrics()
+        self._running_stages = 0
+        self._started_stages = 0
+
+    @contextmanager
+    def measure_stage(self, name: str) -> Iterator[None]:
+        # tracemalloc is process-wide, the peak is only attributable to a stage which overlapped no other stage
+        with self._lock:
+            is_exclusive = self._running_stages == 0
+            self._running_stages += 1
+            self._started_stages += 1
+            started_stages = self._started_stages
+        start_memory = self._start_memory_measurement()
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.thread_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall_time
+            cpu_time = time.thread_time() - start_cpu_time
+            with self._lock:
+                self._running_stages -= 1
+                is_exclusive = is_exclusive and self._started_stages == started_stages
+                self._metrics.stages.append(
+                    StageMetrics(
+                        name=name,
+                        wall_time=wall_time,
+                        cpu_time=cpu_time,
+                        peak_memory=self._get_peak_memory(start_memory) if is_exclusive else None,
+                    )
+                )
+
+    def record_nist_request(self, size: int) -> None:
+        with self._lock:
+            self._metrics.nist_requests += 1
+            self._metrics.nist_bytes += size
+
+    def record_nist_cache_lookup(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._metrics.nist_cache_hits += 1
+            else:
+                self._metrics.nist_cache_misses += 1
+
+    def record_fit(self, iterations: int, success: bool = True) -> None:
+        with self._lock:
+            self._metrics.fits += 1
+            self._metrics.fit_iterations += iterations
+            if not success:
+                self._metrics.fit_failures += 1
+
+    def record_baseline(self, iterations: int) -> None:
+        with self._lock:
+            self._metrics.baseline_iterations.append(iterations)
+
+    def record_wall_time(self, wall_time: float) -> None:
+        with self._lock:
+            self._metrics.wall_time = wall_time
+
+    def get_metrics(self) -> RunMetrics:
+        with self._lock:
+            return replace(
+                self._metrics,
+                stages=list(self._metrics.stages),
+                baseline_iterations=list(self._metrics.baseline_iterations),
+            )
+
+    def _start_memory_measurement(self):
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return None
+        # per stage peaks need reset_peak (python 3.9+), otherwise the peak of the run so far is reported
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+        return tracemalloc.get_traced_memory()[0]
+
+    def _get_peak_memory(self, start_memory):
+        if start_memory is None:
+            return None
+
+        return max(tracemalloc.get_traced_memory()[1] - start_memory, 0)
+
+
+_current_recorder: ContextVar = ContextVar("recorder", default=NullRecorder())
+
+
+def get_recorder() -> Union[NullRecorder, MetricsRecorder]:
+    return _current_recorder.get()
+
+
+@contextmanager
+def recording(recorder: MetricsRecorder) -> Iterator[MetricsRecorder]:
+    """Makes the recorder current for the calling context and measures the wall time of the block."""
+    token = _current_recorder.set(recorder)
+    started_tracing = recorder.trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    start_wall_time = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        recorder.record_wall_time(time.perf_counter() - start_wall_time)
+        if started_tracing:
+            tracemalloc.stop()
+        _current_recorder.reset(token)
@@ -0,0 +1,101 @@
+import json
+
+from spark_mec_bp.instrumentation import (
+    MetricsRecorder,
+    NullRecorder,
+    RunMetrics,
+    StageMetrics,
+    get_recorder,
+    recording,
+)
+
+
+def test_get_recorder_defaults_to_null_recorder():
+    assert isinstance(get_recorder(), NullRecorder)
+    assert not get_recorder().enabled
+
+
+def test_recording_makes_recorder_current_for_the_block():
+    recorder = MetricsRecorder()
+
+    with recording(recorder):
+        get_recorder().record_nist_request(100)
+        get_recorder().record_nist_request(50)
+        get_recorder().record_fit(12)
+
+    metrics = recorder.get_metrics()
+    assert isinstance(get_recorder(), NullRecorder)
+    assert (metrics.nist_requests, metrics.nist_bytes) == (2, 150)
+    assert (metrics.fits, metrics.fit_iterations) == (1, 12)
+    assert metrics.wall_time > 0
+
+
+def test_measure_stage_records_times():
+    recorder = MetricsRecorder()
+
+    with recorder.measure_stage("summing"):
+        sum(range(100000))
+
+    stage_metrics = recorder.get_metrics().stages
+    assert [stage.name for stage in stage_metrics] == ["summing"]
+    assert stage_metrics[0].wall_time > 0
+    assert stage_metrics[0].cpu_time > 0
+    assert stage_metrics[0].peak_memory is None
+
+
+def test_measure_stage_records_peak_memory_if_traced():
+    recorder = MetricsRecorder(trace_memory=True)
+
+    with recording(recorder):
+        with recorder.measure_stage("allocating"):
+            data = bytearray(10 * 1024 * 1024)
+            del data
+
+    assert recorder.get_metrics().stages[0].peak_memory >= 10 * 1024 * 1024
+
+
+def test_measure_stage_records_no_peak_memory_of_overlapping_stages():
+    recorder = MetricsRecorder(trace_memory=True)
+
+    with recording(recorder):
+        with recorder.measure_stage("outer"):
+            with recorder.measure_stage("inner"):
+                data = bytearray(1024)
+                del data
+        with recorder.measure_stage("alone"):
+            data = bytearray(10 * 1024 * 1024)
+            del data
+
+    peak_memories = {stage.name: stage.peak_memory for stage in recorder.get_metrics().stages}
+    assert peak_memories["outer"] is None
+    assert peak_memories["inner"] is None
+    assert peak_memories["alone"] >= 10 * 1024 * 1024
+
+
+def test_write_json_line_appends_metrics(tmp_path):
+    file_path = str(tmp_path / "metrics.jsonl")
+    metrics = RunMetrics(wall_time=1.5, stages=[StageMetrics("spectrum", 0.5, 0.4)], nist_requests=1)
+
+    metrics.write_json_line(file_path)
+    metrics.write_json_line(file_path)
+
+    with open(file_path) as file:
+        lines = [json.loads(line) for line in file]
+    assert len(lines) == 2
+    assert lines[0]["stages"] == [{"name": "spectrum", "wall_time": 0.5, "cpu_time": 0.4, "peak_memory": None}]
+    assert lines[0]["nist_requests"] == 1
+
+
+def test_recorder_counts_cache_lookups_fit_failures_and_baseline_iterations():
+    recorder = MetricsRecorder()
+
+    with recording(recorder):
+        get_recorder().record_nist_cache_lookup(hit=True)
+        get_recorder().record_nist_cache_lookup(hit=False)
+        get_recorder().record_fit(40, success=False)
+        get_recorder().record_baseline(17)
+
+    metrics = recorder.get_metrics()
+    assert (metrics.nist_cache_hits, metrics.nist_cache_misses) == (1, 1)
+    assert (metrics.fits, metrics.fit_failures) == (1, 1)
+    assert metrics.baseline_iterations == [17]
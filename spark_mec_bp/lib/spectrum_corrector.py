@@ -1,13 +1,18 @@
 import warnings
+from typing import Dict
 
 import numpy as np
 from scipy import sparse
-from scipy.sparse import linalg
+from scipy.linalg import solve_banded
 from numpy.linalg import norm
 from dataclasses import dataclass
 
+from spark_mec_bp.instrumentation import get_recorder
+
 warnings.filterwarnings("ignore")
 
+BANDWIDTH = 2
+
 
 @dataclass
 class SpectrumCorrectionData:
@@ -25,6 +30,10 @@ class SpectrumCorrectorConfig:
 class SpectrumCorrector:
     def __init__(self, config: SpectrumCorrectorConfig) -> None:
         self.config = config
+        self._penalty_operators: Dict[int, np.ndarray] = {}
+
+    def prepare(self, spectrum_length: int) -> None:
+        self._get_penalty_operator(spectrum_length)
 
     def correct_spectrum(
         self, spectrum: np.ndarray, wavelength_column_index: int = 0, intensity_column_index: int = 1
@@ -42,19 +51,17 @@ class SpectrumCorrector:
     def _calculate_baseline(self, intensities):
         L = len(intensities)
 
-        diag = np.ones(L - 2)
-        D = sparse.spdiags([diag, -2 * diag, diag], [0, -1, -2], L, L - 2)
-
-        H = self.config.lam * D.dot(D.T)
+        H = self._get_penalty_operator(L)
 
         w = np.ones(L)
-        W = sparse.spdiags(w, 0, L, L)
 
         crit = 1
         count = 0
 
         while crit > self.config.ratio:
-            z = linalg.spsolve(W + H, W * intensities)
+            WH = H.copy()
+            WH[BANDWIDTH] += w
+            z = solve_banded((BANDWIDTH, BANDWIDTH), WH, w * intensities, check_finite=False)
             d = intensities - z
             dn = d[d < 0]
 
@@ -66,11 +73,33 @@ class SpectrumCorrector:
             crit = norm(w_new - w) / norm(w)
 
             w = w_new
-            W.setdiag(w)
 
             count += 1
 
             if count > self.config.iteration_limit:
                 break
 
+        get_recorder().record_baseline(count)
+
         return z
+
+    def _get_penalty_operator(self, L):
+        if L not in self._penalty_operators:
+            self._penalty_operators[L] = self._create_penalty_operator(L)
+
+        return self._penalty_operators[L]
+
+    def _create_penalty_operator(self, L):
+        # lam * D * D.T in the banded storage of scipy.linalg.solve_banded
+        diag = np.ones(L - 2)
+        D = sparse.spdiags([diag, -2 * diag, diag], [0, -1, -2], L, L - 2)
+        H = self.config.lam * D.dot(D.T)
+
+        banded_H = np.zeros((2 * BANDWIDTH + 1, L))
+        for offset in range(-BANDWIDTH, BANDWIDTH + 1):
+            if offset >= 0:
+                banded_H[BANDWIDTH - offset, offset:] = H.diagonal(offset)
+            else:
+                banded_H[BANDWIDTH - offset, :offset] = H.diagonal(offset)
+
+        return banded_H
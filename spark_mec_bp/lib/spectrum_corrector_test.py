@@ -0,0 +1,68 @@
+import numpy as np
+from numpy.linalg import norm
+from pytest import approx
+from scipy import sparse
+from scipy.sparse import linalg
+
+from spark_mec_bp.lib import SpectrumCorrector, SpectrumCorrectorConfig
+
+
+def calculate_sparse_baseline(intensities, config):
+    L = len(intensities)
+    diag = np.ones(L - 2)
+    D = sparse.spdiags([diag, -2 * diag, diag], [0, -1, -2], L, L - 2)
+    H = config.lam * D.dot(D.T)
+    w = np.ones(L)
+    W = sparse.spdiags(w, 0, L, L)
+    crit = 1
+    count = 0
+    while crit > config.ratio:
+        z = linalg.spsolve(W + H, W * intensities)
+        d = intensities - z
+        dn = d[d < 0]
+        m = np.mean(dn)
+        s = np.std(dn)
+        w_new = 1 / (1 + np.exp(2 * (d - (2 * s - m)) / s))
+        crit = norm(w_new - w) / norm(w)
+        w = w_new
+        W.setdiag(w)
+        count += 1
+        if count > config.iteration_limit:
+            break
+
+    return z
+
+
+def create_spectrum():
+    wavelengths = np.linspace(300, 600, 3000)
+    intensities = (
+        1000
+        + 2 * (wavelengths - 300)
+        + 5000 * np.exp(-((wavelengths - 400) ** 2) / 0.1)
+        + 3000 * np.exp(-((wavelengths - 520) ** 2) / 0.2)
+        + np.random.default_rng(0).normal(0, 20, len(wavelengths))
+    )
+
+    return np.stack((wavelengths, intensities), axis=-1)
+
+
+def test_correct_spectrum_matches_sparse_arpls():
+    config = SpectrumCorrectorConfig(iteration_limit=50, ratio=1e-5, lam=1000000)
+    spectrum = create_spectrum()
+
+    result = SpectrumCorrector(config).correct_spectrum(spectrum)
+
+    expected_baseline = calculate_sparse_baseline(spectrum[:, 1], config)
+    assert result.baseline == approx(expected_baseline, rel=1e-6)
+    assert result.corrected_spectrum[:, 1] == approx(spectrum[:, 1] - expected_baseline, abs=1e-3)
+    assert np.array_equal(result.corrected_spectrum[:, 0], spectrum[:, 0])
+
+
+def test_prepare_reuses_penalty_operator_for_spectrum_length():
+    spectrum_corrector = SpectrumCorrector(SpectrumCorrectorConfig())
+    spectrum_corrector.prepare(3000)
+    penalty_operator = spectrum_corrector._get_penalty_operator(3000)
+
+    spectrum_corrector.correct_spectrum(create_spectrum())
+
+    assert spectrum_corrector._get_penalty_operator(3000) is penalty_operator
@@ -6,9 +6,11 @@ class Logger:
         logging.captureWarnings(True)
         logger = logging.getLogger()
         logger.setLevel(logging.INFO)
-        formatter = logging.Formatter("%(asctime)s | %(levelname)-8s | %(message)s")
-        console = logging.StreamHandler()
-        console.setFormatter(formatter)
-        logger.addHandler(console)
+        if not any(getattr(handler, "is_spark_mec_bp_handler", False) for handler in logger.handlers):
+            formatter = logging.Formatter("%(asctime)s | %(levelname)-8s | %(message)s")
+            console = logging.StreamHandler()
+            console.setFormatter(formatter)
+            console.is_spark_mec_bp_handler = True
+            logger.addHandler(console)
 
         return logger
@@ -1,3 +1,4 @@
 from .atomic_levels import AtomicLevelsFetcher, AtomicLevelsData
 from .atomic_lines import AtomicLinesFetcher, AtomicLinesData
 from .ionization_energy import IonizationEnergyFetcher, IonizationEnergyData
+from .single_flight import SingleFlight, SingleFlightFetcher, SingleFlightStats, shared_single_flight
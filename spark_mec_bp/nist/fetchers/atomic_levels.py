@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 import requests
 
+from spark_mec_bp.nist.fetchers.response_reader import ResponseReader
 from spark_mec_bp.nist.validators import ResponseErrorValidator
 
 
@@ -12,6 +13,7 @@ class AtomicLevelsData:
 
 class AtomicLevelsFetcher:
     url = "https://physics.nist.gov/cgi-bin/ASD/energy1.pl"
+    source = url
     de = 0
     units = 0
     output_format = 3
@@ -30,6 +32,7 @@ class AtomicLevelsFetcher:
 
     def __init__(self) -> None:
         self.validator = ResponseErrorValidator()
+        self.response_reader = ResponseReader(self.validator)
 
     def fetch(
             self,
@@ -59,13 +62,10 @@ class AtomicLevelsFetcher:
                     "lande_out": self.lande_g,
                     "perc_out": self.leading_percentagies,
                     "submit": self.submit
-                }
+                },
+                stream=True,
         ) as response:
-            self._validate_response(response)
-            return AtomicLevelsData(data=response.text)
+            return AtomicLevelsData(data=self._read_response(response))
 
-    def _validate_response(self, response: requests.Response) -> None:
-        response.raise_for_status()
-        validation_error = self.validator.validate(response.text)
-        if validation_error:
-            raise validation_error
+    def _read_response(self, response: requests.Response) -> str:
+        return self.response_reader.read(response)
@@ -46,6 +46,8 @@ def test_fetch_get_request_is_called_with_valid_parameters(
     }
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"dummy ", b"data"]
         acutal_response = AtomicLevelsFetcher().fetch(
             species,
             temperature,
@@ -54,8 +56,9 @@ def test_fetch_get_request_is_called_with_valid_parameters(
     mock_get.assert_called_with(
         url=url,
         params=expected_params,
+        stream=True,
     )
-    assert acutal_response.data == response.text
+    assert acutal_response.data == "dummy data"
 
 
 def test_fetch_response_raise_for_status_is_called(
@@ -80,10 +83,12 @@ def test_fetch_calls_response_validator_which_returns_false_and_raises_exception
     mock_validator.return_value.validate.return_value = ValueError("dummy_error")
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"<html>dummy ", b"error</html>"]
         with pytest.raises(ValueError):
             AtomicLevelsFetcher().fetch(
                 "dummy_species",
                 300,
             )
 
-    mock_validator.return_value.validate.assert_called_with(response.text)
+    mock_validator.return_value.validate.assert_called_with("<html>dummy error</html>")
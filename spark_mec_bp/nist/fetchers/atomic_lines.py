@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 import requests
 
+from spark_mec_bp.nist.fetchers.response_reader import ResponseReader
 from spark_mec_bp.nist.validators import ResponseErrorValidator
 
 
@@ -12,6 +13,7 @@ class AtomicLinesData:
 
 class AtomicLinesFetcher:
     url = "https://physics.nist.gov/cgi-bin/ASD/lines1.pl"
+    source = url
     measure_type = 0
     wavelength_units = 1
     de = 0
@@ -45,6 +47,7 @@ class AtomicLinesFetcher:
 
     def __init__(self) -> None:
         self.validator = ResponseErrorValidator()
+        self.response_reader = ResponseReader(self.validator)
 
     def fetch(
             self,
@@ -90,14 +93,10 @@ class AtomicLinesFetcher:
                 "loggf_out": self.show_log_gf,
                 "unc_out": self.show_uncertainity,
                 "submit": self.submit,
-            }
+            },
+            stream=True,
         ) as response:
-            self._validate_response(response)
+            return AtomicLinesData(data=self._read_response(response))
 
-            return AtomicLinesData(data=response.text)
-
-    def _validate_response(self, response: requests.Response) -> None:
-        response.raise_for_status()
-        validation_error = self.validator.validate(response.text)
-        if validation_error:
-            raise validation_error
+    def _read_response(self, response: requests.Response) -> str:
+        return self.response_reader.read(response)
@@ -61,15 +61,17 @@ def test_atomic_lines_fetcher_get_request_is_called_with_valid_parameters(
     }
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"dummy ", b"data"]
         acutal_response = AtomicLinesFetcher().fetch(
             species,
             lower_wavelength,
             upper_wavelength,
         )
 
-    mock_get.assert_called_with(url=url, params=expected_params)
+    mock_get.assert_called_with(url=url, params=expected_params, stream=True)
 
-    assert acutal_response.data == response.text
+    assert acutal_response.data == "dummy data"
 
 
 def test_atomic_lines_fetcher_response_raise_for_status_is_called(
@@ -91,7 +93,9 @@ def test_atomic_lines_fetcher_calls_response_validator_which_returns_false_and_r
     mock_validator.return_value.validate.return_value = ValueError("dummy_error")
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"<html>dummy ", b"error</html>"]
         with pytest.raises(ValueError):
             AtomicLinesFetcher().fetch("dummy_species", 0, 0)
 
-    mock_validator.return_value.validate.assert_called_with(response.text)
+    mock_validator.return_value.validate.assert_called_with("<html>dummy error</html>")
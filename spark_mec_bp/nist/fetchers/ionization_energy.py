@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 import requests
 
+from spark_mec_bp.nist.fetchers.response_reader import ResponseReader
 from spark_mec_bp.nist.validators import ResponseErrorValidator
 
 
@@ -12,6 +13,7 @@ class IonizationEnergyData:
 
 class IonizationEnergyFetcher:
     url = "https://physics.nist.gov/cgi-bin/ASD/ie.pl"
+    source = url
     units = 0
     output_format = 3
     order = 0
@@ -30,6 +32,7 @@ class IonizationEnergyFetcher:
 
     def __init__(self) -> None:
         self.validator = ResponseErrorValidator()
+        self.response_reader = ResponseReader(self.validator)
 
     def fetch(
         self,
@@ -55,12 +58,9 @@ class IonizationEnergyFetcher:
                 "e_out": self.ionization_energy_output,
                 "submit": self.submit,
             },
+            stream=True,
         ) as response:
-            self._validate_response(response)
-            return IonizationEnergyData(data=response.text)
+            return IonizationEnergyData(data=self._read_response(response))
 
-    def _validate_response(self, response: requests.Response) -> None:
-        response.raise_for_status()
-        validation_error = self.validator.validate(response.text)
-        if validation_error:
-            raise validation_error
+    def _read_response(self, response: requests.Response) -> str:
+        return self.response_reader.read(response)
@@ -43,13 +43,15 @@ def test_ionization_energies_fetcher_get_request_is_called_with_valid_parameters
     }
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"dummy ", b"data"]
         acutal_response = IonizationEnergyFetcher().fetch(
             species,
         )
 
-    mock_get.assert_called_with(url=url, params=expected_params)
+    mock_get.assert_called_with(url=url, params=expected_params, stream=True)
 
-    assert acutal_response.data == response.text
+    assert acutal_response.data == "dummy data"
 
 
 def test_ionization_energies_fetcher_response_raise_for_status_is_called(
@@ -75,9 +77,11 @@ def test_ionization_energies_fetcher_calls_response_validator_which_returns_fals
     mock_validator.return_value.validate.return_value = ValueError("dummy_error")
 
     with mock_get() as response:
+        response.encoding = "utf-8"
+        response.iter_content.return_value = [b"<html>dummy ", b"error</html>"]
         with pytest.raises(ValueError):
             IonizationEnergyFetcher().fetch(
                 "dummy_species",
             )
 
-    mock_validator.return_value.validate.assert_called_with(response.text)
+    mock_validator.return_value.validate.assert_called_with("<html>dummy error</html>")
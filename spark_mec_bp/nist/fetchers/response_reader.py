@@ -0,0 +1,61 @@
+import codecs
+from typing import Iterator, List
+
+import requests
+
+from spark_mec_bp.instrumentation import get_recorder
+from spark_mec_bp.nist.validators import ResponseErrorValidator
+
+DEFAULT_ENCODING = "utf-8"
+ERROR_PAGE_SIZE = 64 * 1024  # bytes, read after the error marker for the NIST message
+
+
+class ResponseReader:
+    chunk_size = 64 * 1024
+
+    def __init__(self, validator: ResponseErrorValidator) -> None:
+        self.validator = validator
+        # the marker can be split between chunks, so the end of the text read so far is searched again
+        self.overlap = max(len(validator.error_string) - 1, 0)
+
+    def read(self, response: requests.Response) -> str:
+        """Reads a streamed response and stops early at the error marker of a NIST error page."""
+        response.raise_for_status()
+        decoder = codecs.getincrementaldecoder(response.encoding or DEFAULT_ENCODING)(errors="replace")
+        chunks = iter(response.iter_content(chunk_size=self.chunk_size))
+        texts: List[str] = []
+        size = 0
+        tail = ""
+        is_error_response = False
+        for chunk in chunks:
+            size += len(chunk)
+            text = decoder.decode(chunk)
+            texts.append(text)
+            if self.validator.is_error_response(tail + text):
+                is_error_response = True
+                size += self._read_error_page(chunks, decoder, texts)
+                break
+            tail = (tail + text)[-self.overlap:] if self.overlap else ""
+        else:
+            texts.append(decoder.decode(b"", final=True))
+        get_recorder().record_nist_request(size)
+        data = "".join(texts)
+
+        # only error pages are parsed for their message
+        if is_error_response:
+            validation_error = self.validator.validate(data)
+            if validation_error:
+                raise validation_error
+
+        return data
+
+    def _read_error_page(self, chunks: Iterator[bytes], decoder: codecs.IncrementalDecoder, texts: List[str]) -> int:
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            texts.append(decoder.decode(chunk))
+            if size >= ERROR_PAGE_SIZE:
+                break
+        texts.append(decoder.decode(b"", final=True))
+
+        return size
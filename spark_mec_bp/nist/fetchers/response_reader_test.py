@@ -0,0 +1,81 @@
+import pytest
+
+from spark_mec_bp.instrumentation import MetricsRecorder, recording
+from spark_mec_bp.nist.fetchers.response_reader import ERROR_PAGE_SIZE, ResponseReader
+from spark_mec_bp.nist.validators import ResponseErrorValidator
+from spark_mec_bp.nist.validators.response_error import ValidationError
+
+
+@pytest.fixture()
+def response(mocker):
+    response = mocker.MagicMock()
+    response.encoding = "utf-8"
+
+    return response
+
+
+def test_response_reader_joins_streamed_chunks(response):
+    response.iter_content.return_value = ["Ag I\t".encode(), "Ångström".encode()[:1], "Ångström".encode()[1:]]
+
+    assert ResponseReader(ResponseErrorValidator()).read(response) == "Ag I\tÅngström"
+
+
+def test_response_reader_raises_validation_error_with_nist_message(response):
+    response.iter_content.return_value = [
+        b'<html>\n<body bgcolor="white">\n',
+        b'<font color="red">Unrecognized token.</font>\n</body>\n</html>',
+    ]
+
+    with pytest.raises(ValidationError, match="Unrecognized token."):
+        ResponseReader(ResponseErrorValidator()).read(response)
+
+
+def test_response_reader_raises_validation_error_after_a_small_first_chunk(response):
+    response.iter_content.return_value = [
+        b"<",
+        b'html>\n<body bgcolor="white">\n<font color="red">Unrecognized token.</font>\n</body>\n</html>',
+    ]
+
+    with pytest.raises(ValidationError, match="Unrecognized token."):
+        ResponseReader(ResponseErrorValidator()).read(response)
+
+
+def test_response_reader_raises_validation_error_with_marker_after_the_first_chunk(response):
+    response.iter_content.return_value = [
+        b" " * ResponseReader.chunk_size,
+        b'<html>\n<body bgcolor="white">\n<font color="red">Unrecognized token.</font>\n</body>\n</html>',
+    ]
+
+    with pytest.raises(ValidationError, match="Unrecognized token."):
+        ResponseReader(ResponseErrorValidator()).read(response)
+
+
+def test_response_reader_stops_reading_after_the_error_page(response):
+    def iter_content(chunk_size):
+        yield b'<html>\n<body bgcolor="white">\n<font color="red">Unrecognized token.</font>\n'
+        yield b" " * ERROR_PAGE_SIZE
+        raise AssertionError("the rest of an error response must not be read")
+
+    response.iter_content.side_effect = iter_content
+
+    with pytest.raises(ValidationError, match="Unrecognized token."):
+        ResponseReader(ResponseErrorValidator()).read(response)
+
+
+def test_response_reader_does_not_validate_valid_responses_again(mocker, response):
+    validator = ResponseErrorValidator()
+    validate = mocker.spy(validator, "validate")
+    response.iter_content.return_value = [b"Ag I\t<ht", b"338.2887\n"]
+
+    assert ResponseReader(validator).read(response) == "Ag I\t<ht338.2887\n"
+    validate.assert_not_called()
+
+
+def test_response_reader_records_request_size(response):
+    response.iter_content.return_value = [b"abc", b"de"]
+
+    with recording(MetricsRecorder()) as recorder:
+        ResponseReader(ResponseErrorValidator()).read(response)
+
+    assert recorder.get_metrics().nist_requests == 1
+    assert recorder.get_metrics().nist_bytes == 5
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from spark_mec_bp.instrumentation import estimate_size
+
+MEMORY_BUDGET = 64 * 1024 * 1024  # bytes
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    hits: int = 0
+    deduplicated: int = 0
+    executed: int = 0
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self, memory_budget: int = MEMORY_BUDGET) -> None:
+        self.memory_budget = memory_budget
+        self._lock = Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+        # the responses of NIST can be megabytes each, so the memo is bounded by their size like StageMemo
+        self._memo: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._memo_size = 0
+        self._stats = SingleFlightStats()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Runs function once for concurrent calls with the same key and memoizes its result."""
+        with self._lock:
+            self._stats.calls += 1
+            if key in self._memo:
+                self._stats.hits += 1
+                self._memo.move_to_end(key)
+                return self._memo[key][0]
+
+            call = self._in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._in_flight[key] = _Call()
+                self._stats.executed += 1
+            else:
+                self._stats.deduplicated += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        else:
+            self._memoize(key, call.result)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+        return call.result
+
+    def get_stats(self) -> SingleFlightStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+            self._memo_size = 0
+            self._stats = SingleFlightStats()
+
+    def _memoize(self, key: Hashable, result: Any) -> None:
+        size = estimate_size(result)
+        if size > self.memory_budget:
+            return
+
+        with self._lock:
+            if key in self._memo:
+                return
+            self._memo[key] = (result, size)
+            self._memo_size += size
+            while self._memo_size > self.memory_budget:
+                _, (_, evicted_size) = self._memo.popitem(last=False)
+                self._memo_size -= evicted_size
+
+
+class SingleFlightFetcher:
+    def __init__(self, fetcher: Any, single_flight: SingleFlight) -> None:
+        self.fetcher = fetcher
+        self.single_flight = single_flight
+        self.source = getattr(fetcher, "source", type(fetcher).__name__)
+
+    def fetch(self, *args) -> Any:
+        return self.single_flight.do(
+            (type(self.fetcher).__name__, args), lambda: self.fetcher.fetch(*args)
+        )
+
+
+shared_single_flight = SingleFlight()
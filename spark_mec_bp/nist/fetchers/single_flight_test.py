@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from spark_mec_bp.instrumentation import estimate_size
+from spark_mec_bp.nist.fetchers import AtomicLinesData, SingleFlight, SingleFlightFetcher, SingleFlightStats
+
+
+def test_single_flight_shares_one_in_flight_call_between_concurrent_callers(mocker):
+    release = Event()
+    fetcher = mocker.MagicMock()
+    fetcher.fetch.side_effect = lambda spectrum: release.wait() and f"{spectrum} data"
+    single_flight = SingleFlight()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(SingleFlightFetcher(fetcher, single_flight).fetch, "Ar I")
+            for _ in range(4)
+        ]
+        while single_flight.get_stats().calls < 4:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["Ar I data"] * 4
+    fetcher.fetch.assert_called_once_with("Ar I")
+    assert single_flight.get_stats() == SingleFlightStats(calls=4, hits=0, deduplicated=3, executed=1)
+
+
+def test_single_flight_serves_completed_calls_from_memo(mocker):
+    fetcher = mocker.MagicMock()
+    single_flight = SingleFlight()
+
+    SingleFlightFetcher(fetcher, single_flight).fetch("Ar I", 1.0)
+    SingleFlightFetcher(fetcher, single_flight).fetch("Ar I", 1.0)
+    SingleFlightFetcher(fetcher, single_flight).fetch("Ar II", 1.0)
+
+    assert fetcher.fetch.call_count == 2
+    assert single_flight.get_stats() == SingleFlightStats(calls=3, hits=1, deduplicated=0, executed=2)
+
+
+def test_single_flight_does_not_memoize_errors(mocker):
+    fetcher = mocker.MagicMock()
+    fetcher.fetch.side_effect = [ValueError("dummy_error"), "data"]
+    single_flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        SingleFlightFetcher(fetcher, single_flight).fetch("Ar I")
+
+    assert SingleFlightFetcher(fetcher, single_flight).fetch("Ar I") == "data"
+
+
+def test_single_flight_memo_is_bounded_by_size():
+    data = {key: AtomicLinesData(data=key * 1000) for key in ["a", "b", "c"]}
+    single_flight = SingleFlight(memory_budget=2 * estimate_size(data["a"]))
+    calls = []
+
+    for key in ["a", "b", "c", "a", "c"]:
+        single_flight.do(key, lambda key=key: calls.append(key) or data[key])
+
+    assert calls == ["a", "b", "c", "a"]
+
+
+def test_single_flight_does_not_memoize_results_larger_than_the_budget():
+    single_flight = SingleFlight(memory_budget=100)
+    calls = []
+
+    for _ in range(2):
+        single_flight.do("a", lambda: calls.append("a") or AtomicLinesData(data="a" * 1000))
+
+    assert calls == ["a", "a"]
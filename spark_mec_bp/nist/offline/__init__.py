@@ -0,0 +1,2 @@
+from .bundle import NISTBundle, NISTBundleBuilder, AtomicLinesSnapshot, BundleError, load_bundle
+from .fetchers import OfflineAtomicLinesFetcher, OfflineAtomicLevelsFetcher, OfflineIonizationEnergyFetcher
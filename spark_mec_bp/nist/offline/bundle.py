@@ -0,0 +1,266 @@
+import gzip
+import json
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from spark_mec_bp.nist.fetchers import (
+    AtomicLinesFetcher,
+    AtomicLevelsFetcher,
+    IonizationEnergyFetcher,
+    AtomicLevelsData,
+)
+from spark_mec_bp.nist.parsers import AtomicLevelsParser
+from spark_mec_bp.nist.parsers.columns import to_float
+
+BUNDLE_FORMAT_VERSION = 1
+SNAPSHOT_TEMPERATURE = 1.0  # eV, the partition function is recalculated offline for any temperature
+END_OF_LEVELS_TABLE_STRING = "partition function"
+END_OF_IONIZATION_ENERGY_TABLE_STRING = "notes"
+SPECTRA_SEPARATOR = ";"
+LEVELS_STATISTICAL_WEIGHT_COLUMN = "g"
+LEVELS_ENERGY_COLUMN = "Level (cm-1)"
+
+
+class BundleError(Exception):
+    pass
+
+
+@dataclass
+class AtomicLinesSnapshot:
+    lower_wavelength: int
+    upper_wavelength: int
+    data: str
+
+
+@dataclass
+class _AtomicLinesIndex:
+    header: str
+    wavelengths: List[float]
+    rows: List[str]
+
+
+@dataclass
+class _AtomicLevelsIndex:
+    table: str
+    statistical_weights: np.ndarray
+    level_energies: np.ndarray
+
+
+@dataclass
+class NISTBundle:
+    atomic_lines: Dict[str, AtomicLinesSnapshot] = field(default_factory=dict)
+    atomic_levels: Dict[str, str] = field(default_factory=dict)
+    ionization_energies: Dict[str, str] = field(default_factory=dict)
+    created_at: str = ""
+    version: int = BUNDLE_FORMAT_VERSION
+    # set when loaded, identifies the bundle as the source of cached atomic lines
+    file_path: Optional[str] = field(default=None, compare=False)
+    _atomic_lines_index: Dict[str, _AtomicLinesIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _atomic_levels_index: Dict[str, _AtomicLevelsIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def save(self, file_path: str) -> None:
+        content = json.dumps(
+            {
+                "version": self.version,
+                "created_at": self.created_at,
+                "atomic_lines": {
+                    species: {
+                        "lower_wavelength": snapshot.lower_wavelength,
+                        "upper_wavelength": snapshot.upper_wavelength,
+                        "data": snapshot.data,
+                    }
+                    for species, snapshot in self.atomic_lines.items()
+                },
+                "atomic_levels": self.atomic_levels,
+                "ionization_energies": self.ionization_energies,
+            }
+        )
+        with _open_bundle_file(file_path, "wt") as file:
+            file.write(content)
+
+    @classmethod
+    def load(cls, file_path: str) -> "NISTBundle":
+        with _open_bundle_file(file_path, "rt") as file:
+            content = json.load(file)
+
+        version = content.get("version")
+        if version != BUNDLE_FORMAT_VERSION:
+            raise BundleError(
+                f"Unsupported NIST bundle version {version} in {file_path}, expected {BUNDLE_FORMAT_VERSION}"
+            )
+
+        return cls(
+            atomic_lines={
+                species: AtomicLinesSnapshot(**snapshot)
+                for species, snapshot in content["atomic_lines"].items()
+            },
+            atomic_levels=content["atomic_levels"],
+            ionization_energies=content["ionization_energies"],
+            created_at=content["created_at"],
+            version=version,
+            file_path=os.path.abspath(file_path),
+        )
+
+    def get_atomic_lines(self, spectrum: str, lower_wavelength: float, upper_wavelength: float) -> str:
+        snapshot = self._get_species_data(self.atomic_lines, "atomic lines", spectrum)
+        if lower_wavelength < snapshot.lower_wavelength or upper_wavelength > snapshot.upper_wavelength:
+            raise BundleError(
+                f"Atomic lines of {spectrum} are bundled for {snapshot.lower_wavelength}-"
+                f"{snapshot.upper_wavelength} nm, {lower_wavelength}-{upper_wavelength} nm was requested"
+            )
+
+        index = self._atomic_lines_index.get(spectrum)
+        if index is None:
+            index = self._atomic_lines_index[spectrum] = _index_atomic_lines(snapshot.data)
+
+        start = bisect_left(index.wavelengths, lower_wavelength)
+        end = bisect_right(index.wavelengths, upper_wavelength)
+
+        return "".join([index.header, *index.rows[start:end]])
+
+    def get_atomic_levels(self, spectrum: str) -> Tuple[str, np.ndarray, np.ndarray]:
+        index = self._atomic_levels_index.get(spectrum)
+        if index is None:
+            data = self._get_species_data(self.atomic_levels, "atomic levels", spectrum)
+            index = self._atomic_levels_index[spectrum] = _index_atomic_levels(data)
+
+        return index.table, index.statistical_weights, index.level_energies
+
+    def get_ionization_energy(self, spectrum: str) -> str:
+        tables = [
+            self._get_species_data(self.ionization_energies, "ionization energy", species_name.strip())
+            for species_name in spectrum.split(SPECTRA_SEPARATOR)
+            if species_name.strip()
+        ]
+        if len(tables) == 1:
+            return tables[0]
+
+        header = tables[0].splitlines()[0]
+        rows = [row for table in tables for row in _get_ionization_energy_rows(table)]
+
+        return "\n".join([header, *rows]) + "\n"
+
+    def _get_species_data(self, data: Dict, data_name: str, spectrum: str):
+        if spectrum not in data:
+            raise BundleError(f"No {data_name} data for {spectrum} in the NIST bundle")
+
+        return data[spectrum]
+
+
+class NISTBundleBuilder:
+    def __init__(
+        self,
+        atomic_lines_fetcher: AtomicLinesFetcher,
+        atomic_levels_fetcher: AtomicLevelsFetcher,
+        ionization_energy_fetcher: IonizationEnergyFetcher,
+    ) -> None:
+        self.atomic_lines_fetcher = atomic_lines_fetcher
+        self.atomic_levels_fetcher = atomic_levels_fetcher
+        self.ionization_energy_fetcher = ionization_energy_fetcher
+
+    def build(self, species_names: List[str], lower_wavelength: int, upper_wavelength: int) -> NISTBundle:
+        bundle = self.create_bundle()
+        for species_name in species_names:
+            self.add_atomic_lines(bundle, species_name, lower_wavelength, upper_wavelength)
+            self.add_atomic_levels(bundle, species_name)
+            self.add_ionization_energy(bundle, species_name)
+
+        return bundle
+
+    def create_bundle(self) -> NISTBundle:
+        return NISTBundle(created_at=datetime.now(timezone.utc).isoformat())
+
+    def add_atomic_lines(
+        self, bundle: NISTBundle, species_name: str, lower_wavelength: int, upper_wavelength: int
+    ) -> None:
+        bundle.atomic_lines[species_name] = AtomicLinesSnapshot(
+            lower_wavelength=lower_wavelength,
+            upper_wavelength=upper_wavelength,
+            data=self.atomic_lines_fetcher.fetch(
+                species_name, lower_wavelength, upper_wavelength
+            ).data,
+        )
+
+    def add_atomic_levels(self, bundle: NISTBundle, species_name: str) -> None:
+        bundle.atomic_levels[species_name] = self.atomic_levels_fetcher.fetch(
+            species_name, SNAPSHOT_TEMPERATURE
+        ).data
+
+    def add_ionization_energy(self, bundle: NISTBundle, species_name: str) -> None:
+        bundle.ionization_energies[species_name] = self.ionization_energy_fetcher.fetch(
+            species_name
+        ).data
+
+
+@lru_cache(maxsize=None)
+def load_bundle(file_path: str) -> NISTBundle:
+    return NISTBundle.load(file_path)
+
+
+def _open_bundle_file(file_path: str, mode: str):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode, encoding="utf-8")
+
+    return open(file_path, mode[0], encoding="utf-8")
+
+
+def _index_atomic_lines(data: str) -> _AtomicLinesIndex:
+    header, *lines = [line + "\n" for line in data.splitlines()]
+    rows = []
+    for line in lines:
+        fields = line.split("\t")
+        wavelength = to_float(fields[0])
+        if np.isnan(wavelength) and len(fields) > 1:
+            wavelength = to_float(fields[1])
+        if not np.isnan(wavelength):
+            rows.append((wavelength, line))
+    rows.sort(key=lambda row: row[0])
+
+    return _AtomicLinesIndex(
+        header=header,
+        wavelengths=[wavelength for wavelength, _ in rows],
+        rows=[line for _, line in rows],
+    )
+
+
+def _index_atomic_levels(data: str) -> _AtomicLevelsIndex:
+    table_lines = []
+    for line in data.splitlines(keepends=True):
+        if line.strip().lower().startswith(END_OF_LEVELS_TABLE_STRING):
+            break
+        table_lines.append(line)
+    while table_lines and not table_lines[-1].strip():
+        table_lines.pop()
+
+    table = "".join(table_lines)
+    levels = AtomicLevelsParser().parse_atomic_levels_to_numpy(
+        AtomicLevelsData(data=table), [LEVELS_STATISTICAL_WEIGHT_COLUMN, LEVELS_ENERGY_COLUMN]
+    )
+    levels = levels[~np.isnan(levels).any(axis=1)]
+
+    return _AtomicLevelsIndex(
+        table=table,
+        statistical_weights=levels[:, 0],
+        level_energies=levels[:, 1],
+    )
+
+
+def _get_ionization_energy_rows(data: str) -> List[str]:
+    rows = []
+    for line in data.splitlines()[1:]:
+        if line.strip().lower().startswith(END_OF_IONIZATION_ENERGY_TABLE_STRING):
+            break
+        if line.strip():
+            rows.append(line)
+
+    return rows
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from spark_mec_bp.nist.fetchers import AtomicLinesData, AtomicLevelsData, IonizationEnergyData
+from spark_mec_bp.nist.offline import NISTBundle, NISTBundleBuilder, BundleError
+
+
+@pytest.fixture()
+def test_data_directory():
+    return "/app/spark_mec_bp/nist/parsers/test_data"
+
+
+@pytest.fixture()
+def bundle(mocker, test_data_directory):
+    with open(f"{test_data_directory}/atomic_lines/input_data.txt") as file:
+        atomic_lines_data = file.read()
+    with open(f"{test_data_directory}/atomic_levels/input_data.txt") as file:
+        atomic_levels_data = file.read()
+    with open(f"{test_data_directory}/ionization_energy/input_data.txt") as file:
+        ionization_energy_data = file.read()
+
+    atomic_lines_fetcher = mocker.MagicMock()
+    atomic_lines_fetcher.fetch.return_value = AtomicLinesData(data=atomic_lines_data)
+    atomic_levels_fetcher = mocker.MagicMock()
+    atomic_levels_fetcher.fetch.return_value = AtomicLevelsData(data=atomic_levels_data)
+    ionization_energy_fetcher = mocker.MagicMock()
+    ionization_energy_fetcher.fetch.return_value = IonizationEnergyData(data=ionization_energy_data)
+
+    return NISTBundleBuilder(
+        atomic_lines_fetcher=atomic_lines_fetcher,
+        atomic_levels_fetcher=atomic_levels_fetcher,
+        ionization_energy_fetcher=ionization_energy_fetcher,
+    ).build(["Ag I"], 400, 500)
+
+
+@pytest.mark.parametrize("file_name", ["bundle.json", "bundle.json.gz"])
+def test_nist_bundle_is_loaded_as_saved(tmp_path, bundle, file_name):
+    file_path = str(tmp_path / file_name)
+
+    bundle.save(file_path)
+
+    assert NISTBundle.load(file_path) == bundle
+
+
+def test_nist_bundle_load_raises_error_on_unsupported_version(tmp_path):
+    file_path = tmp_path / "bundle.json"
+    file_path.write_text(json.dumps({"version": 0}))
+
+    with pytest.raises(BundleError):
+        NISTBundle.load(str(file_path))
+
+
+def test_nist_bundle_returns_atomic_lines_within_requested_range(bundle):
+    lines = bundle.get_atomic_lines("Ag I", 420, 440).splitlines()
+
+    assert lines[0].startswith("obs_wl_air(nm)")
+    assert [line.split("\t")[0] for line in lines[1:]] == [
+        '"421.0960"',
+        '"421.2814"',
+        '"431.1074"',
+        '"439.623"',
+    ]
+
+
+def test_nist_bundle_raises_error_on_atomic_lines_outside_of_snapshot(bundle):
+    with pytest.raises(BundleError):
+        bundle.get_atomic_lines("Ag I", 300, 500)
+
+
+def test_nist_bundle_raises_error_on_missing_species(bundle):
+    with pytest.raises(BundleError):
+        bundle.get_ionization_energy("Au I")
@@ -0,0 +1,60 @@
+from spark_mec_bp.calculators import PartitionFunctionCalculator
+from spark_mec_bp.nist.fetchers import (
+    AtomicLinesData,
+    AtomicLevelsData,
+    IonizationEnergyData,
+)
+from spark_mec_bp.nist.offline.bundle import NISTBundle
+
+
+def _get_bundle_source(bundle: NISTBundle) -> tuple:
+    return ("bundle", bundle.file_path if bundle.file_path is not None else id(bundle))
+
+
+class OfflineAtomicLinesFetcher:
+    def __init__(self, bundle: NISTBundle) -> None:
+        self.bundle = bundle
+        self.source = _get_bundle_source(bundle)
+
+    def fetch(
+            self,
+            spectrum: str,
+            lower_wavelength: int,
+            upper_wavelength: int
+    ) -> AtomicLinesData:
+        return AtomicLinesData(
+            data=self.bundle.get_atomic_lines(spectrum, lower_wavelength, upper_wavelength)
+        )
+
+
+class OfflineAtomicLevelsFetcher:
+    def __init__(self, bundle: NISTBundle) -> None:
+        self.bundle = bundle
+        self.source = _get_bundle_source(bundle)
+        self.partition_function_calculator = PartitionFunctionCalculator()
+
+    def fetch(
+            self,
+            spectrum: str,
+            temperature: float
+    ) -> AtomicLevelsData:
+        table, statistical_weights, level_energies = self.bundle.get_atomic_levels(spectrum)
+        partition_function = self.partition_function_calculator.calculate(
+            statistical_weights, level_energies, temperature
+        )
+
+        return AtomicLevelsData(
+            data=f"{table}\nPartition function for Te = {temperature} eV: Z = {partition_function!r}\n"
+        )
+
+
+class OfflineIonizationEnergyFetcher:
+    def __init__(self, bundle: NISTBundle) -> None:
+        self.bundle = bundle
+        self.source = _get_bundle_source(bundle)
+
+    def fetch(
+        self,
+        spectrum: str,
+    ) -> IonizationEnergyData:
+        return IonizationEnergyData(data=self.bundle.get_ionization_energy(spectrum))
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from spark_mec_bp.nist.fetchers import AtomicLevelsData
+from spark_mec_bp.nist.offline import (
+    NISTBundle,
+    AtomicLinesSnapshot,
+    OfflineAtomicLinesFetcher,
+    OfflineAtomicLevelsFetcher,
+    OfflineIonizationEnergyFetcher,
+)
+from spark_mec_bp.nist.parsers import AtomicLinesParser, AtomicLevelsParser, IonizationEnergyParser
+
+
+@pytest.fixture()
+def test_data_directory():
+    return "/app/spark_mec_bp/nist/parsers/test_data"
+
+
+@pytest.fixture()
+def bundle(test_data_directory):
+    with open(f"{test_data_directory}/atomic_lines/input_data.txt") as file:
+        atomic_lines_data = file.read()
+    with open(f"{test_data_directory}/atomic_levels/input_data.txt") as file:
+        atomic_levels_data = file.read()
+    with open(f"{test_data_directory}/ionization_energy/input_data.txt") as file:
+        ionization_energy_data = file.read()
+
+    return NISTBundle(
+        atomic_lines={"Ag I": AtomicLinesSnapshot(400, 500, atomic_lines_data)},
+        atomic_levels={"Ag I": atomic_levels_data},
+        ionization_energies={"Ag I": ionization_energy_data},
+    )
+
+
+def test_offline_atomic_lines_fetcher_data_is_parsed_as_online_data(bundle, test_data_directory):
+    expected_result = pd.read_csv(
+        f"{test_data_directory}/atomic_lines/expected_output.csv",
+        index_col=0,
+    )
+
+    atomic_lines_data = OfflineAtomicLinesFetcher(bundle).fetch("Ag I", 400, 500)
+
+    pd.testing.assert_frame_equal(
+        AtomicLinesParser().parse_atomic_lines(atomic_lines_data), expected_result
+    )
+
+
+def test_offline_atomic_levels_fetcher_calculates_partition_function(bundle, test_data_directory):
+    expected_table = pd.read_csv(
+        f"{test_data_directory}/atomic_levels/expected_output.csv",
+        index_col=0,
+    )
+
+    atomic_levels_data = OfflineAtomicLevelsFetcher(bundle).fetch("Ag I", 5)
+
+    parser = AtomicLevelsParser()
+    pd.testing.assert_frame_equal(parser.parse_atomic_levels(atomic_levels_data), expected_table)
+    assert parser.parse_partition_function(atomic_levels_data) == pytest.approx(117.92, abs=0.005)
+
+
+def test_offline_partition_function_agrees_with_nist_within_its_rounding(bundle):
+    # NIST reports the partition function with two decimals, the offline one is calculated from the same levels
+    parser = AtomicLevelsParser()
+    nist_partition_function = parser.parse_partition_function(AtomicLevelsData(data=bundle.atomic_levels["Ag I"]))
+
+    offline_partition_function = parser.parse_partition_function(OfflineAtomicLevelsFetcher(bundle).fetch("Ag I", 5))
+
+    assert offline_partition_function == pytest.approx(nist_partition_function, abs=0.005)
+
+
+def test_offline_ionization_energy_fetcher_data_is_parsed_as_online_data(bundle, test_data_directory):
+    expected_result = pd.read_csv(
+        f"{test_data_directory}/ionization_energy/expected_output.csv",
+        index_col=0,
+    )
+
+    ionization_energy_data = OfflineIonizationEnergyFetcher(bundle).fetch("Ag I")
+
+    pd.testing.assert_frame_equal(
+        IonizationEnergyParser().parse_ionization_energy(ionization_energy_data),
+        expected_result,
+        check_dtype=False,
+    )
+
+
+def test_offline_ionization_energy_fetcher_serves_multiple_spectra(bundle):
+    bundle.ionization_energies["Au I"] = bundle.ionization_energies["Ag I"].replace("Ag I", "Au I")
+
+    ionization_energy_data = OfflineIonizationEnergyFetcher(bundle).fetch("Ag I; Au I")
+
+    actual_result = IonizationEnergyParser().parse_ionization_energy(ionization_energy_data)
+    assert list(actual_result["Sp. Name"]) == ["Ag I", "Au I"]
+    assert list(actual_result["Ionization Energy (1/cm)"]) == [61106.45, 61106.45]
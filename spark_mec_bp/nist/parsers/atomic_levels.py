@@ -1,25 +1,45 @@
+import re
 from io import StringIO
+from typing import TYPE_CHECKING, List
 
-import pandas as pd
+import numpy as np
 
 from spark_mec_bp.nist.fetchers import AtomicLevelsData
+from spark_mec_bp.nist.parsers.columns import read_columns, to_float_array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+END_OF_TABLE_STRING = "partition function"
+PARTITION_FUNCTION_PATTERN = re.compile(
+    r"^\s*partition function.*?(\S+)\s*$", re.IGNORECASE | re.MULTILINE
+)
 
 
 class AtomicLevelsParser:
-    def parse_atomic_levels(self, atomic_levels_data: AtomicLevelsData) -> pd.DataFrame:
+    def parse_atomic_levels(self, atomic_levels_data: AtomicLevelsData) -> "pd.DataFrame":
         return self._read_level_to_dataframe(atomic_levels_data.data)
 
+    def parse_atomic_levels_to_numpy(self, atomic_levels_data: AtomicLevelsData, columns: List[str]) -> np.ndarray:
+        return self._read_level_to_numpy(atomic_levels_data.data, columns)
+
     def parse_partition_function(self, atomic_levels_data: AtomicLevelsData) -> float:
         return self._read_partition_function(atomic_levels_data.data)
 
-    def _read_level_to_dataframe(self, data: str) -> pd.DataFrame:
+    def _read_level_to_dataframe(self, data: str) -> "pd.DataFrame":
+        import pandas as pd
+
         return (
             pd.read_csv(StringIO(data), sep="\t", index_col=False)
             .iloc[:-1, :]
         )
 
+    def _read_level_to_numpy(self, data: str, columns: List[str]) -> np.ndarray:
+        return np.column_stack(
+            [to_float_array(values) for values in read_columns(data, columns, END_OF_TABLE_STRING)]
+        )
+
     def _read_partition_function(self, atomic_levels_data: str) -> float:
-        for dataline in StringIO(atomic_levels_data).readlines():
-            striped_dataline = dataline.strip().lower()
-            if striped_dataline.startswith("partition function"):
-                return float(striped_dataline.split(" ")[-1])
+        match = PARTITION_FUNCTION_PATTERN.search(atomic_levels_data)
+        if match:
+            return float(match.group(1))
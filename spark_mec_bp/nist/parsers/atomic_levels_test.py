@@ -1,5 +1,6 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
 from spark_mec_bp.nist.fetchers import AtomicLevelsData
@@ -29,3 +30,20 @@ def test_atomic_levels_parser_parses_data(
 
     pd.testing.assert_frame_equal(actual_table, expected_table)
     assert actual_partition_funciton == expected_partition_function
+
+
+def test_atomic_levels_parser_parses_columns_to_numpy(
+    test_data_directory
+):
+    with open(f"{test_data_directory}/atomic_levels/input_data.txt") as file:
+        input_data = AtomicLevelsData(data=file.read())
+    columns = ["g", "Level (cm-1)"]
+
+    expected_result = pd.read_csv(
+        f"{test_data_directory}/atomic_levels/expected_output.csv",
+        index_col=0,
+    )[columns].to_numpy(dtype=float)
+
+    actual_result = AtomicLevelsParser().parse_atomic_levels_to_numpy(input_data, columns)
+
+    np.testing.assert_array_equal(actual_result, expected_result)
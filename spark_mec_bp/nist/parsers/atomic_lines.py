@@ -1,16 +1,58 @@
 from io import StringIO
+from typing import TYPE_CHECKING, List
 
-import pandas as pd
+import numpy as np
 
 from spark_mec_bp.nist.fetchers import AtomicLinesData
+from spark_mec_bp.nist.parsers.columns import read_columns, to_float_array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ACCURACY_COLUMN = "Acc"
+# upper bounds of the relative uncertainty of Aki of the NIST accuracy classes, E stands for > 50%
+AKI_ACCURACY_UNCERTAINTIES = {
+    "AAA": 0.003,
+    "AA": 0.01,
+    "A+": 0.02,
+    "A": 0.03,
+    "B+": 0.07,
+    "B": 0.1,
+    "C+": 0.18,
+    "C": 0.25,
+    "D+": 0.4,
+    "D": 0.5,
+    "E": 1.0,
+}
+
+
+def to_aki_uncertainty_array(accuracy_classes: List[str]) -> np.ndarray:
+    """Maps the accuracy classes to relative Aki uncertainties, NaN where the class is unknown."""
+    return np.array(
+        [AKI_ACCURACY_UNCERTAINTIES.get(accuracy_class.strip(), np.nan) for accuracy_class in accuracy_classes],
+        dtype=float,
+    )
 
 
 class AtomicLinesParser:
-    def parse_atomic_lines(self, atomic_lines_data: AtomicLinesData) -> pd.DataFrame:
+    def parse_atomic_lines(self, atomic_lines_data: AtomicLinesData) -> "pd.DataFrame":
         return self._read_lines_to_dataframe(atomic_lines_data.data)
 
-    def _read_lines_to_dataframe(self, atomic_lines_data: str) -> pd.DataFrame:
+    def parse_atomic_lines_to_numpy(self, atomic_lines_data: AtomicLinesData, columns: List[str]) -> np.ndarray:
+        return self._read_lines_to_numpy(atomic_lines_data.data, columns)
+
+    def _read_lines_to_dataframe(self, atomic_lines_data: str) -> "pd.DataFrame":
+        import pandas as pd
+
         return (
             pd.read_csv(StringIO(atomic_lines_data), sep="\t", index_col=False)
             .iloc[:, :-1]
         )
+
+    def _read_lines_to_numpy(self, atomic_lines_data: str, columns: List[str]) -> np.ndarray:
+        return np.column_stack(
+            [
+                to_aki_uncertainty_array(values) if column == ACCURACY_COLUMN else to_float_array(values)
+                for column, values in zip(columns, read_columns(atomic_lines_data, columns))
+            ]
+        )
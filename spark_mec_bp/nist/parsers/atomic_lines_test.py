@@ -1,5 +1,6 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
 from spark_mec_bp.nist.fetchers import AtomicLinesData
@@ -25,3 +26,30 @@ def test_atomic_levels_parser_parses_data(
     actual_result = AtomicLinesParser().parse_atomic_lines(input_data)
 
     pd.testing.assert_frame_equal(actual_result, expected_result)
+
+
+def test_atomic_lines_parser_parses_columns_to_numpy(
+    test_data_directory
+):
+    with open(f"{test_data_directory}/atomic_lines/input_data.txt") as file:
+        input_data = AtomicLinesData(data=file.read())
+    columns = ["obs_wl_air(nm)", "Aki(s^-1)", "g_k", "Ek(cm-1)"]
+
+    expected_result = pd.read_csv(
+        f"{test_data_directory}/atomic_lines/expected_output.csv",
+        index_col=0,
+    )[columns].replace(r"\?$", "", regex=True).to_numpy(dtype=float)
+
+    actual_result = AtomicLinesParser().parse_atomic_lines_to_numpy(input_data, columns)
+
+    np.testing.assert_array_equal(actual_result, expected_result)
+
+
+def test_atomic_lines_parser_parses_accuracy_classes_to_aki_uncertainties():
+    input_data = AtomicLinesData(
+        data='obs_wl_air(nm)\tAcc\t\n"312.2780"\tB+\t\n"406.5070"\tAAA\t\n"479.2580"\t\t\n'
+    )
+
+    actual_result = AtomicLinesParser().parse_atomic_lines_to_numpy(input_data, ["obs_wl_air(nm)", "Acc"])
+
+    np.testing.assert_array_equal(actual_result, [[312.278, 0.07], [406.507, 0.003], [479.258, np.nan]])
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+import numpy as np
+
+FIELD_SEPARATOR = "\t"
+NUMBER_MARKER_CHARACTERS = "[]()?+ "
+
+
+def read_columns(data: str, columns: List[str], end_of_table_string: Optional[str] = None) -> List[List[str]]:
+    """Reads the given columns of a tab separated NIST table in a single pass, without quotes."""
+    lines = iter(data.splitlines())
+    header = next(lines, "").split(FIELD_SEPARATOR)
+    missing_columns = [column for column in columns if column not in header]
+    if missing_columns:
+        raise ValueError(f"Columns {missing_columns} are missing from the NIST table")
+
+    column_indices = [header.index(column) for column in columns]
+    column_values = [[] for _ in columns]
+    for line in lines:
+        striped_line = line.strip()
+        if not striped_line:
+            continue
+        if end_of_table_string and striped_line.lower().startswith(end_of_table_string):
+            break
+
+        fields = line.split(FIELD_SEPARATOR)
+        for values, column_index in zip(column_values, column_indices):
+            values.append(fields[column_index].strip().strip('"') if column_index < len(fields) else "")
+
+    return column_values
+
+
+def to_float(value: str) -> float:
+    try:
+        return float(value.strip().strip('"').strip(NUMBER_MARKER_CHARACTERS))
+    except ValueError:
+        return np.nan
+
+
+def to_float_array(values: List[str]) -> np.ndarray:
+    return np.array([to_float(value) for value in values], dtype=float)
@@ -1,25 +1,45 @@
-from spark_mec_bp.nist.fetchers import IonizationEnergyData
-import pandas as pd
+import re
 from io import StringIO
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from spark_mec_bp.nist.fetchers import IonizationEnergyData
+from spark_mec_bp.nist.parsers.columns import read_columns, to_float_array
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 END_OF_TABLE_STRING = "notes"
+END_OF_TABLE_PATTERN = re.compile(rf"^\s*{END_OF_TABLE_STRING}", re.IGNORECASE | re.MULTILINE)
+SPECIES_NAME_COLUMN = "Sp. Name"
+IONIZATION_ENERGY_COLUMN = "Ionization Energy (1/cm)"
 
 
 class IonizationEnergyParser:
     def parse_ionization_energy(
         self, ionization_energy_data: IonizationEnergyData
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         table_data = self._get_table(ionization_energy_data.data)
         return self._read_to_dataframe(table_data)
 
+    def parse_ionization_energy_to_numpy(
+        self, ionization_energy_data: IonizationEnergyData
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        species_names, ionization_energies = read_columns(
+            ionization_energy_data.data,
+            [SPECIES_NAME_COLUMN, IONIZATION_ENERGY_COLUMN],
+            END_OF_TABLE_STRING,
+        )
+
+        return np.array(species_names, dtype=str), to_float_array(ionization_energies)
+
     def _get_table(self, ionization_energy_data):
-        table_lines = []
-        for line in StringIO(ionization_energy_data).readlines():
-            if line.strip().lower().startswith(END_OF_TABLE_STRING):
-                break
-            table_lines.append(line)
+        match = END_OF_TABLE_PATTERN.search(ionization_energy_data)
 
-        return "\n".join(table_lines)
+        return ionization_energy_data[:match.start()] if match else ionization_energy_data
 
     def _read_to_dataframe(self, table_data):
+        import pandas as pd
+
         return pd.read_csv(StringIO(table_data), sep="\t", index_col=False).iloc[:, :-1]
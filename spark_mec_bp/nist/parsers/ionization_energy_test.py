@@ -1,5 +1,6 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
 from spark_mec_bp.nist.fetchers import IonizationEnergyData
@@ -24,3 +25,15 @@ def test_atomic_levels_parser_parses_data(
 
     actual_result = IonizationEnergyParser().parse_ionization_energy(input_data)
     pd.testing.assert_frame_equal(actual_result, expected_result, check_dtype=False)
+
+
+def test_ionization_energy_parser_parses_columns_to_numpy(
+    test_data_directory
+):
+    with open(f"{test_data_directory}/ionization_energy/input_data.txt") as file:
+        input_data = IonizationEnergyData(data=file.read())
+
+    species_names, ionization_energies = IonizationEnergyParser().parse_ionization_energy_to_numpy(input_data)
+
+    np.testing.assert_array_equal(species_names, ["Ag I"])
+    np.testing.assert_array_equal(ionization_energies, [61106.45])
@@ -1,4 +1,3 @@
-from bs4 import BeautifulSoup
 from typing import Optional
 
 
@@ -11,16 +10,21 @@ class ResponseErrorValidator:
     error_string = "<html"
 
     def validate(self, response: str) -> Optional[ValidationError]:
-        if self.error_string in response:
+        if self.is_error_response(response):
             nist_error_message = self._get_error_message_from_response_if_exists(
                 response)
             return self._create_validation_error(message=self.base_error_message + nist_error_message)
 
         return None
 
+    def is_error_response(self, response_head: str) -> bool:
+        return self.error_string in response_head
+
     def _create_validation_error(self, message: str) -> ValidationError:
         return ValidationError(message)
 
     def _get_error_message_from_response_if_exists(self, response: str) -> str:
+        from bs4 import BeautifulSoup
+
         error_message = BeautifulSoup(response, 'html.parser').body.font.string
         return error_message if error_message else ""
@@ -0,0 +1,7 @@
+from .spectrum_generator import (
+    AU_AG_LINES,
+    SyntheticLine,
+    SyntheticSpectrumConfig,
+    SyntheticSpectrumGenerator,
+    write_spectrum,
+)
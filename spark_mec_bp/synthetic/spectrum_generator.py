@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+BOLTZMANN_CONSTANT = 0.695035  # cm-1 / K
+
+
+@dataclass
+class SyntheticLine:
+    species_name: str
+    wavelength: float  # nm
+    Aki: float  # s^-1
+    g_k: float
+    E_k: float  # cm-1
+
+
+# Au I and Ag I lines of the NIST atomic spectra database
+AU_AG_LINES = [
+    SyntheticLine("Au I", 312.278, 1.9e7, 4, 41174.613),
+    SyntheticLine("Au I", 406.507, 8.5e7, 4, 61951.6),
+    SyntheticLine("Au I", 479.258, 8.9e7, 6, 62033.7),
+    SyntheticLine("Ag I", 338.2887, 1.3e8, 2, 29552.0574),
+    SyntheticLine("Ag I", 520.9078, 7.5e7, 4, 48743.969),
+    SyntheticLine("Ag I", 546.5497, 8.6e7, 6, 48764.219),
+]
+
+
+@dataclass
+class SyntheticSpectrumConfig:
+    temperature: float = 12000.0  # K
+    population_ratios: dict = field(default_factory=lambda: {"Au I": 1.0, "Ag I": 1.0})  # n / Z of the species
+    lines: List[SyntheticLine] = field(default_factory=lambda: list(AU_AG_LINES))
+    lower_wavelength: float = 300.0  # nm
+    upper_wavelength: float = 560.0  # nm
+    points: int = 21178
+    shots: int = 10
+    line_width: float = 0.08  # nm, FWHM
+    lorentzian_fraction: float = 0.5
+    peak_height: float = 60000.0  # of the strongest line
+    baseline_level: float = 3000.0
+    baseline_curvature: float = 0.5
+    shot_to_shot_fluctuation: float = 0.05  # relative standard deviation of the shot intensities
+    noise: float = 20.0  # standard deviation
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.points < 2 or self.shots < 1:
+            raise ValueError("A synthetic spectrum needs at least 2 points and 1 shot")
+        if self.lower_wavelength >= self.upper_wavelength:
+            raise ValueError("lower_wavelength must be smaller than upper_wavelength")
+
+
+class SyntheticSpectrumGenerator:
+    def __init__(self, config: SyntheticSpectrumConfig) -> None:
+        self.config = config
+
+    def generate(self) -> np.ndarray:
+        """Returns the wavelengths and one intensity column per shot, in the layout of the ascii spectra."""
+        random = np.random.default_rng(self.config.seed)
+        wavelengths = np.linspace(self.config.lower_wavelength, self.config.upper_wavelength, self.config.points)
+        line_profile = self._calculate_line_profile(wavelengths)
+        baseline = self._calculate_baseline(wavelengths)
+
+        shot_scales = 1 + self.config.shot_to_shot_fluctuation * random.standard_normal(self.config.shots)
+        noise = self.config.noise * random.standard_normal((self.config.points, self.config.shots))
+        intensities = baseline[:, np.newaxis] + line_profile[:, np.newaxis] * shot_scales + noise
+
+        return np.column_stack((wavelengths, intensities))
+
+    def calculate_line_integrals(self) -> np.ndarray:
+        """Returns the integral intensity of every line without shot to shot fluctuation."""
+        lines = self.config.lines
+        emissivities = np.array(
+            [
+                self.config.population_ratios[line.species_name]
+                * line.g_k
+                * line.Aki
+                / line.wavelength
+                * np.exp(-line.E_k / (BOLTZMANN_CONSTANT * self.config.temperature))
+                for line in lines
+            ]
+        )
+        strongest_line_height = emissivities.max() * self._get_profile_peak_height()
+
+        return emissivities * self.config.peak_height / strongest_line_height
+
+    def _calculate_line_profile(self, wavelengths: np.ndarray) -> np.ndarray:
+        line_wavelengths = np.array([line.wavelength for line in self.config.lines])
+        offsets = wavelengths[:, np.newaxis] - line_wavelengths
+
+        return self._pseudo_voigt(offsets) @ self.calculate_line_integrals()
+
+    def _pseudo_voigt(self, offsets: np.ndarray) -> np.ndarray:
+        # area normalized mixture of a lorentzian and a gaussian of the same FWHM
+        half_width = self.config.line_width / 2
+        sigma = half_width / np.sqrt(2 * np.log(2))
+        lorentzian = half_width / (np.pi * (offsets ** 2 + half_width ** 2))
+        gaussian = np.exp(-(offsets ** 2) / (2 * sigma ** 2)) / (sigma * np.sqrt(2 * np.pi))
+
+        return self.config.lorentzian_fraction * lorentzian + (1 - self.config.lorentzian_fraction) * gaussian
+
+    def _get_profile_peak_height(self) -> float:
+        return float(self._pseudo_voigt(np.zeros(1))[0])
+
+    def _calculate_baseline(self, wavelengths: np.ndarray) -> np.ndarray:
+        center = (self.config.lower_wavelength + self.config.upper_wavelength) / 2
+        half_range = (self.config.upper_wavelength - self.config.lower_wavelength) / 2
+        relative_wavelengths = (wavelengths - center) / half_range
+
+        return self.config.baseline_level * (
+            1 - self.config.baseline_curvature * relative_wavelengths ** 2 + 0.2 * np.sin(np.pi * relative_wavelengths)
+        )
+
+
+def write_spectrum(file_path: str, spectrum: np.ndarray) -> None:
+    np.savetxt(file_path, spectrum, fmt="%.6f", delimiter="\t")
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from pytest import approx
+
+from spark_mec_bp import application
+from spark_mec_bp.synthetic import SyntheticSpectrumConfig, SyntheticSpectrumGenerator, write_spectrum
+from tests.shared_data import create_config, mock_nist_getters
+
+
+def test_generate_returns_wavelengths_and_shots():
+    config = SyntheticSpectrumConfig(points=1000, shots=3)
+
+    spectrum = SyntheticSpectrumGenerator(config).generate()
+
+    assert spectrum.shape == (1000, 4)
+    assert spectrum[0, 0] == approx(config.lower_wavelength)
+    assert spectrum[-1, 0] == approx(config.upper_wavelength)
+    assert not np.allclose(spectrum[:, 1], spectrum[:, 2])
+
+
+def test_generate_is_reproducible_by_seed():
+    config = SyntheticSpectrumConfig(points=1000, shots=2)
+
+    assert np.array_equal(SyntheticSpectrumGenerator(config).generate(), SyntheticSpectrumGenerator(config).generate())
+
+
+def test_line_integrals_follow_the_boltzmann_distribution():
+    config = SyntheticSpectrumConfig(temperature=10000.0)
+    generator = SyntheticSpectrumGenerator(config)
+
+    integrals = generator.calculate_line_integrals()
+
+    first_line, second_line = config.lines[0], config.lines[1]
+    ratio = (integrals[0] * first_line.wavelength / (first_line.g_k * first_line.Aki)) / (
+        integrals[1] * second_line.wavelength / (second_line.g_k * second_line.Aki)
+    )
+    assert ratio == approx(np.exp((second_line.E_k - first_line.E_k) / (0.695035 * config.temperature)))
+
+
+def test_config_rejects_an_empty_wavelength_range():
+    with pytest.raises(ValueError):
+        SyntheticSpectrumConfig(lower_wavelength=500.0, upper_wavelength=400.0)
+
+
+@pytest.mark.parametrize("temperature", [9000.0, 12000.0, 15000.0])
+def test_app_recovers_the_ground_truth_temperature(mocker, tmp_path, temperature):
+    mock_nist_getters(mocker)
+    config = SyntheticSpectrumConfig(temperature=temperature, shots=1)
+    spectrum_file_path = str(tmp_path / "synthetic.asc")
+    write_spectrum(spectrum_file_path, SyntheticSpectrumGenerator(config).generate())
+    app_config = create_config()
+    app_config.spectrum = application.SpectrumConfig(
+        file_path=spectrum_file_path, wavelength_column_index=0, intensity_column_index=1
+    )
+
+    result = application.App(app_config).run()
+
+    assert result.temperature == approx(temperature, rel=0.03)
+    assert np.exp(result.fitted_intensity_ratios[1]) == approx(1.0, rel=0.05)
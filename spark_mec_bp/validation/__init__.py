@@ -1 +1 @@
-from .line_pair_checker import LinePairChecker
+from .line_pair_checker import LinePairChecker, LinePruningData
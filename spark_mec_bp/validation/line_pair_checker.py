@@ -1,18 +1,87 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
 import numpy as np
 
+from spark_mec_bp.calculators import IntensityRatiosCalculator, TemperatureCalculator
+
+
+@dataclass
+class LinePruningData:
+    line_masks: List[np.ndarray]  # lines kept of every species
+    temperature: float
+    deviations: List[np.ndarray]  # line pair deviations of the kept lines at the temperature
+    pruned_lines: List[Tuple[int, int]]  # species and line index, in the order of pruning
+
 
 class LinePairChecker:
+    def __init__(self) -> None:
+        self.intensity_ratios_calculator = IntensityRatiosCalculator()
+        self.temperature_calculator = TemperatureCalculator()
+
     def check_line_pairs(self, atomic_lines: np.ndarray, integrals: np.ndarray, temperature: float) -> np.ndarray:
-        intratio = integrals / integrals[:, np.newaxis]
-        dataratio = np.divide(
-            (
-                ((atomic_lines[:, 2] * atomic_lines[:, 1]) / atomic_lines[:, 0])
-                * np.exp(-atomic_lines[:, 3] / (0.695035 * temperature))
-            ),
-            (
-                ((atomic_lines[:, 2] * atomic_lines[:, 1]) / atomic_lines[:, 0])
-                * np.exp(-atomic_lines[:, 3] / (0.695035 * temperature))
-            )[:, np.newaxis],
+        return self.check_line_pairs_batch(atomic_lines, integrals, temperature)[0]
+
+    def check_line_pairs_batch(
+        self, atomic_lines: np.ndarray, integrals: np.ndarray, temperatures: np.ndarray
+    ) -> np.ndarray:
+        """Returns the deviation matrix of every temperature, the integrals are one row or one row per temperature."""
+        temperatures = np.atleast_1d(temperatures)
+        integrals = np.atleast_2d(integrals)
+        line_strengths = (atomic_lines[:, 2] * atomic_lines[:, 1]) / atomic_lines[:, 0]
+        boltzmann_factors = line_strengths * np.exp(-np.outer(1 / (0.695035 * temperatures), atomic_lines[:, 3]))
+        data_ratios = boltzmann_factors[:, np.newaxis, :] / boltzmann_factors[:, :, np.newaxis]
+        integral_ratios = integrals[:, np.newaxis, :] / integrals[:, :, np.newaxis]
+
+        return np.swapaxes((data_ratios - integral_ratios) / data_ratios, 1, 2)
+
+    def prune_lines(
+        self,
+        species_atomic_lines: List[np.ndarray],
+        species_integrals: List[np.ndarray],
+        threshold: float,
+        minimum_lines: int = 2,
+    ) -> LinePruningData:
+        """Drops the worst deviating line and refits the temperature until every deviation is below the threshold.
+
+        The integrals are reused, so no peak is fitted again. Species keep at least minimum_lines lines.
+        """
+        line_masks = [np.ones(len(atomic_lines), dtype=bool) for atomic_lines in species_atomic_lines]
+        pruned_lines = []
+        while True:
+            temperature = self._fit_temperature(species_atomic_lines, species_integrals, line_masks)
+            deviations = [
+                self.check_line_pairs(atomic_lines[line_mask], integrals[line_mask], temperature)
+                for atomic_lines, integrals, line_mask in zip(species_atomic_lines, species_integrals, line_masks)
+            ]
+            worst_line = self._find_worst_line(deviations, line_masks, threshold, minimum_lines)
+            if worst_line is None:
+                return LinePruningData(line_masks, temperature, deviations, pruned_lines)
+
+            species_index, line_index = worst_line
+            line_masks[species_index][line_index] = False
+            pruned_lines.append(worst_line)
+
+    def _fit_temperature(self, species_atomic_lines, species_integrals, line_masks):
+        intensity_ratios_data = self.intensity_ratios_calculator.calculate_joint(
+            [atomic_lines[line_mask] for atomic_lines, line_mask in zip(species_atomic_lines, line_masks)],
+            [integrals[line_mask] for integrals, line_mask in zip(species_integrals, line_masks)],
         )
 
-        return np.divide(dataratio - intratio, dataratio).T
+        return self.temperature_calculator.calculate(intensity_ratios_data.fitted_intensity_ratios)
+
+    def _find_worst_line(self, deviations, line_masks, threshold, minimum_lines):
+        worst_line, worst_score = None, -np.inf
+        for species_index, (species_deviations, line_mask) in enumerate(zip(deviations, line_masks)):
+            absolute_deviations = np.abs(species_deviations)
+            if len(absolute_deviations) <= minimum_lines or absolute_deviations.max() <= threshold:
+                continue
+
+            # mean deviation of the pairs of a line, in both directions
+            scores = (absolute_deviations.sum(axis=0) + absolute_deviations.sum(axis=1)) / (
+                2 * (len(absolute_deviations) - 1)
+            )
+            if scores.max() > worst_score:
+                worst_line, worst_score = (species_index, int(np.flatnonzero(line_mask)[scores.argmax()])), scores.max()
+
+        return worst_line
@@ -0,0 +1,76 @@
+import numpy as np
+from pytest import approx
+
+from tests.shared_data import FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES
+from spark_mec_bp.validation import LinePairChecker
+
+THIRD_LINE = np.array([[3.24754e02, 1.39e08, 4.0, 3.0783686e04]])
+
+
+def create_boltzmann_integrals(atomic_lines, temperature, ln_population=0.0):
+    return (
+        np.exp(ln_population - atomic_lines[:, 3] / (0.695035 * temperature))
+        * atomic_lines[:, 2]
+        * atomic_lines[:, 1]
+        / atomic_lines[:, 0]
+    )
+
+
+def test_check_line_pairs_returns_no_deviation_for_boltzmann_distributed_integrals():
+    integrals = create_boltzmann_integrals(FIRST_SPECIES_ATOMIC_LINES, 12000.0)
+
+    deviations = LinePairChecker().check_line_pairs(FIRST_SPECIES_ATOMIC_LINES, integrals, 12000.0)
+
+    assert deviations == approx(np.zeros((3, 3)))
+
+
+def test_check_line_pairs_batch_matches_check_line_pairs():
+    checker = LinePairChecker()
+    temperatures = np.array([9000.0, 12000.0, 15000.0])
+    integrals = np.array([[94.6, 12.4, 16.3], [90.1, 13.0, 15.2], [99.3, 11.8, 17.0]])
+
+    temperature_deviations = checker.check_line_pairs_batch(FIRST_SPECIES_ATOMIC_LINES, integrals[0], temperatures)
+    shot_deviations = checker.check_line_pairs_batch(FIRST_SPECIES_ATOMIC_LINES, integrals, temperatures)
+
+    for index, temperature in enumerate(temperatures):
+        assert temperature_deviations[index] == approx(
+            checker.check_line_pairs(FIRST_SPECIES_ATOMIC_LINES, integrals[0], temperature)
+        )
+        assert shot_deviations[index] == approx(
+            checker.check_line_pairs(FIRST_SPECIES_ATOMIC_LINES, integrals[index], temperature)
+        )
+
+
+def test_prune_lines_drops_the_outlier_line_and_refits_the_temperature():
+    second_species_atomic_lines = np.concatenate((SECOND_SPECIES_ATOMIC_LINES, THIRD_LINE))
+    first_species_integrals = create_boltzmann_integrals(FIRST_SPECIES_ATOMIC_LINES, 12000.0)
+    second_species_integrals = create_boltzmann_integrals(second_species_atomic_lines, 12000.0, 0.3)
+    second_species_integrals[1] *= 3
+
+    pruning_data = LinePairChecker().prune_lines(
+        [FIRST_SPECIES_ATOMIC_LINES, second_species_atomic_lines],
+        [first_species_integrals, second_species_integrals],
+        threshold=0.01,
+    )
+
+    assert pruning_data.pruned_lines == [(1, 1)]
+    assert pruning_data.line_masks[1].tolist() == [True, False, True, True]
+    assert pruning_data.temperature == approx(12000.0)
+    assert np.abs(pruning_data.deviations[1]).max() < 0.01
+
+
+def test_prune_lines_keeps_minimum_lines():
+    first_species_integrals = create_boltzmann_integrals(FIRST_SPECIES_ATOMIC_LINES, 12000.0)
+    first_species_integrals[0] *= 3
+    second_species_integrals = create_boltzmann_integrals(SECOND_SPECIES_ATOMIC_LINES, 12000.0)
+    second_species_integrals[2] *= 3
+
+    pruning_data = LinePairChecker().prune_lines(
+        [FIRST_SPECIES_ATOMIC_LINES, SECOND_SPECIES_ATOMIC_LINES],
+        [first_species_integrals, second_species_integrals],
+        threshold=0.01,
+        minimum_lines=2,
+    )
+
+    assert sorted(pruning_data.pruned_lines) == [(0, 0), (1, 2)]
+    assert [line_mask.sum() for line_mask in pruning_data.line_masks] == [2, 2]
@@ -0,0 +1,164 @@
+from typing import List
+
+import numpy as np
+
+from spark_mec_bp import application
+from spark_mec_bp.nist.offline import AtomicLinesSnapshot, NISTBundle
+
+# data shared by the tests of several modules, the atomic lines are recorded from the NIST atomic spectra database
+ATOMIC_LINES = {
+    "Au I": np.array(
+        [
+            [3.1227800e02, 1.9000000e07, 4.0000000e00, 4.1174613e04],
+            [4.0650700e02, 8.5000000e07, 4.0000000e00, 6.1951600e04],
+            [4.7925800e02, 8.9000000e07, 6.0000000e00, 6.2033700e04],
+        ]
+    ),
+    "Ag I": np.array(
+        [
+            [3.38288700e02, 1.30000000e08, 2.00000000e00, 2.95520574e04],
+            [5.20907800e02, 7.50000000e07, 4.00000000e00, 4.87439690e04],
+            [5.46549700e02, 8.60000000e07, 6.00000000e00, 4.87642190e04],
+        ]
+    ),
+    "Cu I": np.array(
+        [
+            [3.24754000e02, 1.39000000e08, 4.00000000e00, 3.07836860e04],
+            [5.15324000e02, 6.00000000e07, 4.00000000e00, 4.99351950e04],
+            [5.21820000e02, 7.50000000e07, 6.00000000e00, 4.99420510e04],
+        ]
+    ),
+}
+FIRST_SPECIES_ATOMIC_LINES = ATOMIC_LINES["Au I"]
+SECOND_SPECIES_ATOMIC_LINES = ATOMIC_LINES["Ag I"]
+PARTITION_FUNCTIONS = {
+    "Au I": 5.0,
+    "Au II": 3.44,
+    "Ag I": 3.04,
+    "Ag II": 1.19,
+    "Cu I": 2.37,
+    "Cu II": 1.05,
+    "Ar I": 1.0,
+    "Ar II": 5.7,
+}
+IONIZATION_ENERGIES = {
+    "Au I": 74409.11,
+    "Ag I": 61106.45,
+    "Cu I": 62317.46,
+    "Ar I": 127109.842,
+}
+NIST_TEST_DATA_DIRECTORY = "spark_mec_bp/nist/parsers/test_data"
+BUNDLE_LOWER_WAVELENGTH = 200
+BUNDLE_UPPER_WAVELENGTH = 900
+# the recorded Ag I levels stand in for every species, the timings only depend on the size of the table
+BUNDLE_LEVELS_SPECIES = ["Au I", "Au II", "Ag I", "Ag II", "Cu I", "Cu II", "Ar I", "Ar II"]
+
+
+def mock_nist_getters(mocker):
+    atomic_lines_getter = mocker.patch(
+        "spark_mec_bp.application.app.AtomicLinesDataGetter",
+    )
+    atomic_lines_getter.return_value.get_data.side_effect = (
+        lambda species_name, target_peaks: ATOMIC_LINES[species_name]
+    )
+    partition_function_getter = mocker.patch(
+        "spark_mec_bp.application.app.PartitionFunctionDataGetter",
+    )
+    partition_function_getter.return_value.get_data.side_effect = (
+        lambda species_name, temperature: PARTITION_FUNCTIONS[species_name]
+    )
+    # a single ground level whose partition function is the same at every temperature
+    partition_function_getter.return_value.get_atomic_levels.side_effect = (
+        lambda species_name: np.array([[PARTITION_FUNCTIONS[species_name], 0.0]])
+    )
+    ioniztion_energy_getter = mocker.patch(
+        "spark_mec_bp.application.app.IonizationEnergyDataGetter",
+    )
+    ioniztion_energy_getter.return_value.get_bulk_data.side_effect = (
+        lambda species_names: [IONIZATION_ENERGIES[species_name] for species_name in species_names]
+    )
+
+    return atomic_lines_getter, partition_function_getter, ioniztion_energy_getter
+
+
+def create_config():
+    return application.AppConfig(
+        spectrum=application.SpectrumConfig(
+            file_path="spark_mec_bp/application/test_data/input_data.asc",
+            wavelength_column_index=0,
+            intensity_column_index=10
+        ),
+        first_species=application.SpeciesConfig(
+            atom_name="Au I",
+            ion_name="Au II",
+            target_peaks=[312.278, 406.507, 479.26]
+        ),
+        second_species=application.SpeciesConfig(
+            atom_name="Ag I",
+            ion_name="Ag II",
+            target_peaks=[338.29, 520.9078, 546.54]
+        ),
+        carrier_gas=application.CarrierGasConfig(
+            atom_name="Ar I",
+            ion_name="Ar II"
+        ),
+        spectrum_correction=application.SpectrumCorrectionConfig(
+            iteration_limit=50,
+            ratio=0.00001,
+            lam=1000000
+        ),
+        peak_finding=application.PeakFindingConfig(
+            minimum_requred_height=100
+        ),
+        voigt_integration=application.VoigtIntegrationConfig(
+            prominence_window_length=40
+        )
+    )
+
+
+def read_nist_test_data(name: str) -> str:
+    with open(f"{NIST_TEST_DATA_DIRECTORY}/{name}/input_data.txt") as file:
+        return file.read()
+
+
+def create_fixture_bundle() -> NISTBundle:
+    """Creates a bundle of recorded NIST responses for the species of the shared test data."""
+    atomic_lines_header = read_nist_test_data("atomic_lines").splitlines()[0]
+    atomic_levels_data = read_nist_test_data("atomic_levels")
+    ionization_energy_data = read_nist_test_data("ionization_energy")
+
+    return NISTBundle(
+        atomic_lines={
+            species_name: AtomicLinesSnapshot(
+                BUNDLE_LOWER_WAVELENGTH,
+                BUNDLE_UPPER_WAVELENGTH,
+                _create_atomic_lines_table(atomic_lines_header, lines),
+            )
+            for species_name, lines in ATOMIC_LINES.items()
+        },
+        atomic_levels={species_name: atomic_levels_data for species_name in BUNDLE_LEVELS_SPECIES},
+        ionization_energies={
+            species_name: _create_ionization_energy_table(ionization_energy_data, species_name, ionization_energy)
+            for species_name, ionization_energy in IONIZATION_ENERGIES.items()
+        },
+    )
+
+
+def _create_atomic_lines_table(header: str, lines: np.ndarray) -> str:
+    columns = header.split("\t")
+    rows = []
+    for line in lines:
+        values = dict(zip(["obs_wl_air(nm)", "Aki(s^-1)", "g_k", "Ek(cm-1)"], map(repr, line.tolist())))
+        rows.append("\t".join(f'"{values.get(column, "")}"' if column else "" for column in columns))
+
+    return "\n".join([header, *rows]) + "\n"
+
+
+def _create_ionization_energy_table(recorded_data: str, species_name: str, ionization_energy: float) -> str:
+    header, recorded_row, *notes = recorded_data.splitlines()
+    columns = header.split("\t")
+    values: List[str] = recorded_row.split("\t")
+    values[columns.index("Sp. Name")] = f'"{species_name}"'
+    values[columns.index("Ionization Energy (1/cm)")] = f'"{ionization_energy!r}"'
+
+    return "\n".join([header, "\t".join(values), *notes]) + "\n"